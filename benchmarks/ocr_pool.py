@@ -0,0 +1,121 @@
+"""Compare single-call OCR with the banded OCRPool on synthetic text pages.
+
+    python benchmarks/ocr_pool.py --workers 4 --repeat 3
+
+Uses tesseract when pytesseract and the tesseract binary are installed,
+otherwise a CPU-bound stand-in OCR with the same output format so the
+pool overhead and scaling can still be measured.
+"""
+import argparse
+import importlib.util
+import os
+import shutil
+import sys
+import time
+import numpy as np
+
+# Add the project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core.ocr_pool import OCRPool, tesseract_data
+
+
+def synthetic_page(width=1920, height=1080, line_height=24, seed=0):
+    """Dark text on a light background; real glyphs when Pillow is available"""
+    rng = np.random.default_rng(seed)
+    words = ["open", "file", "save", "settings", "window", "search", "cancel", "help",
+             "view", "tools", "download", "folder", "network", "display", "volume"]
+    try:
+        from PIL import Image, ImageDraw
+
+        image = Image.new("L", (width, height), 255)
+        draw = ImageDraw.Draw(image)
+        for top in range(10, height - line_height, line_height + 8):
+            line = " ".join(rng.choice(words, size=rng.integers(4, 14)))
+            draw.text((20, top), line, fill=0)
+        return np.array(image)
+    except ImportError:
+        image = np.full((height, width), 255, dtype=np.uint8)
+        for top in range(10, height - line_height, line_height + 8):
+            x = 20
+            for _ in range(rng.integers(4, 14)):
+                w = int(rng.integers(30, 120))
+                image[top + 4:top + line_height - 4, x:x + w] = 0
+                x += w + 14
+        return image
+
+
+def stand_in_ocr(image):
+    """Row-by-row scan for dark runs, in plain Python like a real OCR's hot loop"""
+    data = {'text': [], 'left': [], 'top': [], 'width': [], 'height': [], 'conf': []}
+    dark = (np.asarray(image) < 128).tolist()
+    runs = {}
+    for y, row in enumerate(dark):
+        start = None
+        for x, value in enumerate(row + [False]):
+            if value and start is None:
+                start = x
+            elif not value and start is not None:
+                top, bottom = runs.get(start, (y, y))
+                runs[start] = (top if bottom >= y - 1 else y, y)
+                if bottom < y - 1:
+                    data['text'].append("word")
+                    data['left'].append(start)
+                    data['top'].append(top)
+                    data['width'].append(20)
+                    data['height'].append(bottom - top + 1)
+                    data['conf'].append(90)
+                start = None
+    for start, (top, bottom) in runs.items():
+        data['text'].append("word")
+        data['left'].append(start)
+        data['top'].append(top)
+        data['width'].append(20)
+        data['height'].append(bottom - top + 1)
+        data['conf'].append(90)
+    return data
+
+
+def tesseract_available():
+    return (importlib.util.find_spec("pytesseract") is not None
+            and shutil.which("tesseract") is not None)
+
+
+def best_of(fn, repeat):
+    times = []
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - started)
+    return min(times), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--width", type=int, default=1920)
+    parser.add_argument("--height", type=int, default=1080)
+    parser.add_argument("--ocr", choices=["auto", "tesseract", "stand-in"], default="auto")
+    args = parser.parse_args()
+
+    use_tesseract = args.ocr == "tesseract" or (args.ocr == "auto" and tesseract_available())
+    ocr_fn = tesseract_data if use_tesseract else stand_in_ocr
+    image = synthetic_page(args.width, args.height)
+
+    single, data = best_of(lambda: ocr_fn(image), args.repeat)
+    with OCRPool(ocr_fn, workers=args.workers, min_parallel_pixels=0).start() as pool:
+        pool.recognize(image)  # warm up the workers
+        pooled, words = best_of(lambda: pool.recognize(image), args.repeat)
+
+    single_words = sum(1 for text in data['text'] if str(text).strip())
+    print(f"OCR engine:      {'tesseract' if use_tesseract else 'stand-in'}")
+    print(f"Frame:           {args.width}x{args.height}, {os.cpu_count()} CPU(s)")
+    print(f"Single call:     {single * 1000:8.1f} ms  ({single_words} words)")
+    print(f"Pool ({args.workers} workers): {pooled * 1000:8.1f} ms  ({len(words)} words)")
+    print(f"Speedup:         {single / pooled:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+"""Compare raw full-frame OCR with the preprocessed text-region OCR.
+
+    python benchmarks/ocr_preprocess.py --pages 5 --repeat 3
+
+Pages are synthetic RGB screens with dark text on light, light text on a
+dark sidebar and white text on a coloured header, at several text sizes.
+Each page knows where its words are, so accuracy is measured as recall:
+with tesseract, the share of words read with the right text; with the
+stand-in OCR (used when tesseract is not installed), the share of words
+whose box contains the centre of a detected word. Precision is the share
+of detected words that match a real one.
+"""
+import argparse
+import os
+import sys
+import numpy as np
+
+# Add the project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.ocr_pool import best_of, stand_in_ocr, tesseract_available
+from src.core.ocr_pool import tesseract_data
+from src.core.ocr_preprocess import PreprocessedOCR, TextPreprocessor, to_gray
+from src.core.tile_ocr import parse_ocr_data
+
+WORDS = ["open", "file", "save", "settings", "window", "search", "cancel", "help",
+         "view", "tools", "download", "folder", "network", "display", "volume"]
+
+# (x, y, w, h, background RGB, text RGB, text size)
+PANELS = [
+    (0, 0, 1.0, 0.08, (40, 90, 200), (255, 255, 255), 20),    # header
+    (0, 0.08, 0.2, 0.92, (35, 35, 40), (230, 230, 230), 14),  # sidebar
+    (0.2, 0.08, 0.8, 0.6, (245, 245, 245), (20, 20, 20), 12),  # document
+    (0.2, 0.68, 0.8, 0.32, (255, 255, 255), (60, 60, 60), 32)  # banner
+]
+
+
+def _font(size):
+    from PIL import ImageFont
+
+    for name in ("DejaVuSans.ttf", "arial.ttf"):
+        try:
+            return ImageFont.truetype(name, size)
+        except OSError:
+            pass
+    return ImageFont.load_default()
+
+
+def _strokes(image, x, y, w, h, color):
+    """Glyph-like vertical strokes, when Pillow is not installed"""
+    for left in range(x, x + w, max(2, h // 4)):
+        image[y:y + h, left:min(left + max(1, h // 8), x + w)] = color
+
+
+def synthetic_screen(width=1280, height=800, seed=0):
+    """(RGB image, [(word, (x, y, w, h))]) for one synthetic screen"""
+    rng = np.random.default_rng(seed)
+    image = np.zeros((height, width, 3), dtype=np.uint8)
+    truth = []
+    try:
+        from PIL import Image, ImageDraw
+    except ImportError:
+        Image = None
+
+    for px, py, pw, ph, background, color, size in PANELS:
+        left, top = int(px * width), int(py * height)
+        right, bottom = left + int(pw * width), top + int(ph * height)
+        image[top:bottom, left:right] = background
+        if Image is not None:
+            canvas = Image.fromarray(image)
+            draw, font = ImageDraw.Draw(canvas), _font(size)
+        for line_top in range(top + size // 2, bottom - 2 * size, 2 * size):
+            x = left + size
+            for word in rng.choice(WORDS, size=rng.integers(2, 8)):
+                if Image is not None:
+                    box = draw.textbbox((x, line_top), word, font=font)
+                    w, h = box[2] - x, box[3] - line_top
+                else:
+                    w, h = len(word) * size * 6 // 10, size
+                if x + w >= right - size:
+                    break
+                if Image is not None:
+                    draw.text((x, line_top), word, fill=color, font=font)
+                    truth.append((word, box[0], box[1], box[2] - box[0], box[3] - box[1]))
+                else:
+                    _strokes(image, x, line_top, w, h, color)
+                    truth.append((word, x, line_top, w, h))
+                x += w + size // 2
+        if Image is not None:
+            image = np.array(canvas)
+    return image, [(word, (x, y, w, h)) for word, x, y, w, h in truth]
+
+
+def _matches(word, text, box, check_text):
+    x, y, w, h = box
+    cx, cy = word['position']
+    inside = x - 2 <= cx <= x + w + 2 and y - 2 <= cy <= y + h + 2
+    return inside and (not check_text or word['text'].lower().strip(".,:;") == text)
+
+
+def accuracy(words, truth, check_text):
+    """(recall, precision) of the OCR words against the ground truth"""
+    found = sum(any(_matches(word, text, box, check_text) for word in words)
+                for text, box in truth)
+    correct = sum(any(_matches(word, text, box, check_text) for text, box in truth)
+                  for word in words)
+    return found / max(len(truth), 1), correct / max(len(words), 1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, default=3)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--width", type=int, default=1280)
+    parser.add_argument("--height", type=int, default=800)
+    parser.add_argument("--text-height", type=int, default=32)
+    parser.add_argument("--ocr", choices=["auto", "tesseract", "stand-in"], default="auto")
+    args = parser.parse_args()
+
+    use_tesseract = args.ocr == "tesseract" or (args.ocr == "auto" and tesseract_available())
+    ocr_fn = tesseract_data if use_tesseract else stand_in_ocr
+    preprocessor = TextPreprocessor(target_height=args.text_height)
+    preprocessed = PreprocessedOCR(ocr_fn, preprocessor)
+
+    results = {"raw": [], "preprocessed": []}
+    for page in range(args.pages):
+        image, truth = synthetic_screen(args.width, args.height, seed=page)
+        gray = to_gray(image, "RGB")
+        mosaic, _ = preprocessor.prepare(image)
+        prepare_time, _ = best_of(lambda: preprocessor.prepare(image), args.repeat)
+        for name, fn, pixels in (("raw", lambda: ocr_fn(gray), gray.size),
+                                 ("preprocessed", lambda: preprocessed(image),
+                                  0 if mosaic is None else mosaic.size)):
+            elapsed, data = best_of(fn, args.repeat)
+            words = parse_ocr_data(data)
+            results[name].append((elapsed, prepare_time if name == "preprocessed" else 0.0,
+                                  pixels, *accuracy(words, truth, use_tesseract)))
+
+    print(f"OCR engine:  {'tesseract' if use_tesseract else 'stand-in'}")
+    print(f"Corpus:      {args.pages} page(s) of {args.width}x{args.height}")
+    print(f"{'':14}{'latency ms':>12}{'of which prep':>15}{'OCR pixels':>12}"
+          f"{'recall':>8}{'precision':>11}")
+    for name, rows in results.items():
+        elapsed, prepare, pixels, found, correct = (np.mean(column) for column in zip(*rows))
+        print(f"{name:14}{elapsed * 1000:12.1f}{prepare * 1000:15.1f}"
+              f"{int(pixels):12d}{found:8.2f}{correct:11.2f}")
+
+
+if __name__ == "__main__":
+    main()
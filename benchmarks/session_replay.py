@@ -0,0 +1,434 @@
+"""Replay recorded sessions through the assistant and report per-stage latency.
+
+    python benchmarks/session_replay.py --corpus data/learning/interaction_history.json \\
+        --passes 2 --llm-latency 0.2 --token-latency 0.02 --output report.json
+
+Drives EnhancedVoiceAssistant's processing path (context update, response
+cache, skill routing, UI commands, the LLM and persistence) with stand-in
+recognizer, synthesizer, model and UI backends whose latencies are set on
+the command line; everything else is the assistant's own code. The
+corpus is data/learning/interaction_history.json, data/memory/memory_state.json
+or a JSONL file with one {"command": ...} (or a plain string) per line.
+
+The assistant runs in a temporary working directory, so its database,
+memory and context files start empty and real data is never written.
+Built-in skill handlers are replaced as well; replaying "restart" must not
+restart the machine.
+
+Sequential mode (the default) feeds one utterance at a time and reports
+the latency of every stage plus the total and time to first response per
+utterance; pipeline mode submits the whole corpus to the assistant's
+concurrent pipeline and is the one to read throughput from. The report
+is printed as a table and, with --output, written as JSON; --baseline
+compares against an earlier report, e.g. from another commit.
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# main.py imports its modules as core.*, from inside src
+sys.path.append(os.path.join(ROOT, "src"))
+sys.path.append(ROOT)
+
+from config.settings import Config
+from core.command_processor import EnhancedCommandProcessor
+from core.llm_processor import LLMProcessor
+from core.speech_worker import NORMAL, SpeechWorker
+from core.sentence_stream import stream_to_speech
+from main import EnhancedVoiceAssistant
+
+REPORT_VERSION = 1
+STAGES = ["recognition", "context", "cache", "skill_routing", "skill", "ui", "llm",
+          "persistence", "synthesis", "first_response", "total"]
+
+
+class StubRecognizer:
+    """Returns the replayed text after a fixed recognition latency"""
+
+    def __init__(self, latency=0.0):
+        self.latency = latency
+        self.on_speech_start = None
+
+    def recognize(self, audio):
+        time.sleep(self.latency)
+        return audio
+
+    def capture(self, passive=False):
+        return None
+
+    def stop_capture(self):
+        pass
+
+
+class StubSynthesizer:
+    """Speech worker whose engine takes `latency` seconds per sentence.
+
+    The time of the first say() after mark() is kept, i.e. when the
+    response to the current utterance was first handed to speech.
+    """
+
+    def __init__(self, latency=0.0):
+        self.latency = latency
+        self.last_stream_metrics = None
+        self.first_say = None
+        # Late binding so a timing wrapper on speak() is picked up
+        self.worker = SpeechWorker(lambda text: self.speak(text))
+
+    @property
+    def speaking(self):
+        return self.worker.speaking
+
+    def spoke_during(self, start, end):
+        return self.worker.spoke_during(start, end)
+
+    def mark(self):
+        self.first_say = None
+
+    def speak(self, text):
+        time.sleep(self.latency)
+
+    def say(self, text, priority=NORMAL):
+        if self.first_say is None:
+            self.first_say = time.perf_counter()
+        return self.worker.say(text, priority)
+
+    def speak_stream(self, segments, started_at=None, on_first_audio=None):
+        started_at = started_at or time.perf_counter()
+        queued = []
+
+        def first_audio():
+            if on_first_audio is not None:
+                on_first_audio(time.perf_counter() - started_at)
+
+        def queue_segment(segment):
+            if self.first_say is None:
+                self.first_say = time.perf_counter()
+            self.worker.say(segment, NORMAL, None if queued else first_audio)
+            queued.append(segment)
+
+        text, self.last_stream_metrics = stream_to_speech(segments, queue_segment, started_at)
+        return text
+
+    def prerender(self, phrases):
+        pass
+
+    def interrupt(self):
+        self.worker.interrupt()
+
+    def close(self, timeout=5.0):
+        self.worker.wait(timeout)
+        self.worker.stop()
+
+
+class StubUIController:
+    """Succeeds at every UI command after a fixed latency"""
+
+    def __init__(self, latency=0.0):
+        self.latency = latency
+        self.commands = 0
+
+    def execute_command(self, action, parameters):
+        time.sleep(self.latency)
+        self.commands += 1
+        return True
+
+
+class StageTimer:
+    """Collects call durations per stage by wrapping methods of live objects"""
+
+    def __init__(self):
+        self.samples = {}
+        self._lock = threading.Lock()
+
+    def record(self, stage, elapsed):
+        with self._lock:
+            self.samples.setdefault(stage, []).append(elapsed)
+
+    def wrap(self, obj, name, stage, generator=False):
+        method = getattr(obj, name)
+
+        def timed(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                self.record(stage, time.perf_counter() - started)
+
+        def timed_generator(*args, **kwargs):
+            # Only the time spent producing items counts, not the consumer's
+            elapsed = 0.0
+            items = iter(method(*args, **kwargs))
+            try:
+                while True:
+                    started = time.perf_counter()
+                    try:
+                        item = next(items)
+                    except StopIteration:
+                        break
+                    finally:
+                        elapsed += time.perf_counter() - started
+                    yield item
+            finally:
+                self.record(stage, elapsed)
+
+        setattr(obj, name, timed_generator if generator else timed)
+
+
+def load_utterances(path):
+    """Commands from an interaction history, a memory state or a JSONL corpus"""
+    with open(path, encoding="utf-8") as f:
+        if path.endswith(".jsonl"):
+            records = [json.loads(line) for line in f if line.strip()]
+        else:
+            records = json.load(f)
+    if isinstance(records, dict):
+        records = records.get("interactions", [])
+    utterances = []
+    for record in records:
+        text = record if isinstance(record, str) else (
+            record.get("command") or record.get("text") or record.get("utterance"))
+        if text and text.strip():
+            utterances.append(text.strip())
+    return utterances
+
+
+def percentile(values, q):
+    """q-th percentile with linear interpolation between closest ranks"""
+    values = sorted(values)
+    if not values:
+        return None
+    position = (len(values) - 1) * q / 100
+    lower = int(position)
+    upper = min(lower + 1, len(values) - 1)
+    return values[lower] + (values[upper] - values[lower]) * (position - lower)
+
+
+def summarize(samples):
+    """Per-stage count and latency percentiles in milliseconds"""
+    summary = {}
+    for stage in STAGES + sorted(set(samples) - set(STAGES)):
+        values = samples.get(stage)
+        if not values:
+            continue
+        summary[stage] = {
+            "count": len(values),
+            "mean_ms": round(sum(values) / len(values) * 1000, 3),
+            "p50_ms": round(percentile(values, 50) * 1000, 3),
+            "p95_ms": round(percentile(values, 95) * 1000, 3),
+            "p99_ms": round(percentile(values, 99) * 1000, 3),
+            "max_ms": round(max(values) * 1000, 3)
+        }
+    return summary
+
+
+def build_assistant(latencies, timer):
+    """EnhancedVoiceAssistant on stand-in backends, instrumented by timer"""
+    recognizer = StubRecognizer(latencies["recognition"])
+    synthesizer = StubSynthesizer(latencies["synthesis"])
+    ui = StubUIController(latencies["ui"])
+    llm = LLMProcessor(None, system_prompt=Config.LLM_SYSTEM_PROMPT, backend="stub",
+                       backend_options={"latency": latencies["llm"],
+                                        "token_latency": latencies["token"]})
+    processor = EnhancedCommandProcessor(llm, ui_controller=ui)
+    assistant = EnhancedVoiceAssistant(None, text_only=True, recognizer=recognizer,
+                                       synthesizer=synthesizer, llm=llm, processor=processor)
+
+    def skill_handler(command):
+        time.sleep(latencies["skill"])
+        return "Done"
+
+    for skill in assistant.skills.skills.values():
+        skill["handler"] = skill_handler
+
+    timer.wrap(recognizer, "recognize", "recognition")
+    timer.wrap(synthesizer, "speak", "synthesis")
+    timer.wrap(ui, "execute_command", "ui")
+    timer.wrap(llm, "stream_query", "llm", generator=True)
+    timer.wrap(assistant.context, "update_context", "context")
+    timer.wrap(assistant.response_cache, "get", "cache")
+    timer.wrap(assistant.skills, "has_skill_for", "skill_routing")
+    timer.wrap(assistant.skills, "execute_skill", "skill")
+    timer.wrap(assistant, "persist_result", "persistence")
+    # The pipeline holds the stage handlers; rebuild it with the wrapped ones
+    assistant.pipeline = assistant.build_pipeline()
+    return assistant
+
+
+def close_assistant(assistant):
+    assistant.pipeline.stop(drain=False, timeout=1.0)
+    assistant.synthesizer.close()
+    assistant.memory.stop_compaction()
+    assistant.memory.save_state()
+    assistant.context.save_context()
+    assistant.store.close()
+
+
+def replay_sequential(assistant, utterances, timer):
+    """Feed utterances one at a time; returns (elapsed, counters)"""
+    counters = {"utterances": 0, "cached": 0, "skills": 0, "processor": 0, "errors": 0}
+    synthesizer = assistant.synthesizer
+    started = time.perf_counter()
+    for utterance in utterances:
+        utterance_started = time.perf_counter()
+        synthesizer.mark()
+        counters["utterances"] += 1
+        try:
+            text = assistant.recognizer.recognize(utterance)
+            result = assistant.route_command(text)
+            if result is None:
+                continue
+            if result.get("cached"):
+                counters["cached"] += 1
+            elif "segments" in result:
+                # UI command or LLM answer, from the command processor
+                counters["processor"] += 1
+            else:
+                counters["skills"] += 1
+            result = assistant.speak_result(result)
+            if result is not None:
+                assistant.persist_result(result)
+        except Exception as e:
+            counters["errors"] += 1
+            print(f"Replay error on {utterance!r}: {e}", file=sys.stderr)
+            continue
+        finished = time.perf_counter()
+        timer.record("total", finished - utterance_started)
+        if synthesizer.first_say is not None:
+            timer.record("first_response", synthesizer.first_say - utterance_started)
+    return time.perf_counter() - started, counters
+
+
+def replay_pipeline(assistant, utterances, timeout=300.0):
+    """Submit every utterance to the concurrent pipeline; returns (elapsed, counters)"""
+    started = time.perf_counter()
+    assistant.pipeline.start()
+    for utterance in utterances:
+        assistant.pipeline.submit(assistant.recognizer.recognize(utterance))
+    drained = assistant.pipeline.drain(timeout)
+    elapsed = time.perf_counter() - started
+    return elapsed, {"utterances": len(utterances), "drained": drained}
+
+
+def run(utterances, latencies, passes=1, mode="sequential", verbose=False):
+    """Replay utterances `passes` times in a scratch directory; returns the report"""
+    timer = StageTimer()
+    cwd = os.getcwd()
+    output = contextlib.nullcontext() if verbose else contextlib.redirect_stdout(io.StringIO())
+    with tempfile.TemporaryDirectory() as workdir, output:
+        os.chdir(workdir)
+        try:
+            for directory in ("data/memory", "data/skills", "data/context"):
+                os.makedirs(directory, exist_ok=True)
+            assistant = build_assistant(latencies, timer)
+            try:
+                corpus = utterances * passes
+                if mode == "pipeline":
+                    elapsed, counters = replay_pipeline(assistant, corpus)
+                else:
+                    elapsed, counters = replay_sequential(assistant, corpus, timer)
+            finally:
+                close_assistant(assistant)
+        finally:
+            os.chdir(cwd)
+
+    return {
+        "version": REPORT_VERSION,
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "commit": _commit(),
+        "mode": mode,
+        "passes": passes,
+        "latencies": latencies,
+        "elapsed_s": round(elapsed, 4),
+        "throughput_per_s": round(len(utterances) * passes / elapsed, 2) if elapsed else None,
+        "counters": counters,
+        "stages": summarize(timer.samples)
+    }
+
+
+def _commit():
+    try:
+        result = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                                capture_output=True, text=True, timeout=5)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return result.stdout.strip() or None
+
+
+def print_report(report, baseline=None):
+    print(f"Mode:        {report['mode']}, {report['counters']['utterances']} utterance(s) "
+          f"in {report['elapsed_s']:.2f}s ({report['throughput_per_s']}/s)")
+    print(f"Counters:    {report['counters']}")
+    header = f"{'stage':16}{'count':>7}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}"
+    print(header + ("   p50 / p95 vs baseline" if baseline else ""))
+    for stage, stats in report["stages"].items():
+        line = (f"{stage:16}{stats['count']:7d}{stats['p50_ms']:10.2f}{stats['p95_ms']:10.2f}"
+                f"{stats['p99_ms']:10.2f}{stats['max_ms']:10.2f}")
+        before = (baseline or {}).get("stages", {}).get(stage)
+        if before:
+            line += f"   {_change(before['p50_ms'], stats['p50_ms'])} / " \
+                    f"{_change(before['p95_ms'], stats['p95_ms'])}"
+        print(line)
+
+
+def _change(before, after):
+    if not before:
+        return "n/a"
+    return f"{(after - before) / before * 100:+.0f}%"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--corpus", default=os.path.join(ROOT, "data", "learning",
+                                                         "interaction_history.json"))
+    parser.add_argument("--passes", type=int, default=1,
+                        help="replay the corpus this many times; later passes hit the cache")
+    parser.add_argument("--mode", choices=["sequential", "pipeline"], default="sequential")
+    parser.add_argument("--recognition-latency", type=float, default=0.0)
+    parser.add_argument("--llm-latency", type=float, default=0.0,
+                        help="seconds before the stand-in model's first token")
+    parser.add_argument("--token-latency", type=float, default=0.0)
+    parser.add_argument("--tts-latency", type=float, default=0.0,
+                        help="seconds the stand-in speech engine takes per sentence")
+    parser.add_argument("--ui-latency", type=float, default=0.0)
+    parser.add_argument("--skill-latency", type=float, default=0.0)
+    parser.add_argument("--output", help="write the JSON report here")
+    parser.add_argument("--baseline", help="earlier JSON report to compare against")
+    parser.add_argument("--verbose", action="store_true", help="show the assistant's output")
+    args = parser.parse_args()
+
+    utterances = load_utterances(args.corpus)
+    if not utterances:
+        sys.exit(f"No utterances in {args.corpus}")
+    latencies = {
+        "recognition": args.recognition_latency,
+        "llm": args.llm_latency,
+        "token": args.token_latency,
+        "synthesis": args.tts_latency,
+        "ui": args.ui_latency,
+        "skill": args.skill_latency
+    }
+    report = run(utterances, latencies, args.passes, args.mode, args.verbose)
+    report["corpus"] = {"path": os.path.relpath(os.path.abspath(args.corpus), ROOT),
+                        "utterances": len(utterances)}
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+    print_report(report, baseline)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""Measure assistant startup: import time per module and wall-clock to ready.
+
+    python benchmarks/startup.py --top 15 --repeat 3
+
+Each target module is imported in a fresh interpreter under
+`python -X importtime`, and the modules it pulled in are listed by
+cumulative import time, with the heavy optional dependencies that should
+only load on demand called out. "Ready" is measured in a fresh interpreter
+as well: the time from start to a constructed EnhancedCommandProcessor
+(with the stub LLM backend, so model loading is not counted), followed
+by the time the optional subsystems take when they are first used; a
+subsystem that fails to load is reported as failed rather than timed.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+TARGETS = ["core.command_processor", "core.llm_processor", "core.pipeline"]
+
+# Dependencies that belong to optional subsystems, not to startup
+HEAVY = ["torch", "transformers", "cv2", "pytesseract", "PIL", "numpy", "pyautogui",
+         "pygetwindow", "keyboard", "psutil", "win32gui", "win32con", "win32api", "mss",
+         "llama_cpp"]
+
+READY_SCRIPT = """
+import json, sys, time
+started = time.perf_counter()
+from core.llm_processor import LLMProcessor
+from core.command_processor import EnhancedCommandProcessor
+processor = EnhancedCommandProcessor(LLMProcessor(None, backend="stub"))
+ready = time.perf_counter() - started
+properties = {"screen": "screen_analyzer", "ui": "ui_controller"}
+subsystems, errors = {}, {}
+for name in sys.argv[1:]:
+    started = time.perf_counter()
+    try:
+        getattr(processor, properties[name])
+        subsystems[name] = time.perf_counter() - started
+    except Exception as e:
+        errors[name] = f"{type(e).__name__}: {e}"
+print(json.dumps({"ready": ready, "subsystems": subsystems, "errors": errors,
+                  "modules": sorted(sys.modules)}))
+"""
+
+
+def _env():
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join([os.path.join(ROOT, "src"), ROOT,
+                                         env.get("PYTHONPATH", "")])
+    return env
+
+
+def parse_importtime(stderr):
+    """{module: (self_us, cumulative_us)} from `-X importtime` output"""
+    times = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        times[name.strip()] = (int(self_us), int(cumulative_us))
+    return times
+
+
+def import_times(module):
+    """(times, error) for importing module in a fresh interpreter"""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            capture_output=True, text=True, cwd=ROOT, env=_env())
+    error = None
+    if result.returncode != 0:
+        error = (result.stderr.strip().splitlines() or ["failed"])[-1]
+    return parse_importtime(result.stderr), error
+
+
+def ready_time(subsystems):
+    """Wall-clock to a constructed command processor, and to each subsystem"""
+    result = subprocess.run([sys.executable, "-c", READY_SCRIPT, *subsystems],
+                            capture_output=True, text=True, cwd=ROOT, env=_env())
+    if result.returncode != 0:
+        raise RuntimeError((result.stderr.strip().splitlines() or ["failed"])[-1])
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--targets", nargs="+", default=TARGETS)
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--subsystems", nargs="*", default=["screen", "ui"])
+    args = parser.parse_args()
+
+    for target in args.targets:
+        times, error = import_times(target)
+        total = times.get(target, (0, 0))[1]
+        heavy = sorted(name for name in times if name.split(".")[0] in HEAVY
+                       and "." not in name)
+        print(f"import {target}: {total / 1000:.1f} ms, {len(times)} modules"
+              + (f" (failed: {error})" if error else ""))
+        print(f"  heavy dependencies: {', '.join(heavy) or 'none'}")
+        print(f"  {'cumulative ms':>14}{'self ms':>10}  module")
+        ranked = sorted(times.items(), key=lambda item: -item[1][1])
+        for name, (self_us, cumulative_us) in ranked[:args.top]:
+            print(f"  {cumulative_us / 1000:14.1f}{self_us / 1000:10.1f}  {name}")
+        print()
+
+    runs = []
+    for _ in range(args.repeat):
+        try:
+            runs.append(ready_time(args.subsystems))
+        except RuntimeError as e:
+            print(f"Ready measurement failed: {e}")
+            return
+    heavy = sorted(name for name in runs[-1]["modules"] if name in HEAVY)
+    print(f"Ready (command processor constructed): "
+          f"{statistics.median(run['ready'] for run in runs) * 1000:.1f} ms median "
+          f"of {len(runs)}")
+    for name in args.subsystems:
+        error = next((run["errors"][name] for run in runs if name in run["errors"]), None)
+        if error is not None:
+            print(f"  first use of {name!r}: failed ({error})")
+            continue
+        elapsed = statistics.median(run["subsystems"][name] for run in runs)
+        print(f"  first use of {name!r}: {elapsed * 1000:.1f} ms")
+    print(f"Heavy modules loaded after first use: {', '.join(heavy) or 'none'}")
+
+
+if __name__ == "__main__":
+    main()
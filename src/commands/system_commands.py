@@ -5,10 +5,30 @@ def open_application(app_name):
     import os
     os.system(f'start {app_name}')
 
-def search_file(file_name):
-    """Searches for the specified file in the system."""
-    import os
-    for root, dirs, files in os.walk("C:\\"):
-        if file_name in files:
-            return os.path.join(root, file_name)
-    return None
\ No newline at end of file
+_file_index = None
+
+def get_file_index(roots=("C:\\",), index_path=None, workers=8, exclude=()):
+    """File-name index of roots, loaded from disk and refreshed in the background.
+
+    The index is created by the first call; later calls return it as is.
+    """
+    global _file_index
+    if _file_index is None:
+        from ..core.file_search import FileSearchIndex
+        _file_index = FileSearchIndex(roots, index_path, workers=workers,
+                                      exclude=exclude).start()
+    return _file_index
+
+def search_file(file_name, wait=5.0, index_options=None):
+    """Searches for the specified file in the system.
+
+    index_options are the get_file_index() settings (e.g. Config.FILE_INDEX_*).
+    """
+    index = get_file_index(**(index_options or {}))
+    index.loaded.wait(wait)
+    path = index.find(file_name)
+    if path is None and not index.ready.is_set():
+        # Nothing saved yet; give the first crawl a moment
+        index.wait(wait)
+        path = index.find(file_name)
+    return path
@@ -4,4 +4,121 @@ class Config:
     API_KEY = "your_api_key_here"
     SYSTEM_PATH = "C:\\Program Files"
     CUSTOM_COMMANDS_PATH = "path_to_custom_commands"
-    LOG_FILE = "voice_assistant.log"
\ No newline at end of file
+    LOG_FILE = "voice_assistant.log"
+
+    # Response cache
+    RESPONSE_CACHE_SIZE = 256
+    RESPONSE_CACHE_TTL = 3600  # seconds
+    RESPONSE_CACHE_THRESHOLD = 0.8
+    UNCACHEABLE_KEYWORDS = ["time", "date", "today", "now", "weather", "clock"]
+
+    # Persistent storage
+    STORAGE_DB = "data/assistant.db"
+
+    # Context snapshots are written at most once per interval
+    CONTEXT_SNAPSHOT_INTERVAL = 5.0  # seconds
+
+    # Interaction retention: recent rows stay in the store, older rows are
+    # archived to compressed segments with hourly/daily rollups
+    MEMORY_HOT_WINDOW = 100
+    MEMORY_RAW_RETENTION_DAYS = 30
+    MEMORY_COLD_RETENTION_DAYS = None  # keep archived segments forever
+    MEMORY_ARCHIVE_CODEC = "gzip"  # or "lzma"
+    MEMORY_SEGMENT_MAX_BYTES = 4 * 1024 * 1024
+    MEMORY_SEGMENT_MAX_AGE_DAYS = 7
+    MEMORY_COMPACT_INTERVAL = 6 * 60 * 60  # seconds; also run once at startup
+
+    # LLM prompt prefix; its KV state is reused across queries and restarts
+    LLM_SYSTEM_PROMPT = (
+        "You are Jarvis, a helpful voice assistant. "
+        "Answer in one or two short spoken sentences.\n"
+    )
+    LLM_STATE_DIR = "data/llm_state"
+    LLM_INCLUDE_CONVERSATION = False
+
+    # LLM backend: "llama_cpp" or "stub" (deterministic, no model needed)
+    LLM_BACKEND = "llama_cpp"
+    LLM_BACKEND_OPTIONS = {
+        "n_ctx": 512,
+        "n_threads": 4,
+        "n_batch": 8,
+        "n_gpu_layers": 1,
+        "seed": 42
+    }
+    # The model loads on a background thread while the rest of the assistant
+    # starts; quick responses, commands and skills are served meanwhile.
+    # Model-bound queries wait up to LLM_READY_TIMEOUT seconds for it (None
+    # waits until it is loaded) and are then told it is still warming up.
+    LLM_BACKGROUND_LOAD = True
+    LLM_WARMUP = True  # generate one token after loading to page in weights
+    LLM_READY_TIMEOUT = 3.0
+
+    # Assistant pipeline
+    PIPELINE_QUEUE_SIZE = 8
+    PIPELINE_SHUTDOWN_TIMEOUT = 5.0  # seconds
+
+    # Audio capture: one long-lived input stream feeding a ring buffer
+    AUDIO_SAMPLE_RATE = 16000
+    AUDIO_FRAME_MS = 30
+    AUDIO_BUFFER_SECONDS = 30
+    AUDIO_PRE_ROLL = 0.3  # seconds kept before speech onset
+    AUDIO_MIN_ENERGY = 300  # floor for the adaptive speech threshold
+
+    # Speech-to-text engines run concurrently; "first" returns the first
+    # answer above the confidence floor, "best" the most confident by the
+    # deadline. Offline engines start only if the first has not answered
+    # within the hedge delay.
+    RECOGNIZER_MODE = "first"
+    RECOGNIZER_DEADLINE = 8.0  # seconds
+    RECOGNIZER_MIN_CONFIDENCE = 0.3
+    RECOGNIZER_HEDGE_DELAY = 1.5  # seconds
+
+    # Phrases are only sent to the recognizer when they contain speech and,
+    # while the assistant is passive, the wake word. Wake-word spotting on
+    # raw audio needs a few 16 kHz mono WAV recordings of it in this folder;
+    # record them with `python -m src.core.voice_gate --count 5`. Without
+    # any, only speech detection applies and the transcript is checked.
+    WAKE_WORD = "jarvis"
+    WAKE_WORD_TEMPLATE_DIR = "data/wake_word"
+    WAKE_WORD_THRESHOLD = 1.5
+
+    # Rendered speech is cached on disk and played back without the TTS engine
+    TTS_CACHE_DIR = "data/tts_cache"
+    TTS_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+    # Stop talking when the user starts speaking. Needs a headset or echo
+    # cancellation, otherwise the assistant's own voice triggers it, so it
+    # is off unless enabled here.
+    BARGE_IN = False
+    # Without barge-in, phrases heard while the assistant speaks, or within
+    # this many seconds after, are taken to be its own voice and dropped
+    ECHO_TAIL = 0.5  # seconds
+
+    # OCR preprocessing: only candidate text regions are read, rescaled so
+    # a text line is about OCR_TEXT_HEIGHT pixels tall and binarized
+    OCR_TEXT_HEIGHT = 32
+    OCR_BINARIZE = True
+    OCR_TEXT_REGIONS = True
+
+    # Screen capture: "mss" (zero-copy), "pyautogui" or "auto". Readers
+    # asking within SCREEN_CAPTURE_MAX_AGE seconds share the same frame.
+    SCREEN_CAPTURE_BACKEND = "auto"
+    SCREEN_CAPTURE_MAX_AGE = 0.2  # seconds
+
+    # Installed applications are indexed on disk and refreshed in the
+    # background; only folders whose mtime changed are listed again
+    APP_INDEX_PATH = "data/app_index.json"
+    APP_INDEX_WORKERS = 8
+
+    # File search: a file-name index of these roots, stored compressed and
+    # refreshed in the background by directory mtime. Passed to
+    # system_commands.search_file as its wait and index_options
+    FILE_INDEX_ROOTS = ["C:\\"]
+    FILE_INDEX_EXCLUDE = ["C:\\Windows", "C:\\$Recycle.Bin"]
+    FILE_INDEX_PATH = "data/file_index.json.gz"
+    FILE_INDEX_WORKERS = 8
+    FILE_INDEX_WAIT = 5.0  # seconds a search waits for the first crawl
+
+    # Optional subsystems ("screen", "ui") are imported on first use; those
+    # listed here are loaded in the background right after startup
+    PRELOAD_SUBSYSTEMS = ["screen", "ui"]
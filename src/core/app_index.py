@@ -0,0 +1,107 @@
+import bisect
+import os
+from difflib import SequenceMatcher, get_close_matches
+from .file_index import FileIndex
+
+# Spoken names whose executable is called something else
+ALIASES = {
+    "word": ["winword"],
+    "microsoft word": ["winword"],
+    "excel": ["excel"],
+    "powerpoint": ["powerpnt"],
+    "outlook": ["outlook"],
+    "onenote": ["onenote"],
+    "edge": ["msedge"],
+    "microsoft edge": ["msedge"],
+    "chrome": ["chrome"],
+    "google chrome": ["chrome"],
+    "firefox": ["firefox"],
+    "visual studio code": ["code"],
+    "vs code": ["code"],
+    "vscode": ["code"],
+    "visual studio": ["devenv"],
+    "teams": ["ms-teams", "teams"],
+    "file explorer": ["explorer"],
+    "explorer": ["explorer"],
+    "calculator": ["calc"],
+    "paint": ["mspaint"],
+    "command prompt": ["cmd"],
+    "terminal": ["wt", "windowsterminal"]
+}
+
+# Executables that ship next to an application but are not the application
+HELPER_WORDS = ("unins", "uninstall", "setup", "update", "crash", "helper", "install",
+                "report", "elevat", "notification")
+
+
+def app_roots():
+    """Standard Windows application folders"""
+    return [
+        os.environ.get('PROGRAMFILES', ''),
+        os.environ.get('PROGRAMFILES(X86)', ''),
+        os.environ.get('LOCALAPPDATA', ''),
+        os.environ.get('APPDATA', '')
+    ]
+
+
+class AppIndex(FileIndex):
+    """Index of installed executables, looked up by spoken application name.
+
+    A name is matched through the alias table, then as an exact executable
+    name, a prefix and finally fuzzily. Every executable with a matching
+    name is a candidate (the old dict kept only the last one found), and
+    candidates are ranked so the application itself beats its updater or
+    uninstaller and a folder named after the application counts in favour.
+    """
+
+    def __init__(self, roots=None, index_path=None, extensions=(".exe",), workers=8,
+                 aliases=None):
+        super().__init__(app_roots() if roots is None else roots, index_path, extensions, workers)
+        self.aliases = dict(ALIASES)
+        self.aliases.update(aliases or {})
+
+    def key(self, name):
+        return os.path.splitext(name)[0].lower()
+
+    def candidates(self, name, limit=5, cutoff=0.75):
+        """[(path, score)] for an application name, best first"""
+        query = " ".join(name.lower().split())
+        if query.endswith(".exe"):
+            query = query[:-4]
+        if not query:
+            return []
+        targets = list(dict.fromkeys(self.aliases.get(query, []) + [query, query.replace(" ", "")]))
+        with self._lock:
+            names, vocabulary = self.names, self.vocabulary
+
+        scores = {}
+        for target in targets:
+            if target in names:
+                scores[target] = max(scores.get(target, 0.0), 1.0)
+            start = bisect.bisect_left(vocabulary, target)
+            for key in vocabulary[start:start + 50]:
+                if not key.startswith(target):
+                    break
+                scores[key] = max(scores.get(key, 0.0), 0.7 + 0.2 * len(target) / len(key))
+            for key in get_close_matches(target, vocabulary, n=limit, cutoff=cutoff):
+                ratio = SequenceMatcher(None, target, key).ratio()
+                scores[key] = max(scores.get(key, 0.0), 0.8 * ratio)
+
+        ranked = []
+        for key, score in scores.items():
+            if any(word in key for word in HELPER_WORDS):
+                score -= 0.3
+            for path in names[key]:
+                folder = os.path.basename(os.path.dirname(path)).lower()
+                bonus = 0.05 if any(t in folder for t in targets) else 0.0
+                # Shallower installs first among equals
+                ranked.append((score + bonus - 0.001 * path.count(os.sep), path))
+        ranked.sort(key=lambda item: (-item[0], item[1]))
+        return [(path, round(score, 3)) for score, path in ranked[:limit]]
+
+    def find(self, name, min_score=0.6):
+        """Best executable for an application name, or None"""
+        candidates = self.candidates(name, limit=1)
+        if candidates and candidates[0][1] >= min_score:
+            return candidates[0][0]
+        return None
@@ -0,0 +1,162 @@
+import hashlib
+import os
+import tempfile
+import threading
+import wave
+from collections import OrderedDict
+
+
+class AudioCache:
+    """Size-bounded LRU cache of rendered speech on disk.
+
+    Entries are WAV files named by a hash of the processed text and the
+    voice settings. Recency survives restarts through file mtimes, which
+    are refreshed on every hit.
+    """
+
+    SUFFIX = ".wav"
+
+    def __init__(self, cache_dir, max_bytes=64 * 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()  # key -> size in bytes, oldest first
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+        self._load()
+
+    @staticmethod
+    def make_key(text, voice, rate, volume):
+        raw = f"{voice}\x00{rate}\x00{volume}\x00{text}"
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+    def path_for(self, key):
+        return os.path.join(self.cache_dir, key + self.SUFFIX)
+
+    def get(self, key):
+        """Path of the cached audio for key, or None"""
+        with self._lock:
+            if key not in self.entries:
+                self.misses += 1
+                return None
+            path = self.path_for(key)
+            if not os.path.exists(path):
+                self.total_bytes -= self.entries.pop(key)
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return path
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self.entries
+
+    def render(self, key, render_fn):
+        """Render into a temp file with render_fn(path) and add it under key.
+
+        Returns the cached path, or None when the renderer did not produce
+        a readable WAV file.
+        """
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, prefix=".tmp-", suffix=self.SUFFIX)
+        os.close(fd)
+        try:
+            render_fn(tmp_path)
+            if not self._valid_wav(tmp_path):
+                return None
+            path = self.path_for(key)
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+        size = os.path.getsize(path)
+        with self._lock:
+            self.total_bytes -= self.entries.pop(key, 0)
+            self.entries[key] = size
+            self.total_bytes += size
+            self._evict()
+        return path
+
+    def clear(self):
+        with self._lock:
+            for key in list(self.entries):
+                self._remove(key)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self.entries),
+                "bytes": self.total_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions
+            }
+
+    def _load(self):
+        """Index files left by a previous run, least recently used first"""
+        found = []
+        for name in os.listdir(self.cache_dir):
+            if name.startswith(".tmp-"):
+                os.remove(os.path.join(self.cache_dir, name))
+                continue
+            if not name.endswith(self.SUFFIX):
+                continue
+            stat = os.stat(os.path.join(self.cache_dir, name))
+            found.append((stat.st_mtime, name[:-len(self.SUFFIX)], stat.st_size))
+        for _, key, size in sorted(found):
+            self.entries[key] = size
+            self.total_bytes += size
+        self._evict()
+
+    def _evict(self):
+        # Always keep the newest entry, even if it alone exceeds the bound
+        while self.total_bytes > self.max_bytes and len(self.entries) > 1:
+            self._remove(next(iter(self.entries)))
+            self.evictions += 1
+
+    def _remove(self, key):
+        self.total_bytes -= self.entries.pop(key)
+        try:
+            os.remove(self.path_for(key))
+        except OSError:
+            pass
+
+    def _valid_wav(self, path):
+        try:
+            with wave.open(path, "rb") as wav:
+                return wav.getnframes() > 0
+        except (wave.Error, EOFError, OSError):
+            return False
+
+
+def play_wav(path, stop=None, chunk_size=4096):
+    """Play a WAV file on the default output device until stop is set"""
+    import pyaudio
+
+    audio = pyaudio.PyAudio()
+    try:
+        with wave.open(path, "rb") as wav:
+            stream = audio.open(
+                format=audio.get_format_from_width(wav.getsampwidth()),
+                channels=wav.getnchannels(),
+                rate=wav.getframerate(),
+                output=True
+            )
+            try:
+                data = wav.readframes(chunk_size)
+                while data and not (stop and stop.is_set()):
+                    stream.write(data)
+                    data = wav.readframes(chunk_size)
+            finally:
+                stream.stop_stream()
+                stream.close()
+    finally:
+        audio.terminate()
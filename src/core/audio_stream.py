@@ -0,0 +1,258 @@
+import queue
+import threading
+import time
+import wave
+import numpy as np
+
+
+class MicrophoneSource:
+    """Long-lived PyAudio input stream read one frame at a time"""
+
+    def __init__(self, sample_rate=16000, frame_size=480, device_index=None):
+        import pyaudio
+
+        self.sample_rate = sample_rate
+        self.frame_size = frame_size
+        self._audio = pyaudio.PyAudio()
+        self._stream = self._audio.open(
+            format=pyaudio.paInt16,
+            channels=1,
+            rate=sample_rate,
+            input=True,
+            input_device_index=device_index,
+            frames_per_buffer=frame_size
+        )
+
+    def read(self):
+        data = self._stream.read(self.frame_size, exception_on_overflow=False)
+        return np.frombuffer(data, dtype=np.int16)
+
+    def close(self):
+        self._stream.stop_stream()
+        self._stream.close()
+        self._audio.terminate()
+
+
+class ArraySource:
+    """Serves int16 samples from memory; stands in for the microphone in tests"""
+
+    def __init__(self, samples, sample_rate=16000, frame_size=480, realtime=False):
+        self.samples = np.asarray(samples, dtype=np.int16)
+        self.sample_rate = sample_rate
+        self.frame_size = frame_size
+        self.realtime = realtime
+        self.position = 0
+
+    def read(self):
+        """Next frame, or None once the samples run out"""
+        if self.position >= len(self.samples):
+            return None
+        frame = self.samples[self.position:self.position + self.frame_size]
+        self.position += self.frame_size
+        if self.realtime:
+            time.sleep(len(frame) / self.sample_rate)
+        return frame
+
+    def close(self):
+        pass
+
+
+class WavFileSource(ArraySource):
+    """Mono 16-bit WAV file played back as a frame source"""
+
+    def __init__(self, path, frame_size=480, realtime=False):
+        with wave.open(path, "rb") as wav:
+            if wav.getsampwidth() != 2 or wav.getnchannels() != 1:
+                raise ValueError("WavFileSource needs mono 16-bit audio")
+            sample_rate = wav.getframerate()
+            samples = np.frombuffer(wav.readframes(wav.getnframes()), dtype=np.int16)
+        super().__init__(samples, sample_rate, frame_size, realtime)
+
+
+class RingBuffer:
+    """Preallocated circular sample buffer addressed by absolute sample index"""
+
+    def __init__(self, capacity, dtype=np.int16):
+        self.data = np.zeros(capacity, dtype=dtype)
+        self.capacity = capacity
+        self.total_written = 0
+
+    def write(self, samples):
+        written = len(samples)
+        samples = samples[-self.capacity:]
+        start = (self.total_written + written - len(samples)) % self.capacity
+        first = min(len(samples), self.capacity - start)
+        self.data[start:start + first] = samples[:first]
+        self.data[:len(samples) - first] = samples[first:]
+        self.total_written += written
+
+    def read(self, start, end):
+        """Copy samples [start, end), clamped to what is still buffered"""
+        start = max(start, self.total_written - self.capacity, 0)
+        end = min(end, self.total_written)
+        if end <= start:
+            return np.zeros(0, dtype=self.data.dtype)
+        indices = np.arange(start, end) % self.capacity
+        return self.data[indices]
+
+
+def frame_rms(frame):
+    """Root-mean-square energy of an int16 frame"""
+    if len(frame) == 0:
+        return 0.0
+    samples = frame.astype(np.float32)
+    return float(np.sqrt(np.mean(samples * samples)))
+
+
+class NoiseFloorEstimator:
+    """Tracks the background energy level from frames that are not speech"""
+
+    def __init__(self, initial=100.0, adapt_rate=0.05, multiplier=3.0, min_threshold=300.0):
+        self.floor = initial
+        self.adapt_rate = adapt_rate
+        self.multiplier = multiplier
+        self.min_threshold = min_threshold
+        self.calibrated_frames = 0
+
+    @property
+    def threshold(self):
+        return max(self.min_threshold, self.floor * self.multiplier)
+
+    def update(self, energy):
+        self.floor += self.adapt_rate * (energy - self.floor)
+
+    def calibrate(self, energy):
+        """Running mean used while the stream warms up"""
+        self.calibrated_frames += 1
+        self.floor += (energy - self.floor) / self.calibrated_frames
+
+
+class Phrase:
+    __slots__ = ("samples", "sample_rate", "start", "end", "captured_at")
+
+    def __init__(self, samples, sample_rate, start, end):
+        self.samples = samples
+        self.sample_rate = sample_rate
+        self.start = start
+        self.end = end
+        self.captured_at = time.time()
+
+    @property
+    def duration(self):
+        return len(self.samples) / self.sample_rate
+
+
+class AudioCapture:
+    """Continuously reads a frame source into a ring buffer and cuts phrases.
+
+    A background thread keeps the stream open, estimates the noise floor
+    from non-speech frames and extracts phrases (with pre-roll, so the
+    first syllable is kept) into a queue read by get_phrase(). The first
+    `calibration` seconds of the stream only seed the noise floor; this is
+    paid once when the stream opens rather than before every listen.
+    """
+
+    def __init__(self, source, buffer_seconds=30.0, pre_roll=0.3, pause_threshold=0.8,
+                 phrase_threshold=0.3, phrase_time_limit=15.0, noise=None, max_phrases=16,
+                 calibration=0.5, on_speech_start=None):
+        self.source = source
+        self.sample_rate = source.sample_rate
+        self.buffer = RingBuffer(int(buffer_seconds * self.sample_rate))
+        self.noise = noise or NoiseFloorEstimator()
+        self.pre_roll = int(pre_roll * self.sample_rate)
+        self.pause_samples = int(pause_threshold * self.sample_rate)
+        self.min_phrase_samples = int(phrase_threshold * self.sample_rate)
+        self.max_phrase_samples = int(phrase_time_limit * self.sample_rate)
+        self.calibration_samples = int(calibration * self.sample_rate)
+        self.on_speech_start = on_speech_start
+        self.phrases = queue.Queue(max_phrases)
+        self.dropped_phrases = 0
+        self.exhausted = threading.Event()
+
+        self._speech_start = None
+        self._voice_start = None
+        self._last_voiced = None
+        self._running = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._running.set()
+        self._thread = threading.Thread(target=self._run, name="audio-capture", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._running.clear()
+        if self._thread is not None:
+            self._thread.join(1.0)
+        self.source.close()
+
+    def get_phrase(self, timeout=None):
+        """Next captured phrase, or None on timeout / end of source"""
+        deadline = None if timeout is None else time.time() + timeout
+        while True:
+            remaining = 0.1 if deadline is None else min(0.1, deadline - time.time())
+            if remaining <= 0:
+                return None
+            try:
+                return self.phrases.get(timeout=remaining)
+            except queue.Empty:
+                if self.exhausted.is_set() and self.phrases.empty():
+                    return None
+
+    def process_frame(self, frame):
+        """Buffer one frame and advance the phrase detector"""
+        self.buffer.write(frame)
+        end = self.buffer.total_written
+        energy = frame_rms(frame)
+
+        if end <= self.calibration_samples:
+            self.noise.calibrate(energy)
+        elif energy >= self.noise.threshold:
+            if self._speech_start is None:
+                self._voice_start = end - len(frame)
+                self._speech_start = max(0, self._voice_start - self.pre_roll)
+                if self.on_speech_start is not None:
+                    self.on_speech_start()
+            self._last_voiced = end
+        elif self._speech_start is None:
+            # Only silence adapts the noise floor
+            self.noise.update(energy)
+
+        if self._speech_start is not None:
+            silent = end - self._last_voiced
+            too_long = end - self._speech_start >= self.max_phrase_samples
+            if silent >= self.pause_samples or too_long:
+                self._emit(self._speech_start, end)
+
+    def flush(self):
+        """Emit any phrase still in progress"""
+        if self._speech_start is not None:
+            self._emit(self._speech_start, self.buffer.total_written)
+
+    def _emit(self, start, end):
+        voiced = self._last_voiced - self._voice_start
+        self._speech_start = None
+        self._voice_start = None
+        self._last_voiced = None
+        if voiced < self.min_phrase_samples:
+            return
+        phrase = Phrase(self.buffer.read(start, end), self.sample_rate, start, end)
+        try:
+            self.phrases.put_nowait(phrase)
+        except queue.Full:
+            self.dropped_phrases += 1
+
+    def _run(self):
+        try:
+            while self._running.is_set():
+                frame = self.source.read()
+                if frame is None:
+                    self.flush()
+                    break
+                self.process_frame(frame)
+        except Exception as e:
+            print(f"Audio capture error: {e}")
+        finally:
+            self.exhausted.set()
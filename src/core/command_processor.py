@@ -1,45 +1,100 @@
 # command_processor.py
 
-import pyautogui
-import os
-import webbrowser
 import json
-import psutil
-import keyboard
-from datetime import datetime
-import win32gui
-import win32con
-import subprocess
-import pygetwindow as gw
-from pathlib import Path
-from .screen_analyzer import ScreenAnalyzer
-from .learning_manager import LearningManager
-from .ui_controller import UIController
+import threading
 
 class EnhancedCommandProcessor:
-    def __init__(self, llm_processor):
+    # Optional subsystems, loaded on first use or by preload()
+    SUBSYSTEMS = ("screen", "ui")
+
+    def __init__(self, llm_processor, screen_analyzer=None, ui_controller=None,
+                 screen_options=None, ui_options=None):
         self.llm = llm_processor
-        self.ui_controller = UIController()
+        self._screen_analyzer = screen_analyzer
+        self._ui_controller = ui_controller
+        # Keyword arguments for the subsystems when they are built here
+        self.screen_options = screen_options or {}
+        self.ui_options = ui_options or {}
+        self._subsystem_lock = threading.RLock()
+
+    @property
+    def screen_analyzer(self):
+        """Screen OCR; imports numpy, tesseract and the OCR pool on first use"""
+        with self._subsystem_lock:
+            if self._screen_analyzer is None:
+                from .screen_analyzer import ScreenAnalyzer
+                self._screen_analyzer = ScreenAnalyzer(**self.screen_options)
+            return self._screen_analyzer
+
+    @property
+    def ui_controller(self):
+        """UI automation; imports pyautogui and the window APIs on first use"""
+        with self._subsystem_lock:
+            if self._ui_controller is None:
+                from .ui_controller import UIController
+                self._ui_controller = UIController(analyzer=self.screen_analyzer,
+                                                   **self.ui_options)
+            return self._ui_controller
+
+    def preload(self, subsystems=SUBSYSTEMS, background=True):
+        """Load optional subsystems ahead of their first use"""
+        def load():
+            try:
+                for name in subsystems:
+                    if name == "screen":
+                        self.screen_analyzer
+                    elif name == "ui":
+                        self.ui_controller
+            except Exception as e:
+                print(f"Subsystem preload error: {e}")
 
-    def process_command(self, command_text):
+        if not background:
+            load()
+            return None
+        thread = threading.Thread(target=load, name="subsystem-preload", daemon=True)
+        thread.start()
+        return thread
+
+    def process_command(self, command_text, conversation=None):
         try:
             # Get LLM response
-            response = self.llm.process_query(command_text)
+            response = self.llm.process_query(command_text, conversation)
             command_data = json.loads(response)
-            
-            if command_data['type'] == 'command':
-                # Execute UI command
-                success = self.ui_controller.execute_command(
-                    command_data['action'],
-                    command_data.get('parameters', {})
-                )
-                
-                if success:
-                    return command_data.get('response', 'Command executed successfully')
-                return "I couldn't complete that action"
-                
-            return command_data.get('response', "I understand")
+            return self._handle_command_data(command_data)
             
         except Exception as e:
             print(f"Command processing error: {e}")
-            return "I encountered an error processing your request"
\ No newline at end of file
+            return "I encountered an error processing your request"
+
+    def answers_from_model(self, command_text):
+        """True if the model answers, False for fast-path replies and UI actions"""
+        return self.llm.match_fast_path(command_text) is None
+
+    def process_command_stream(self, command_text, conversation=None):
+        """Yield the response in speakable segments as it is generated"""
+        try:
+            command_data = self.llm.match_fast_path(command_text)
+            if command_data is not None:
+                yield self._handle_command_data(command_data)
+                return
+        except Exception as e:
+            print(f"Command processing error: {e}")
+            yield "I encountered an error processing your request"
+            return
+
+        for segment in self.llm.stream_query(command_text, conversation):
+            yield segment
+
+    def _handle_command_data(self, command_data):
+        if command_data['type'] == 'command':
+            # Execute UI command
+            success = self.ui_controller.execute_command(
+                command_data['action'],
+                command_data.get('parameters', {})
+            )
+            
+            if success:
+                return command_data.get('response', 'Command executed successfully')
+            return "I couldn't complete that action"
+            
+        return command_data.get('response', "I understand")
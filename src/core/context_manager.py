@@ -1,80 +1,154 @@
-import json
+import sys
+import threading
 from datetime import datetime
 import difflib
+import json
 import os
+from .snapshot_writer import SnapshotWriter
+from .keyword_matcher import KeywordMatcher
 
-class ContextManager:
-    def __init__(self):
-        self.current_context = {
-            "time": datetime.now().isoformat(),
-            "active_app": None,
-            "previous_commands": [],
-            "conversation_topic": None,
-            "user_intent": None,
-            "system_state": {}
+
+def _intern(value):
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+class ContextRecord:
+    """Compact context state; topic/intent values are interned"""
+
+    __slots__ = ("time", "active_app", "previous_commands",
+                 "conversation_topic", "user_intent", "system_state")
+
+    def __init__(self, time=None, active_app=None, previous_commands=(),
+                 conversation_topic=None, user_intent=None, system_state=None):
+        self.time = time or datetime.now().isoformat()
+        self.active_app = active_app
+        self.previous_commands = tuple(previous_commands)
+        self.conversation_topic = _intern(conversation_topic)
+        self.user_intent = _intern(user_intent)
+        self.system_state = dict(system_state or {})
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(**{field: data[field] for field in cls.__slots__ if field in data})
+
+    def to_dict(self):
+        """Full, independent dict view of the record"""
+        return {
+            "time": self.time,
+            "active_app": self.active_app,
+            "previous_commands": list(self.previous_commands),
+            "conversation_topic": self.conversation_topic,
+            "user_intent": self.user_intent,
+            "system_state": dict(self.system_state)
         }
+
+    def copy(self):
+        return ContextRecord(self.time, self.active_app, self.previous_commands,
+                             self.conversation_topic, self.user_intent, self.system_state)
+
+    def delta_from(self, previous):
+        """Fields that differ from a previous record"""
+        if previous is None:
+            return self._fields()
+        return {field: value for field, value in self._fields().items()
+                if getattr(previous, field) != value}
+
+    def _fields(self):
+        fields = {field: getattr(self, field) for field in self.__slots__}
+        fields["system_state"] = dict(self.system_state)
+        return fields
+
+
+class ContextManager:
+    # Topic detection
+    TOPIC_KEYWORDS = {
+        "system": ["open", "close", "restart", "shutdown", "launch"],
+        "browser": ["search", "browse", "website", "internet", "google"],
+        "media": ["play", "pause", "volume", "music", "video"],
+        "file": ["create", "delete", "save", "document", "folder"],
+        "app": ["application", "program", "software", "install"],
+        "utility": ["calculator", "notepad", "paint", "terminal"]
+    }
+
+    # Intent detection
+    INTENT_KEYWORDS = {
+        "action": ["open", "close", "start", "stop", "create", "delete"],
+        "query": ["what", "how", "why", "when", "where", "who"],
+        "control": ["increase", "decrease", "adjust", "set", "change"],
+        "navigation": ["go to", "move to", "switch to", "back to"]
+    }
+
+    def __init__(self, context_file="data/context/context_state.json", snapshot_interval=5.0,
+                 matcher=None):
+        self.matcher = matcher or KeywordMatcher()
+        for topic, keywords in self.TOPIC_KEYWORDS.items():
+            self.matcher.add_many(keywords, "topic", topic)
+        for intent, keywords in self.INTENT_KEYWORDS.items():
+            self.matcher.add_many(keywords, "intent", intent)
+        self.current_context = ContextRecord()
+        # First entry is a full record, the rest store only changed fields
         self.context_history = []
+        self._last_snapshot = None
         self.max_history = 10
-        self.context_file = "data/context/context_state.json"
+        self.context_file = context_file
+        self._lock = threading.RLock()
+        self._writer = SnapshotWriter(self.context_file, self._snapshot, snapshot_interval)
         self._load_context()
 
     def update_context(self, command):
         """Update current context based on new command"""
-        self.current_context["time"] = datetime.now().isoformat()
-        self.current_context["previous_commands"].append(command)
-        
-        # Keep only recent commands
-        if len(self.current_context["previous_commands"]) > 5:
-            self.current_context["previous_commands"].pop(0)
-            
-        # Update topic and intent
-        self._analyze_command(command)
-        
-        # Add to history
-        self.context_history.append(self.current_context.copy())
+        with self._lock:
+            context = self.current_context
+            context.time = datetime.now().isoformat()
+
+            # Keep only recent commands
+            context.previous_commands = (context.previous_commands + (command,))[-5:]
+
+            # Update topic and intent
+            self._analyze_command(command)
+
+            # Add to history
+            self._append_history()
+
+        # Debounced auto-save
+        self._writer.mark_dirty()
+
+    def _append_history(self):
+        """Append a delta entry and fold the oldest entry on overflow"""
+        self.context_history.append(self.current_context.delta_from(self._last_snapshot))
+        self._last_snapshot = self.current_context.copy()
         if len(self.context_history) > self.max_history:
-            self.context_history.pop(0)
-        
-        # Auto-save context
-        self.save_context()
+            base = self.context_history.pop(0)
+            base.update(self.context_history[0])
+            self.context_history[0] = base
 
     def _analyze_command(self, command):
         """Analyze command for topic and intent"""
-        command = command.lower()
-        
-        # Topic detection
-        topics = {
-            "system": ["open", "close", "restart", "shutdown", "launch"],
-            "browser": ["search", "browse", "website", "internet", "google"],
-            "media": ["play", "pause", "volume", "music", "video"],
-            "file": ["create", "delete", "save", "document", "folder"],
-            "app": ["application", "program", "software", "install"],
-            "utility": ["calculator", "notepad", "paint", "terminal"]
-        }
-        
-        # Intent detection
-        intents = {
-            "action": ["open", "close", "start", "stop", "create", "delete"],
-            "query": ["what", "how", "why", "when", "where", "who"],
-            "control": ["increase", "decrease", "adjust", "set", "change"],
-            "navigation": ["go to", "move to", "switch to", "back to"]
-        }
-        
-        # Set topic
-        for topic, keywords in topics.items():
-            if any(keyword in command for keyword in keywords):
-                self.current_context["conversation_topic"] = topic
-                break
-                
-        # Set intent
-        for intent, keywords in intents.items():
-            if any(keyword in command for keyword in keywords):
-                self.current_context["user_intent"] = intent
-                break
+        result = self.matcher.match(command)
+
+        # Set topic and intent, keeping the previous ones if nothing matched
+        topic = result.first("topic")
+        if topic is not None:
+            self.current_context.conversation_topic = _intern(topic)
+
+        intent = result.first("intent")
+        if intent is not None:
+            self.current_context.user_intent = _intern(intent)
 
     def get_current_context(self):
         """Get current context state"""
-        return self.current_context
+        with self._lock:
+            return self.current_context.to_dict()
+
+    def get_history(self):
+        """Reconstruct full context dicts from the delta history"""
+        with self._lock:
+            history = []
+            state = {}
+            for delta in self.context_history:
+                state.update(delta)
+                history.append(ContextRecord.from_dict(state).to_dict())
+            return history
 
     def is_similar_context(self, cmd1, cmd2):
         """Check if two commands have similar context"""
@@ -82,17 +156,23 @@ class ContextManager:
         return ratio > 0.8
 
     def save_context(self):
-        """Save context to file"""
-        try:
-            os.makedirs(os.path.dirname(self.context_file), exist_ok=True)
-            with open(self.context_file, "w") as f:
-                json.dump({
-                    "current_context": self.current_context,
-                    "history": self.context_history,
-                    "last_updated": datetime.now().isoformat()
-                }, f, indent=2)
-        except Exception as e:
-            print(f"Error saving context: {e}")
+        """Write any pending context snapshot to file now"""
+        self._writer.flush()
+
+    def _snapshot(self):
+        with self._lock:
+            return {
+                "current_context": self.current_context.to_dict(),
+                "history": [self._encode_delta(delta) for delta in self.context_history],
+                "history_format": "delta",
+                "last_updated": datetime.now().isoformat()
+            }
+
+    def _encode_delta(self, delta):
+        encoded = dict(delta)
+        if "previous_commands" in encoded:
+            encoded["previous_commands"] = list(encoded["previous_commands"])
+        return encoded
 
     def _load_context(self):
         """Load context from file"""
@@ -100,25 +180,31 @@ class ContextManager:
             if os.path.exists(self.context_file):
                 with open(self.context_file, "r") as f:
                     data = json.load(f)
-                    self.current_context = data["current_context"]
-                    self.context_history = data["history"]
+                self.current_context = ContextRecord.from_dict(data["current_context"])
+                # Older files hold full dicts, which are valid deltas too
+                records = []
+                state = {}
+                for entry in data["history"]:
+                    state.update(entry)
+                    records.append(ContextRecord.from_dict(state))
+                self.context_history = []
+                self._last_snapshot = None
+                for record in records[-self.max_history:]:
+                    self.context_history.append(record.delta_from(self._last_snapshot))
+                    self._last_snapshot = record
         except Exception as e:
             print(f"Error loading context: {e}")
 
     def update_system_state(self, state_updates):
         """Update system state in context"""
-        self.current_context["system_state"].update(state_updates)
-        self.save_context()
+        with self._lock:
+            self.current_context.system_state.update(state_updates)
+        self._writer.mark_dirty()
 
     def clear_context(self):
         """Reset context to initial state"""
-        self.current_context = {
-            "time": datetime.now().isoformat(),
-            "active_app": None,
-            "previous_commands": [],
-            "conversation_topic": None,
-            "user_intent": None,
-            "system_state": {}
-        }
-        self.context_history = []
-        self.save_context()
\ No newline at end of file
+        with self._lock:
+            self.current_context = ContextRecord()
+            self.context_history = []
+            self._last_snapshot = None
+        self._writer.mark_dirty()
@@ -0,0 +1,226 @@
+import gzip
+import json
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from .snapshot_writer import atomic_write_json
+
+INDEX_VERSION = 1
+SKIP_DIRS = {"$recycle.bin", "system volume information", ".git", "node_modules", "__pycache__"}
+
+
+def _write_gzip_json(path, data):
+    """Atomically write gzip-compressed JSON to path"""
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-", suffix=".json.gz")
+    try:
+        with gzip.open(os.fdopen(fd, "wb"), "wt", compresslevel=6) as f:
+            json.dump(data, f, separators=(",", ":"))
+        os.replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+class FileIndex:
+    """Persistent index of the files under a set of root directories.
+
+    Every directory is stored with its mtime, the file names kept from it
+    and its subdirectories. A refresh stats each directory and only lists
+    the ones whose mtime changed (a directory's mtime changes when entries
+    are added, removed or renamed in it), with a pool of os.scandir
+    workers. The index is saved as JSON (gzip-compressed when index_path
+    ends in .gz), so a restart answers lookups straight away and refreshes
+    in the background. Directories named in skip_dirs or listed in exclude
+    are not walked. With file_times, each file's mtime as of the last
+    listing of its directory is kept as well.
+    """
+
+    def __init__(self, roots, index_path=None, extensions=None, workers=8, skip_dirs=SKIP_DIRS,
+                 exclude=(), file_times=False):
+        self.roots = [os.path.abspath(root) for root in roots if root]
+        self.index_path = index_path
+        self.extensions = tuple(e.lower() for e in extensions) if extensions else None
+        self.workers = workers
+        self.skip_dirs = {name.lower() for name in skip_dirs}
+        self.exclude = {os.path.normcase(os.path.abspath(path)) for path in exclude}
+        self.file_times = file_times
+        # directory -> [mtime, [file names], [subdirectory names]], plus
+        # [file mtimes] with file_times
+        self.dirs = {}
+        self.names = {}  # key(file name) -> [paths]
+        self.vocabulary = []  # sorted keys
+        self.loaded = threading.Event()  # saved index loaded (or found missing)
+        self.ready = threading.Event()   # first refresh finished
+        self.stats = {"dirs_scanned": 0, "dirs_reused": 0, "files": 0, "last_refresh_time": 0.0}
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def key(self, name):
+        """Lookup key of a file name"""
+        return name.lower()
+
+    def wanted(self, name):
+        return self.extensions is None or name.lower().endswith(self.extensions)
+
+    def load(self):
+        """Load the saved index; False when there is none or it does not match"""
+        if not self.index_path or not os.path.exists(self.index_path):
+            return False
+        opener = gzip.open if self.index_path.endswith(".gz") else open
+        try:
+            with opener(self.index_path, "rt") as f:
+                data = json.load(f)
+        except (OSError, ValueError, EOFError):
+            return False
+        if any(data.get(key) != value for key, value in self._header().items()):
+            return False
+        self._swap(data.get("dirs", {}))
+        return True
+
+    def save(self):
+        if not self.index_path:
+            return
+        with self._lock:
+            data = dict(self._header(), dirs=dict(self.dirs))
+        if self.index_path.endswith(".gz"):
+            _write_gzip_json(self.index_path, data)
+        else:
+            atomic_write_json(self.index_path, data)
+
+    def start(self):
+        """Load the saved index and refresh it, both on a background thread"""
+        if self._thread is not None and self._thread.is_alive():
+            return self
+        self._thread = threading.Thread(target=self._refresh_in_background,
+                                        name="file-index", daemon=True)
+        self._thread.start()
+        return self
+
+    def wait(self, timeout=None):
+        """Block until the first refresh has finished"""
+        return self.ready.wait(timeout)
+
+    def refresh(self):
+        """Bring the index up to date; returns True when anything changed"""
+        started = time.perf_counter()
+        with self._lock:
+            old = self.dirs
+        new = {}
+        scanned = reused = 0
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            pending = {pool.submit(self._scan, root, old.get(root)): root
+                       for root in dict.fromkeys(self.roots)}
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    path = pending.pop(future)
+                    entry, listed = future.result()
+                    if entry is None:
+                        continue
+                    new[path] = entry
+                    if listed:
+                        scanned += 1
+                    else:
+                        reused += 1
+                    for name in entry[2]:
+                        child = os.path.join(path, name)
+                        if child not in new and not self._skipped(child, name):
+                            pending[pool.submit(self._scan, child, old.get(child))] = child
+
+        changed = new != old
+        if changed:
+            self._swap(new)
+        self.stats.update(dirs_scanned=scanned, dirs_reused=reused,
+                          last_refresh_time=time.perf_counter() - started)
+        if changed:
+            self.save()
+        self.ready.set()
+        return changed
+
+    def lookup(self, name):
+        """Paths of the files whose key matches name"""
+        with self._lock:
+            return list(self.names.get(self.key(name), ()))
+
+    def __len__(self):
+        return self.stats["files"]
+
+    def _header(self):
+        """Settings the saved index was built with; it is rebuilt if they change"""
+        return {
+            "version": INDEX_VERSION,
+            "roots": self.roots,
+            "extensions": list(self.extensions) if self.extensions else None,
+            "exclude": sorted(self.exclude),
+            "file_times": self.file_times
+        }
+
+    def _skipped(self, path, name):
+        return name.lower() in self.skip_dirs or os.path.normcase(path) in self.exclude
+
+    def _refresh_in_background(self):
+        try:
+            self.load()
+            self.loaded.set()
+            self.refresh()
+        except Exception as e:
+            print(f"File index refresh error: {e}")
+        finally:
+            self.loaded.set()
+            self.ready.set()
+
+    def _scan(self, path, old):
+        """([mtime, files, subdirs], listed) for a directory; old is reused if unchanged"""
+        try:
+            mtime = os.stat(path).st_mtime
+        except OSError:
+            return None, False
+        if old is not None and old[0] == mtime:
+            return old, False
+        files, subdirs = [], []
+        try:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            subdirs.append(entry.name)
+                        elif self.wanted(entry.name):
+                            # DirEntry.stat() is free on Windows, one syscall elsewhere
+                            files.append((entry.name, entry.stat(follow_symlinks=False).st_mtime
+                                          if self.file_times else None))
+                    except OSError:
+                        continue
+        except OSError:
+            return None, False
+        files.sort()
+        entry = [mtime, [name for name, _ in files], sorted(subdirs)]
+        if self.file_times:
+            entry.append([file_mtime for _, file_mtime in files])
+        return entry, True
+
+    def _swap(self, dirs):
+        """Publish a new directory map with every lookup structure built from it"""
+        names = {}
+        count = 0
+        for directory in sorted(dirs):
+            for name in dirs[directory][1]:
+                names.setdefault(self.key(name), []).append(os.path.join(directory, name))
+                count += 1
+        derived = self._derive(dirs)
+        # One locked section, so a lookup never sees new names with old indexes
+        with self._lock:
+            self.dirs = dirs
+            self.names = names
+            self.vocabulary = sorted(names)
+            for attribute, value in derived.items():
+                setattr(self, attribute, value)
+        self.stats["files"] = count
+
+    def _derive(self, dirs):
+        """Extra {attribute: value} indexes, published together with the names"""
+        return {}
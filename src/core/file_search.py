@@ -0,0 +1,150 @@
+import bisect
+import heapq
+import os
+import re
+from difflib import SequenceMatcher, get_close_matches
+from .file_index import FileIndex
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+
+def normalize(name):
+    """Lowercase name with runs of whitespace collapsed"""
+    return " ".join(name.lower().split())
+
+
+def tokens(name):
+    return _TOKEN.findall(name.lower())
+
+
+class FileSearchIndex(FileIndex):
+    """File-name search over a FileIndex of every file under its roots.
+
+    Names are keyed in lowercase, with an inverted index from the tokens
+    of each name ("Q3 Report-final.pdf" -> q3, report, final, pdf) to the
+    names containing them. A query is answered from these indexes rather
+    than by scanning every path: exact name, then every query token
+    present, then name prefix, substring and fuzzy matches. Fuzzy matching
+    compares misspelled words only with tokens of similar length and the
+    same first letter. Results with the same score are ranked by recency
+    (file mtime).
+    """
+
+    SCORES = {"exact": 1.0, "stem": 0.95, "tokens": 0.85, "prefix": 0.8, "substring": 0.7}
+
+    def __init__(self, roots, index_path=None, workers=8, exclude=(), **kwargs):
+        super().__init__(roots, index_path, workers=workers, exclude=exclude, file_times=True,
+                         **kwargs)
+        self.token_index = {}  # token -> set of keys
+        self.token_vocabulary = []
+        self.token_buckets = {}  # (first letter, length) -> tokens
+        self.stems = {}        # name without extension -> set of keys
+        self.times = {}        # path -> mtime
+
+    def key(self, name):
+        return normalize(name)
+
+    def search(self, query, limit=10, fuzzy_cutoff=0.75):
+        """[(path, score)] for a file name query, best and most recent first"""
+        query = normalize(query)
+        if not query:
+            return []
+        with self._lock:
+            names, vocabulary = self.names, self.vocabulary
+            token_index, token_vocabulary = self.token_index, self.token_vocabulary
+            buckets, stems, times = self.token_buckets, self.stems, self.times
+
+        scores = {}
+
+        def add(keys, score):
+            for key in keys:
+                if scores.get(key, 0.0) < score:
+                    scores[key] = score
+
+        if query in names:
+            add([query], self.SCORES["exact"])
+        add(stems.get(query, ()), self.SCORES["stem"])
+
+        words = tokens(query)
+        if words and all(word in token_index for word in words):
+            add(set.intersection(*(token_index[word] for word in words)), self.SCORES["tokens"])
+
+        start = bisect.bisect_left(vocabulary, query)
+        for key in vocabulary[start:]:
+            if not key.startswith(query) or len(scores) >= 10 * limit:
+                break
+            add([key], self.SCORES["prefix"])
+
+        if len(scores) < limit:
+            add(self._substring(query, words, vocabulary, token_index, token_vocabulary),
+                self.SCORES["substring"])
+
+        if len(scores) < limit and words:
+            add(*self._fuzzy(words, token_index, buckets, fuzzy_cutoff))
+
+        ranked = heapq.nsmallest(limit, ((-score, -(times.get(path) or 0.0), path)
+                                         for key, score in scores.items()
+                                         for path in names[key]))
+        return [(path, round(-score, 3)) for score, _, path in ranked]
+
+    def find(self, name, min_score=0.95):
+        """Best match for a file name, or None.
+
+        By default only the exact name, or the name without its extension,
+        is accepted; use search() for partial and fuzzy matches.
+        """
+        results = self.search(name, limit=1)
+        if results and results[0][1] >= min_score:
+            return results[0][0]
+        return None
+
+    def _substring(self, query, words, vocabulary, token_index, token_vocabulary):
+        """Names containing query; narrowed through the tokens when possible"""
+        if len(words) == 1 and words[0] == query:
+            keys = set()
+            for token in token_vocabulary:
+                if query in token:
+                    keys.update(token_index[token])
+            if keys:
+                return keys
+        return [key for key in vocabulary if query in key]
+
+    def _fuzzy(self, words, token_index, buckets, cutoff):
+        """(keys, score) of names with every word or a close misspelling of it"""
+        keys, ratios = None, []
+        for word in words:
+            if word in token_index:
+                matches, ratio = token_index[word], 1.0
+            else:
+                similar = [token for length in range(len(word) - 2, len(word) + 3)
+                           for token in buckets.get((word[0], length), ())]
+                close = get_close_matches(word, similar, n=3, cutoff=cutoff)
+                if not close:
+                    return [], 0.0
+                matches = set().union(*(token_index[token] for token in close))
+                ratio = SequenceMatcher(None, word, close[0]).ratio()
+            keys = set(matches) if keys is None else keys & matches
+            ratios.append(ratio)
+        return keys, 0.6 * sum(ratios) / len(ratios)
+
+    def _derive(self, dirs):
+        token_index, stems, times = {}, {}, {}
+        for directory, entry in dirs.items():
+            file_times = entry[3] if len(entry) > 3 else [None] * len(entry[1])
+            for name, mtime in zip(entry[1], file_times):
+                key = self.key(name)
+                times[os.path.join(directory, name)] = mtime
+                stems.setdefault(os.path.splitext(key)[0], set()).add(key)
+                for token in tokens(name):
+                    token_index.setdefault(token, set()).add(key)
+        token_vocabulary = sorted(token_index)
+        buckets = {}
+        for token in token_vocabulary:
+            buckets.setdefault((token[0], len(token)), []).append(token)
+        return {
+            "token_index": token_index,
+            "token_vocabulary": token_vocabulary,
+            "token_buckets": buckets,
+            "stems": stems,
+            "times": times
+        }
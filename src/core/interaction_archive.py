@@ -0,0 +1,216 @@
+import gzip
+import json
+import lzma
+import os
+import time
+import uuid
+from collections import defaultdict
+from datetime import datetime, timedelta
+from .snapshot_writer import atomic_write_json
+from .storage import BUCKET_LENGTHS
+
+CODECS = {
+    "gzip": (gzip.open, ".jsonl.gz"),
+    "lzma": (lzma.open, ".jsonl.xz")
+}
+
+
+class InteractionArchive:
+    """Cold tier for interactions older than the raw retention window.
+
+    compact() moves old rows out of the store into compressed, append-only
+    segment files and merges their hourly/daily rollups into the store, so
+    analytics over long periods read rollups instead of raw records.
+
+    The id of the last archived row is kept in the store's meta table and
+    advanced in the same transaction as the delete. A manifest next to the
+    segments records each append before that transaction; on the next run,
+    rows it lists are not appended again, but only if it was written
+    against the same store (its epoch) and marker, so a recreated database
+    never has rows skipped.
+    """
+
+    def __init__(self, store, archive_dir, source="memory", codec="gzip",
+                 raw_retention_days=30, segment_max_bytes=4 * 1024 * 1024,
+                 segment_max_age_days=7, cold_retention_days=None, batch_size=1000):
+        if codec not in CODECS:
+            raise ValueError(f"Unknown archive codec: {codec}")
+        self.store = store
+        self.archive_dir = archive_dir
+        self.source = source
+        self.codec = codec
+        self.raw_retention_days = raw_retention_days
+        self.segment_max_bytes = segment_max_bytes
+        self.segment_max_age_days = segment_max_age_days
+        self.cold_retention_days = cold_retention_days
+        self.batch_size = batch_size
+
+    def compact(self, now=None):
+        """Archive raw rows past retention and prune expired segments"""
+        now = now or datetime.now()
+        cutoff = (now - timedelta(days=self.raw_retention_days)).isoformat()
+        archived = 0
+        marker = self._marker()
+        manifest = self._read_manifest()
+        appended = 0  # rows up to this id reached a segment but were not deleted
+        if (manifest.get("epoch") == marker["epoch"]
+                and manifest.get("after") == marker["last_id"]):
+            appended = manifest.get("last_id", 0)
+        while True:
+            batch = self.store.interactions_before(self.source, cutoff, self.batch_size)
+            if not batch:
+                break
+            records = [record for _, record in batch]
+            fresh = [record for row_id, record in batch if row_id > appended]
+            if fresh:
+                self._append_to_segment(fresh, now)
+                atomic_write_json(self._manifest_path(), {
+                    "epoch": marker["epoch"], "after": marker["last_id"],
+                    "last_id": batch[-1][0]
+                })
+            marker = dict(marker, last_id=batch[-1][0])
+            self.store.archive_interactions([row_id for row_id, _ in batch],
+                                            self._rollup_rows(records),
+                                            {self._marker_key(): marker})
+            archived += len(batch)
+        pruned = self.prune_segments(now)
+        return {"archived": archived, "pruned_segments": pruned}
+
+    def prune_segments(self, now=None):
+        """Delete segments last written before the cold retention window"""
+        if self.cold_retention_days is None:
+            return 0
+        now = now or datetime.now()
+        cutoff = (now - timedelta(days=self.cold_retention_days)).timestamp()
+        pruned = 0
+        for path in self.segments()[:-1]:
+            if os.path.getmtime(path) < cutoff:
+                os.remove(path)
+                pruned += 1
+        return pruned
+
+    def segments(self):
+        """Segment file paths, oldest first"""
+        if not os.path.isdir(self.archive_dir):
+            return []
+        prefix = f"{self.source}-"
+        suffixes = tuple(suffix for _, suffix in CODECS.values())
+        return sorted(os.path.join(self.archive_dir, name)
+                      for name in os.listdir(self.archive_dir)
+                      if name.startswith(prefix) and name.endswith(suffixes))
+
+    def last_archived_id(self):
+        """Id of the newest row moved out of the store, or 0"""
+        return self.store.get_meta(self._marker_key(), {}).get("last_id", 0)
+
+    def iter_archived(self, since=None, until=None):
+        """Stream archived interactions, optionally within a time range"""
+        for path in self.segments():
+            opener = CODECS["lzma"][0] if path.endswith(".xz") else CODECS["gzip"][0]
+            with opener(path, "rt", encoding="utf-8") as f:
+                for line in f:
+                    record = json.loads(line)
+                    timestamp = record.get("timestamp", "")
+                    if since is not None and timestamp < since:
+                        continue
+                    if until is not None and timestamp >= until:
+                        continue
+                    yield record
+
+    def command_totals(self, since=None, until=None):
+        """Per-command counts over rollups plus the raw rows still in the store"""
+        totals = defaultdict(lambda: {"success": 0, "total": 0})
+        for stats in (self.store.rollup_stats(self.source, "day", since, until),
+                      self.store.command_stats(self.source, since=since, until=until)):
+            for command, counts in stats.items():
+                totals[command]["success"] += counts["success"]
+                totals[command]["total"] += counts["total"]
+        return dict(totals)
+
+    def series(self, granularity="day", command=None):
+        """Archived totals and success rates per hour or day"""
+        series = self.store.rollup_series(self.source, granularity, command)
+        for point in series:
+            point["success_rate"] = point["success"] / point["total"] if point["total"] else 0
+        return series
+
+    def _rollup_rows(self, records):
+        counts = defaultdict(lambda: [0, 0])
+        for record in records:
+            command = record["command"].lower()
+            for granularity, length in BUCKET_LENGTHS.items():
+                key = (granularity, record["timestamp"][:length], command)
+                counts[key][0] += 1
+                counts[key][1] += 1 if record["success"] else 0
+        return [(self.source, granularity, bucket, command, total, success)
+                for (granularity, bucket, command), (total, success) in counts.items()]
+
+    def _marker_key(self):
+        return f"archive:{self.source}"
+
+    def _marker(self):
+        """The store's archive marker; created, with a new epoch, on first use"""
+        marker = self.store.get_meta(self._marker_key())
+        if marker is None:
+            marker = {"epoch": uuid.uuid4().hex, "last_id": 0}
+            self.store.set_meta(self._marker_key(), marker)
+            self.store.flush()
+        return marker
+
+    def _manifest_path(self):
+        return os.path.join(self.archive_dir, f"{self.source}.manifest.json")
+
+    def _read_manifest(self):
+        try:
+            with open(self._manifest_path(), encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _append_to_segment(self, records, now):
+        opener, _ = CODECS[self.codec]
+        path = self._current_segment(now)
+        with opener(path, "at", encoding="utf-8") as f:
+            for record in records:
+                f.write(json.dumps(record, separators=(",", ":")) + "\n")
+
+    def _current_segment(self, now):
+        """Latest segment, or a new one if it is too large or too old"""
+        _, suffix = CODECS[self.codec]
+        segments = [path for path in self.segments() if path.endswith(suffix)]
+        if segments:
+            latest = segments[-1]
+            started = os.path.basename(latest)[len(self.source) + 1:-len(suffix)]
+            age = now - datetime.strptime(started, "%Y%m%dT%H%M%S")
+            if (os.path.getsize(latest) < self.segment_max_bytes
+                    and age < timedelta(days=self.segment_max_age_days)):
+                return latest
+        os.makedirs(self.archive_dir, exist_ok=True)
+        name = f"{self.source}-{now.strftime('%Y%m%dT%H%M%S')}{suffix}"
+        path = os.path.join(self.archive_dir, name)
+        # Keep names unique if several segments roll over within one second
+        while os.path.exists(path):
+            now += timedelta(seconds=1)
+            name = f"{self.source}-{now.strftime('%Y%m%dT%H%M%S')}{suffix}"
+            path = os.path.join(self.archive_dir, name)
+        return path
+
+
+if __name__ == "__main__":
+    import argparse
+    from .storage import get_store
+
+    parser = argparse.ArgumentParser(description="Compact archived interactions")
+    parser.add_argument("--db", default="data/assistant.db")
+    parser.add_argument("--archive-dir", default="data/memory/archive")
+    parser.add_argument("--retention-days", type=int, default=30)
+    parser.add_argument("--codec", choices=sorted(CODECS), default="gzip")
+    args = parser.parse_args()
+
+    started = time.time()
+    archive = InteractionArchive(get_store(args.db), args.archive_dir,
+                                 codec=args.codec, raw_retention_days=args.retention_days)
+    result = archive.compact()
+    archive.store.close()
+    print(f"Archived {result['archived']} interactions, pruned "
+          f"{result['pruned_segments']} segments in {time.time() - started:.2f}s")
@@ -0,0 +1,168 @@
+import itertools
+import threading
+from collections import deque
+
+
+class Match:
+    __slots__ = ("start", "end", "pattern", "kind", "value", "priority")
+
+    def __init__(self, start, end, pattern, kind, value, priority):
+        self.start = start
+        self.end = end
+        self.pattern = pattern
+        self.kind = kind
+        self.value = value
+        self.priority = priority
+
+    def __repr__(self):
+        return f"Match({self.pattern!r}, {self.kind}={self.value!r})"
+
+
+class MatchResult:
+    """All keyword matches found in one utterance"""
+
+    def __init__(self, text, matches):
+        self.text = text
+        self.matches = matches
+
+    def first(self, kind):
+        """Highest-priority value of a kind (earliest registered wins)"""
+        best = None
+        for match in self.matches:
+            if match.kind == kind and (best is None or match.priority < best.priority):
+                best = match
+        return best.value if best else None
+
+    def values(self, kind):
+        return {match.value for match in self.matches if match.kind == kind}
+
+    def patterns(self, kind, value):
+        return [m.pattern for m in self.matches if m.kind == kind and m.value == value]
+
+
+class KeywordMatcher:
+    """Word-boundary aware Aho-Corasick automaton over tagged keywords.
+
+    Each keyword carries a (kind, value) tag, e.g. ("topic", "media") or
+    ("skill", "media_control"), so one pass over an utterance answers
+    routing, topic and intent. Keywords can be added at any time; new trie
+    nodes only trigger a rebuild of the failure links on the next search.
+    """
+
+    def __init__(self):
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [[]]
+        self._terminal = [[]]     # patterns ending exactly at each node
+        self._patterns = []       # pattern id -> pattern text
+        self._pattern_ids = {}    # pattern text -> id
+        self._tags = []           # pattern id -> list of (kind, value)
+        self._priority = {}       # (kind, value) -> registration order
+        self._order = itertools.count()  # never reused, even after discard()
+        self._dirty = False
+        self._version = 0
+        self._last = None
+        self._lock = threading.Lock()
+
+    def add(self, pattern, kind, value):
+        """Register a keyword for a (kind, value) tag"""
+        pattern = pattern.lower().strip()
+        if not pattern:
+            return
+        with self._lock:
+            tag = (kind, value)
+            if tag not in self._priority:
+                self._priority[tag] = next(self._order)
+            pattern_id = self._pattern_ids.get(pattern)
+            if pattern_id is None:
+                pattern_id = self._insert(pattern)
+            if tag not in self._tags[pattern_id]:
+                self._tags[pattern_id].append(tag)
+            self._version += 1
+
+    def add_many(self, patterns, kind, value):
+        for pattern in patterns:
+            self.add(pattern, kind, value)
+
+    def discard(self, kind, value):
+        """Forget every keyword registered for a tag"""
+        with self._lock:
+            tag = (kind, value)
+            for tags in self._tags:
+                if tag in tags:
+                    tags.remove(tag)
+            self._priority.pop(tag, None)
+            self._version += 1
+
+    def match(self, text):
+        """Find all tagged keywords in text in a single pass"""
+        with self._lock:
+            key = (text, self._version)
+            if self._last is not None and self._last[0] == key:
+                return self._last[1]
+            if self._dirty:
+                self._build_failure_links()
+
+            lowered = text.lower()
+            matches = []
+            state = 0
+            for i, char in enumerate(lowered):
+                while state and char not in self._goto[state]:
+                    state = self._fail[state]
+                state = self._goto[state].get(char, 0)
+                for pattern_id in self._out[state]:
+                    pattern = self._patterns[pattern_id]
+                    start = i - len(pattern) + 1
+                    if not self._on_word_boundary(lowered, start, i + 1):
+                        continue
+                    for kind, value in self._tags[pattern_id]:
+                        matches.append(Match(start, i + 1, pattern, kind, value,
+                                             self._priority[(kind, value)]))
+
+            result = MatchResult(text, matches)
+            self._last = (key, result)
+            return result
+
+    def _insert(self, pattern):
+        state = 0
+        for char in pattern:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+                self._terminal.append([])
+                self._goto[state][char] = next_state
+                self._dirty = True
+            state = next_state
+        pattern_id = len(self._patterns)
+        self._patterns.append(pattern)
+        self._pattern_ids[pattern] = pattern_id
+        self._tags.append([])
+        self._terminal[state].append(pattern_id)
+        self._dirty = True
+        return pattern_id
+
+    def _build_failure_links(self):
+        """Breadth-first pass computing failure links and merged outputs"""
+        own = self._terminal
+        self._fail = [0] * len(self._goto)
+        self._out = [list(out) for out in own]
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                candidate = self._goto[fail].get(char, 0)
+                self._fail[next_state] = candidate if candidate != next_state else 0
+                self._out[next_state] = own[next_state] + self._out[self._fail[next_state]]
+                queue.append(next_state)
+        self._dirty = False
+
+    def _on_word_boundary(self, text, start, end):
+        before = text[start - 1] if start > 0 else " "
+        after = text[end] if end < len(text) else " "
+        return not before.isalnum() and not after.isalnum()
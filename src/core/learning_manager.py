@@ -1,54 +1,37 @@
-import json
 from datetime import datetime
-import os
+from .storage import get_store
+from .pattern_stats import PatternStats
 
 class LearningManager:
-    def __init__(self, storage_path="data/learning"):
+    def __init__(self, storage_path="data/learning", store=None, top_k=50):
         self.storage_path = storage_path
-        self.interaction_history = []
-        self.load_history()
-        
-    def load_history(self):
-        """Load previous interaction history"""
-        try:
-            if not os.path.exists(self.storage_path):
-                os.makedirs(self.storage_path)
-                
-            history_file = os.path.join(self.storage_path, "interaction_history.json")
-            if os.path.exists(history_file):
-                with open(history_file, 'r') as f:
-                    self.interaction_history = json.load(f)
-        except Exception as e:
-            print(f"Error loading history: {e}")
+        self.store = store or get_store()
+        self.source = "learning"
+        self.stats = PatternStats(top_k=top_k)
+        for command, counts in self.store.command_stats(self.source).items():
+            self.stats.add_counts(command, counts["total"], counts["success"])
+    
+    def get_history(self, command=None, since=None, limit=None):
+        """Query previous interactions by command and/or timestamp"""
+        return self.store.find_interactions(self.source, command=command,
+                                            since=since, limit=limit)
     
     def save_interaction(self, command, response, success):
         """Save new interaction"""
-        interaction = {
-            'timestamp': datetime.now().isoformat(),
-            'command': command,
-            'response': response,
-            'success': success
-        }
-        self.interaction_history.append(interaction)
-        
         try:
-            with open(os.path.join(self.storage_path, "interaction_history.json"), 'w') as f:
-                json.dump(self.interaction_history, f, indent=2)
+            self.store.add_interaction(
+                self.source,
+                command,
+                response,
+                success,
+                timestamp=datetime.now().isoformat()
+            )
+            self.stats.record(command, success)
         except Exception as e:
             print(f"Error saving interaction: {e}")
     
     def analyze_patterns(self):
         """Analyze interaction patterns for learning"""
-        patterns = {}
-        for interaction in self.interaction_history:
-            command = interaction['command'].lower()
-            success = interaction['success']
-            
-            if command not in patterns:
-                patterns[command] = {'success': 0, 'total': 0}
-            
-            patterns[command]['total'] += 1
-            if success:
-                patterns[command]['success'] += 1
-        
-        return patterns
\ No newline at end of file
+        return {command: {"success": round(self.stats.success_rate(command) * count),
+                          "total": count}
+                for command, count in self.stats.common.top(self.stats.common.k)}
@@ -1,59 +1,247 @@
-from llama_cpp import Llama
 import json
+import os
+import threading
+import time
+from .sentence_stream import segment_stream
+from .prefix_cache import PrefixStateCache
+from .llm_backends import LLMBackend, LlamaCppBackend, create_backend
 
 class LLMProcessor:
-    def __init__(self, model_path):
+    WARMING_UP = "I'm still warming up. Please ask me again in a moment."
+    LOAD_FAILED = "My language model failed to load, so I can only handle simple commands."
+    WARMUP_QUERY = "Hello"
+
+    def __init__(self, model_path, model=None, system_prompt="", state_dir=None,
+                 include_conversation=False, backend="llama_cpp", backend_options=None,
+                 background=False, warmup=False, ready_timeout=None):
+        self.model_path = model_path
+        self.system_prompt = system_prompt
+        self.state_dir = state_dir
+        self.include_conversation = include_conversation
+        # Seconds a model-bound query waits for a background load before it
+        # is answered with WARMING_UP; None waits until the model is ready
+        self.ready_timeout = ready_timeout
+        self.backend = None
+        self.prefix_cache = None
+        self.ready = threading.Event()  # load finished, successfully or not
+        # The model runs one generation at a time, whichever thread asks
+        self._model_lock = threading.Lock()
+        self.load_error = None
+        self.timings = {"load_time": None, "warmup_time": None,
+                        "first_token_latency": None, "last_first_token_latency": None}
+        # Pre-cache common responses
+        self.quick_responses = {
+            "hello": {"type": "conversation", "response": "Hello! How can I help?"},
+            "hi": {"type": "conversation", "response": "Hi there!"},
+            "bye": {"type": "conversation", "response": "Goodbye!"},
+        }
+
+        if background:
+            # Fast paths answer straight away while the weights load
+            threading.Thread(target=self._load_in_background,
+                             args=(model, backend, backend_options, warmup),
+                             name="llm-load", daemon=True).start()
+            return
         try:
-            # Optimize model settings for faster inference
-            self.model = Llama(
-                model_path=model_path,
-                n_ctx=512,          # Reduced context window
-                n_threads=4,        # Optimal thread count
-                n_batch=8,          # Smaller batch size
-                n_gpu_layers=1,     # Enable minimal GPU acceleration
-                seed=42,
-                verbose=False
-            )
-            # Pre-cache common responses
-            self.quick_responses = {
-                "hello": {"type": "conversation", "response": "Hello! How can I help?"},
-                "hi": {"type": "conversation", "response": "Hi there!"},
-                "bye": {"type": "conversation", "response": "Goodbye!"},
-            }
+            self._load(model, backend, backend_options, warmup)
         except Exception as e:
             raise Exception(f"Model initialization failed: {str(e)}")
 
-    def process_query(self, query):
+    def _load(self, model, backend, backend_options, warmup):
+        started = time.perf_counter()
+        if model is not None:
+            backend = LlamaCppBackend(model=model)
+        elif not isinstance(backend, LLMBackend):
+            options = dict(backend_options or {})
+            if backend == "llama_cpp":
+                options.setdefault("model_path", self.model_path)
+            backend = create_backend(backend, **options)
+        self.backend = backend
+
+        state_model = self.backend.model
+        if self.system_prompt and hasattr(state_model, "save_state"):
+            model_id = os.path.splitext(os.path.basename(self.model_path or "model"))[0]
+            self.prefix_cache = PrefixStateCache(state_model, model_id, self.state_dir)
+            # Evaluate (or restore) the system prompt once at startup
+            self.prefix_cache.prepare(self.system_prompt)
+        self.timings["load_time"] = time.perf_counter() - started
+        if warmup:
+            self.warm_up()
+        self.ready.set()
+
+    def _load_in_background(self, model, backend, backend_options, warmup):
+        try:
+            self._load(model, backend, backend_options, warmup)
+            print(f"Model ready: {self._describe_timings()}")
+        except Exception as e:
+            self.load_error = e
+            print(f"Model initialization failed: {e}")
+        finally:
+            self.ready.set()
+
+    def warm_up(self):
+        """Generate one token so the weights are paged in before the first query"""
+        started = time.perf_counter()
+        try:
+            for _ in self.stream_tokens(self.WARMUP_QUERY, max_tokens=1):
+                break
+        except Exception as e:
+            print(f"Model warm-up error: {e}")
+        self.timings["warmup_time"] = time.perf_counter() - started
+
+    def wait_ready(self, timeout=None):
+        """True once the model is loaded; waits up to timeout seconds for it"""
+        self.ready.wait(timeout)
+        return self.ready.is_set() and self.load_error is None
+
+    def load_stats(self):
+        """Model load, warm-up and first-token timings in seconds"""
+        return dict(self.timings, ready=self.wait_ready(0))
+
+    def _unavailable(self):
+        """Reply for a model-bound query when the model cannot take it, else None"""
+        if self.wait_ready(self.ready_timeout):
+            return None
+        return self.LOAD_FAILED if self.ready.is_set() else self.WARMING_UP
+
+    def _describe_timings(self):
+        parts = [f"loaded in {self.timings['load_time']:.2f}s"]
+        if self.timings["warmup_time"] is not None:
+            parts.append(f"warm-up {self.timings['warmup_time']:.2f}s")
+        if self.timings["first_token_latency"] is not None:
+            parts.append(f"first token {self.timings['first_token_latency']:.2f}s")
+        return ", ".join(parts)
+
+    def match_fast_path(self, query):
+        """Answer quick responses and pattern-matched commands without the model"""
         # Quick response for common phrases
         lower_query = query.lower()
         if lower_query in self.quick_responses:
-            return json.dumps(self.quick_responses[lower_query])
+            return self.quick_responses[lower_query]
 
         # Pattern matching for common commands
         if "open" in lower_query:
             app = lower_query.replace("open", "").strip()
-            return json.dumps({
+            return {
                 "type": "command",
                 "action": "open",
                 "parameters": {"name": app}
-            })
+            }
+        return None
+
+    def build_prompt(self, query, conversation=None):
+        """System prefix, optional recent turns, then the new query"""
+        if not self.system_prompt:
+            return query
+        lines = [self.system_prompt]
+        if self.include_conversation and conversation:
+            lines.extend(f"User: {turn['command']}\n" for turn in conversation)
+        lines.append(f"User: {query}\nAssistant:")
+        return "".join(lines)
+
+    def prefix_stats(self):
+        """Prompt-prefix state reuse statistics"""
+        return self.prefix_cache.get_stats() if self.prefix_cache else {}
+
+    def _prepare_prefix(self):
+        if self.prefix_cache is None:
+            return
+        try:
+            self.prefix_cache.prepare(self.system_prompt)
+        except Exception as e:
+            print(f"Prompt state error: {e}")
+
+    def process_query(self, query, conversation=None):
+        fast_response = self.match_fast_path(query)
+        if fast_response is not None:
+            return json.dumps(fast_response)
 
         # Use LLM only for complex queries
+        unavailable = self._unavailable()
+        if unavailable is not None:
+            return json.dumps({"type": "conversation", "response": unavailable})
         try:
-            response = self.model(
-                query,
-                max_tokens=64,      # Reduced token limit
-                temperature=0.7,
-                stop=["User:", "\n"],
-                echo=False
-            )
+            with self._model_lock:
+                self._prepare_prefix()
+                text = self.backend.generate(
+                    self.build_prompt(query, conversation),
+                    max_tokens=64,      # Reduced token limit
+                    temperature=0.7,
+                    stop=["User:", "\n"]
+                )
             return json.dumps({
                 "type": "conversation",
-                "response": response['choices'][0]['text'].strip()
+                "response": text.strip()
             })
         except Exception as e:
             print(f"LLM Error: {e}")
             return json.dumps({
                 "type": "conversation",
                 "response": "I encountered an error. Please try again."
-            })
\ No newline at end of file
+            })
+
+    def process_batch(self, queries):
+        """Answer many queries through one backend, e.g. for offline evaluation"""
+        responses = [None] * len(queries)
+        pending = []
+        for i, query in enumerate(queries):
+            fast_response = self.match_fast_path(query)
+            if fast_response is not None:
+                responses[i] = json.dumps(fast_response)
+            else:
+                pending.append(i)
+
+        unavailable = self._unavailable() if pending else None
+        if unavailable is not None:
+            for i in pending:
+                responses[i] = json.dumps({"type": "conversation", "response": unavailable})
+        elif pending:
+            try:
+                with self._model_lock:
+                    self._prepare_prefix()
+                    texts = self.backend.generate_batch(
+                        [self.build_prompt(queries[i]) for i in pending],
+                        max_tokens=64,
+                        temperature=0.7,
+                        stop=["User:", "\n"]
+                    )
+            except Exception as e:
+                print(f"LLM Error: {e}")
+                texts = ["I encountered an error. Please try again."] * len(pending)
+            for i, text in zip(pending, texts):
+                responses[i] = json.dumps({"type": "conversation", "response": text.strip()})
+        return responses
+
+    def stream_tokens(self, query, conversation=None, max_tokens=64):
+        """Yield completion text as the model generates it"""
+        with self._model_lock:
+            self._prepare_prefix()
+            started = time.perf_counter()
+            first = True
+            for text in self.backend.generate_stream(
+                self.build_prompt(query, conversation),
+                max_tokens=max_tokens,
+                temperature=0.7,
+                stop=["User:", "\n"]
+            ):
+                # Queries only; the warm-up runs before the model is marked ready
+                if first and self.ready.is_set():
+                    latency = time.perf_counter() - started
+                    if self.timings["first_token_latency"] is None:
+                        self.timings["first_token_latency"] = latency
+                    self.timings["last_first_token_latency"] = latency
+                first = False
+                yield text
+
+    def stream_query(self, query, conversation=None):
+        """Yield the model's answer sentence by sentence while it generates"""
+        unavailable = self._unavailable()
+        if unavailable is not None:
+            yield unavailable
+            return
+        try:
+            for segment in segment_stream(self.stream_tokens(query, conversation)):
+                yield segment
+        except Exception as e:
+            print(f"LLM Error: {e}")
+            yield "I encountered an error. Please try again."
@@ -1,87 +1,135 @@
-import json
 import os
-from datetime import datetime
-from collections import defaultdict
+import threading
+from collections import deque
+from .storage import get_store
+from .interaction_archive import InteractionArchive
+from .pattern_stats import PatternStats
 
 class MemoryManager:
-    def __init__(self, storage_path):
+    def __init__(self, storage_path, store=None, recent_limit=100, retention=None, top_k=50,
+                 compact_interval=None):
         self.storage_path = storage_path
-        self.interactions = []
-        self.patterns = defaultdict(int)
-        self.successful_patterns = defaultdict(int)
+        self.store = store or get_store()
+        self.source = "memory"
+        self.interactions = deque(maxlen=recent_limit)
+        self.stats = PatternStats(top_k=top_k, window=recent_limit)
+        self.archive = InteractionArchive(
+            self.store,
+            os.path.join(storage_path, "archive"),
+            source=self.source,
+            **(retention or {})
+        )
         self.load_state()
+        # Retention is applied at startup and then every compact_interval seconds
+        self._stop_compaction = threading.Event()
+        self._compactor = None
+        if compact_interval:
+            self._compactor = threading.Thread(target=self._compact_periodically,
+                                               args=(compact_interval,),
+                                               name="memory-compact", daemon=True)
+            self._compactor.start()
 
     def store_interaction(self, interaction_data):
         """Store new interaction"""
         self.interactions.append(interaction_data)
+        self.store.add_interaction(
+            self.source,
+            interaction_data["command"],
+            interaction_data.get("response"),
+            interaction_data["success"],
+            timestamp=interaction_data.get("timestamp"),
+            context=interaction_data.get("context")
+        )
         
         # Update pattern recognition
-        command = interaction_data["command"].lower()
-        success = interaction_data["success"]
-        
-        self.patterns[command] += 1
-        if success:
-            self.successful_patterns[command] += 1
-        
-        # Auto-save after significant changes
-        if len(self.interactions) % 10 == 0:
-            self.save_state()
+        self.stats.record(interaction_data["command"], interaction_data["success"])
 
     def get_success_rate(self, command):
         """Get success rate for a command pattern"""
-        command = command.lower()
-        if command in self.patterns:
-            total = self.patterns[command]
-            successful = self.successful_patterns[command]
-            return successful / total
-        return 0
+        return self.stats.success_rate(command)
 
-    def get_similar_interactions(self, command, threshold=0.8):
+    def get_similar_interactions(self, command, threshold=0.8, include_archived=False):
         """Find similar successful interactions"""
         from difflib import SequenceMatcher
         
+        candidates = self.store.iter_interactions(self.source, success=True)
+        if include_archived:
+            archived = (i for i in self.archive.iter_archived() if i["success"])
+            candidates = (i for source in (archived, candidates) for i in source)
+
         similar = []
-        for interaction in self.interactions:
+        for interaction in candidates:
             similarity = SequenceMatcher(None, 
                                        command.lower(), 
                                        interaction["command"].lower()).ratio()
-            if similarity >= threshold and interaction["success"]:
+            if similarity >= threshold:
                 similar.append(interaction)
         return similar
 
-    def analyze_patterns(self):
+    def analyze_patterns(self, since=None, until=None):
         """Analyze interaction patterns"""
+        if since is None and until is None:
+            return {
+                "total_interactions": self.stats.total,
+                "success_rate": self.stats.success_rate(),
+                "recent_success_rate": self.stats.recent_success_rate,
+                "common_patterns": self.stats.top(10),
+                "successful_patterns": self.stats.top_successful(10)
+            }
+
+        # Time-bounded queries go to rollups and raw rows
+        totals = self.archive.command_totals(since, until)
+        total = sum(counts["total"] for counts in totals.values())
+        successful = sum(counts["success"] for counts in totals.values())
+        patterns = {c: counts["total"] for c, counts in totals.items()}
+        successful_patterns = {c: counts["success"] for c, counts in totals.items()
+                               if counts["success"]}
         analysis = {
-            "total_interactions": len(self.interactions),
-            "success_rate": sum(1 for i in self.interactions if i["success"]) / len(self.interactions),
-            "common_patterns": dict(sorted(self.patterns.items(), key=lambda x: x[1], reverse=True)[:10]),
-            "successful_patterns": dict(sorted(self.successful_patterns.items(), key=lambda x: x[1], reverse=True)[:10])
+            "total_interactions": total,
+            "success_rate": successful / total if total else 0,
+            "common_patterns": dict(sorted(patterns.items(), key=lambda x: x[1], reverse=True)[:10]),
+            "successful_patterns": dict(sorted(successful_patterns.items(), key=lambda x: x[1], reverse=True)[:10])
         }
         return analysis
 
+    def get_usage_series(self, granularity="day", command=None):
+        """Archived counts and success rates per hour or day"""
+        return self.archive.series(granularity, command)
+
+    def compact(self):
+        """Move interactions past the retention window to cold storage"""
+        return self.archive.compact()
+
+    def stop_compaction(self, timeout=5.0):
+        """Stop the background compaction, waiting for a run in progress"""
+        self._stop_compaction.set()
+        if self._compactor is not None:
+            self._compactor.join(timeout)
+
+    def _compact_periodically(self, interval):
+        while not self._stop_compaction.is_set():
+            try:
+                result = self.compact()
+                if result["archived"] or result["pruned_segments"]:
+                    print(f"Archived {result['archived']} interactions, pruned "
+                          f"{result['pruned_segments']} segments")
+            except Exception as e:
+                print(f"Memory compaction error: {e}")
+            self._stop_compaction.wait(interval)
+
     def save_state(self):
-        """Save current state to storage"""
-        os.makedirs(self.storage_path, exist_ok=True)
-        
-        state = {
-            "interactions": self.interactions,
-            "patterns": dict(self.patterns),
-            "successful_patterns": dict(self.successful_patterns),
-            "last_updated": datetime.now().isoformat()
-        }
-        
-        with open(os.path.join(self.storage_path, "memory_state.json"), "w") as f:
-            json.dump(state, f, indent=2)
+        """Commit pending interactions to storage"""
+        self.store.flush()
 
     def load_state(self):
-        """Load state from storage"""
+        """Load pattern counts and recent interactions from storage"""
         try:
-            path = os.path.join(self.storage_path, "memory_state.json")
-            if os.path.exists(path):
-                with open(path, "r") as f:
-                    state = json.load(f)
-                    self.interactions = state["interactions"]
-                    self.patterns = defaultdict(int, state["patterns"])
-                    self.successful_patterns = defaultdict(int, state["successful_patterns"])
+            for command, counts in self.archive.command_totals().items():
+                self.stats.add_counts(command, counts["total"], counts["success"])
+            self.interactions.extend(
+                self.store.recent_interactions(self.source, self.interactions.maxlen)
+            )
+            for interaction in self.interactions:
+                self.stats.window.add(interaction["success"])
         except Exception as e:
-            print(f"Error loading memory state: {e}")
\ No newline at end of file
+            print(f"Error loading memory state: {e}")
@@ -0,0 +1,150 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+import numpy as np
+from .tile_ocr import parse_ocr_data
+
+
+def tesseract_data(image):
+    """pytesseract.image_to_data as a picklable, module-level function"""
+    import pytesseract
+
+    return pytesseract.image_to_data(image, output_type=pytesseract.Output.DICT)
+
+
+class SharedFrame:
+    """A frame copied once into shared memory for worker processes.
+
+    Workers attach by name and slice their region as a view, so only the
+    (name, shape, dtype) triple is pickled per task.
+    """
+
+    def __init__(self, image):
+        image = np.asarray(image)
+        self.shm = shared_memory.SharedMemory(create=True, size=max(image.nbytes, 1))
+        self.array = np.ndarray(image.shape, dtype=image.dtype, buffer=self.shm.buf)
+        self.array[...] = image
+        self.info = (self.shm.name, image.shape, image.dtype.str)
+
+    def close(self):
+        self.array = None
+        self.shm.close()
+        self.shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _init_worker(tesseract_cmd):
+    if tesseract_cmd:
+        import pytesseract
+
+        pytesseract.pytesseract.tesseract_cmd = tesseract_cmd
+
+
+def _ocr_shared_region(frame_info, box, ocr_fn):
+    """Worker task: OCR one (x, y, w, h) box of a shared frame"""
+    name, shape, dtype = frame_info
+    # Pool workers share the parent's resource tracker, so attaching here
+    # does not make the segment outlive (or get unlinked before) the parent
+    shm = shared_memory.SharedMemory(name=name)
+    try:
+        frame = np.ndarray(shape, dtype=np.dtype(dtype), buffer=shm.buf)
+        x, y, w, h = box
+        region = frame[y:y + h, x:x + w]
+        try:
+            return ocr_fn(region)
+        finally:
+            del region, frame
+    finally:
+        shm.close()
+
+
+def split_bands(height, bands, overlap):
+    """Horizontal bands as (core_top, core_bottom, top, bottom).
+
+    Each band is read from top to bottom, which extends `overlap` pixels
+    past the core it owns so text lines on a seam are read whole.
+    """
+    bands = max(1, min(bands, height))
+    step = -(-height // bands)
+    result = []
+    for core_top in range(0, height, step):
+        core_bottom = min(core_top + step, height)
+        result.append((core_top, core_bottom,
+                       max(0, core_top - overlap), min(height, core_bottom + overlap)))
+    return result
+
+
+class OCRPool:
+    """OCR service that spreads a frame over a pool of worker processes.
+
+    recognize() cuts the frame into overlapping horizontal bands; a word
+    is kept by the band whose core contains its centre, which removes the
+    duplicates the overlap creates at seams. ocr_regions() reads arbitrary
+    boxes (e.g. the dirty tiles of TileOCR) in parallel. Small jobs and
+    single-worker pools run inline to skip the IPC overhead.
+    """
+
+    def __init__(self, ocr_fn=tesseract_data, workers=None, overlap=48,
+                 min_parallel_pixels=250000, tesseract_cmd=None):
+        self.ocr_fn = ocr_fn
+        self.workers = workers or os.cpu_count() or 1
+        self.overlap = overlap
+        self.min_parallel_pixels = min_parallel_pixels
+        self.tesseract_cmd = tesseract_cmd
+        self._executor = None
+
+    @property
+    def parallel(self):
+        return self.workers > 1
+
+    def start(self):
+        """Spawn the workers now instead of on the first large frame"""
+        if self._executor is None and self.parallel:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=_init_worker,
+                initargs=(self.tesseract_cmd,)
+            )
+        return self
+
+    def ocr_regions(self, image, boxes):
+        """OCR output (relative to each box) for every (x, y, w, h) box"""
+        boxes = list(boxes)
+        pixels = sum(w * h for _, _, w, h in boxes)
+        if not self.parallel or len(boxes) < 2 or pixels < self.min_parallel_pixels:
+            return [self.ocr_fn(image[y:y + h, x:x + w]) for x, y, w, h in boxes]
+
+        self.start()
+        with SharedFrame(image) as frame:
+            futures = [self._executor.submit(_ocr_shared_region, frame.info, box, self.ocr_fn)
+                       for box in boxes]
+            return [future.result() for future in futures]
+
+    def recognize(self, image, bands=None):
+        """Words on the whole frame, in parse_ocr_data format"""
+        height, width = image.shape[:2]
+        layout = split_bands(height, bands or self.workers, self.overlap)
+        results = self.ocr_regions(image, [(0, top, width, bottom - top)
+                                           for _, _, top, bottom in layout])
+        words = []
+        for (core_top, core_bottom, top, _), data in zip(layout, results):
+            for word in parse_ocr_data(data, offset=(0, top)):
+                if core_top <= word['position'][1] < core_bottom:
+                    words.append(word)
+        return sorted(words, key=lambda w: (w['bounds'][1], w['bounds'][0]))
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
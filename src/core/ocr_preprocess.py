@@ -0,0 +1,299 @@
+import cv2
+import numpy as np
+
+# cvtColor codes by channel order and channel count
+_TO_GRAY = {
+    ("RGB", 3): cv2.COLOR_RGB2GRAY, ("RGB", 4): cv2.COLOR_RGBA2GRAY,
+    ("BGR", 3): cv2.COLOR_BGR2GRAY, ("BGR", 4): cv2.COLOR_BGRA2GRAY
+}
+
+
+def to_gray(image, order="RGB"):
+    """8-bit luma of a gray, RGB(A) or BGR(A) frame.
+
+    pyautogui/PIL screenshots are RGB, OpenCV and mss images are BGR; an
+    alpha channel is ignored.
+    """
+    image = np.asarray(image)
+    if image.ndim == 2:
+        return image.astype(np.uint8, copy=False)
+    if order not in ("RGB", "BGR"):
+        raise ValueError(f"Unknown channel order: {order}")
+    return cv2.cvtColor(image, _TO_GRAY[order, image.shape[2]])
+
+
+def otsu_threshold(image):
+    """Gray level that best separates the two classes of an 8-bit image"""
+    threshold, _ = cv2.threshold(image, 0, 255, cv2.THRESH_BINARY | cv2.THRESH_OTSU)
+    return int(threshold)
+
+
+def resize(image, scale):
+    """Resize a 2-D uint8 image by scale (area averaging when shrinking)"""
+    if scale == 1:
+        return image
+    height, width = image.shape
+    size = (max(1, round(width * scale)), max(1, round(height * scale)))
+    return cv2.resize(image, size, interpolation=cv2.INTER_AREA if scale < 1 else cv2.INTER_LINEAR)
+
+
+def contrast_mask(gray, window=9, contrast=24):
+    """Pixels more than `contrast` gray levels darker or lighter than their
+    local mean, so dark-on-light and light-on-dark text both show up"""
+    window |= 1  # adaptiveThreshold needs an odd block size
+    dark = cv2.adaptiveThreshold(gray, 255, cv2.ADAPTIVE_THRESH_MEAN_C,
+                                 cv2.THRESH_BINARY_INV, window, contrast)
+    light = cv2.adaptiveThreshold(255 - gray, 255, cv2.ADAPTIVE_THRESH_MEAN_C,
+                                  cv2.THRESH_BINARY_INV, window, contrast)
+    return cv2.bitwise_or(dark, light)
+
+
+def remove_rules(mask, gray, length=60, contrast=24, window=9):
+    """Mask with panel borders, rules and edges cleared.
+
+    These are brightness steps running straight for `length` pixels, which
+    glyphs never do; the band the contrast mask marks around each one is
+    cleared, so the closing in text_boxes cannot join every text line they
+    touch into one panel.
+    """
+    gray = gray.astype(np.int16)
+    steps_down = np.zeros(gray.shape, dtype=np.uint8)
+    steps_across = np.zeros(gray.shape, dtype=np.uint8)
+    steps_down[1:-1] = (np.abs(gray[2:] - gray[:-2]) >= contrast) * 255
+    steps_across[:, 1:-1] = (np.abs(gray[:, 2:] - gray[:, :-2]) >= contrast) * 255
+    horizontal = cv2.morphologyEx(steps_down, cv2.MORPH_OPEN,
+                                  cv2.getStructuringElement(cv2.MORPH_RECT, (length, 1)))
+    vertical = cv2.morphologyEx(steps_across, cv2.MORPH_OPEN,
+                                cv2.getStructuringElement(cv2.MORPH_RECT, (1, length)))
+    band = window + 2
+    rules = cv2.bitwise_or(
+        cv2.dilate(horizontal, cv2.getStructuringElement(cv2.MORPH_RECT, (1, band))),
+        cv2.dilate(vertical, cv2.getStructuringElement(cv2.MORPH_RECT, (band, 1))))
+    return cv2.bitwise_and(mask.astype(np.uint8), cv2.bitwise_not(rules))
+
+
+def text_boxes(mask, join=8, min_size=4):
+    """Bounding boxes (x, y, w, h) of text-like blobs in a mask.
+
+    A horizontal closing by `join` pixels merges glyphs into words and
+    lines, which are then taken as connected components.
+    """
+    mask = mask.astype(np.uint8)
+    kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (join + 1, 1))
+    closed = cv2.morphologyEx(mask, cv2.MORPH_CLOSE, kernel)
+    count, _, stats, _ = cv2.connectedComponentsWithStats(closed, connectivity=4)
+    return [(int(x), int(y), int(w), int(h)) for x, y, w, h, _ in stats[1:count]
+            if w >= min_size and h >= min_size]
+
+
+def _spans(profile):
+    """Lengths of the runs of True in a 1-D mask"""
+    padded = np.concatenate(([0], profile.astype(np.int8), [0]))
+    edges = np.diff(padded)
+    return np.flatnonzero(edges == -1) - np.flatnonzero(edges == 1)
+
+
+def is_textured(region, min_gradient=1.0):
+    """False for straight rules and panel edges, which only change along one axis"""
+    region = region.astype(np.int16)
+    dx = np.abs(np.diff(region, axis=1)).mean() if region.shape[1] > 1 else 0.0
+    dy = np.abs(np.diff(region, axis=0)).mean() if region.shape[0] > 1 else 0.0
+    return min(dx, dy) >= min_gradient
+
+
+def merge_boxes(boxes, padding=0, bounds=None):
+    """Pad boxes and merge the ones that overlap, so no pixel is read twice"""
+    width, height = bounds if bounds is not None else (None, None)
+    merged = []
+    for x, y, w, h in boxes:
+        box = [x - padding, y - padding, x + w + padding, y + h + padding]
+        if bounds is not None:
+            box = [max(box[0], 0), max(box[1], 0), min(box[2], width), min(box[3], height)]
+        merged.append(box)
+    changed = True
+    while changed:
+        changed = False
+        result = []
+        for box in sorted(merged):
+            for other in result:
+                if box[0] < other[2] and other[0] < box[2] and box[1] < other[3] and other[1] < box[3]:
+                    other[:] = [min(box[0], other[0]), min(box[1], other[1]),
+                                max(box[2], other[2]), max(box[3], other[3])]
+                    changed = True
+                    break
+            else:
+                result.append(box)
+        merged = result
+    return sorted(((x, y, r - x, b - y) for x, y, r, b in merged), key=lambda b: (b[1], b[0]))
+
+
+class TextPreprocessor:
+    """Prepares a screen image so OCR only reads its text.
+
+    Text regions are proposed from a local-contrast mask (works for dark
+    on light and light on dark), each region is rescaled so its text line
+    is about `target_height` pixels tall, binarized with Otsu's threshold
+    into black text on white, and the regions are stacked into one small
+    mosaic, so a single OCR call reads every region. read() maps the words
+    back to the coordinates of the original image.
+    """
+
+    def __init__(self, target_height=32, min_scale=0.5, max_scale=4.0, binarize=True,
+                 regions=True, order="RGB", window=9, contrast=24, join=8, min_size=4,
+                 padding=2, border=10, rule_length=60):
+        self.target_height = target_height
+        self.min_scale = min_scale
+        self.max_scale = max_scale
+        self.binarize = binarize
+        self.regions = regions
+        self.order = order
+        self.window = window        # local-contrast window, pixels
+        self.contrast = contrast    # gray levels above/below the local mean
+        self.join = join            # horizontal gap closed between glyphs
+        self.min_size = min_size
+        self.padding = padding      # source pixels kept around a region
+        self.border = border        # white pixels around each mosaic slot
+        self.rule_length = rule_length  # straight runs this long are not text
+
+    def text_mask(self, gray):
+        return contrast_mask(gray, self.window, self.contrast)
+
+    def propose(self, gray, mask=None):
+        """Candidate text regions as (x, y, w, h)"""
+        height, width = gray.shape
+        if not self.regions:
+            return [(0, 0, width, height)]
+        if mask is None:
+            mask = self.text_mask(gray)
+        mask = remove_rules(mask, gray, self.rule_length, self.contrast, self.window)
+        boxes = [(x, y, w, h) for x, y, w, h in text_boxes(mask, self.join, self.min_size)
+                 if is_textured(gray[y:y + h, x:x + w])]
+        return merge_boxes(boxes, self.padding, (width, height))
+
+    def text_height(self, ink):
+        """Median height of the text lines in a region's ink mask"""
+        spans = _spans(ink.any(axis=1))
+        return float(np.median(spans)) if len(spans) else float(ink.shape[0])
+
+    def scale_for(self, ink):
+        height = max(self.text_height(ink), 1.0)
+        return float(np.clip(self.target_height / height, self.min_scale, self.max_scale))
+
+    def analyze_region(self, gray):
+        """(threshold, dark_background, scale) for a gray crop"""
+        split = otsu_threshold(gray)
+        light = gray > split
+        # Binarize halfway between the two classes, not at Otsu's split: that
+        # is the top of the dark class, so upscaled stroke edges, which fall
+        # between the classes, would otherwise all turn into background
+        threshold = split
+        if 0 < light.mean() < 1:
+            threshold = (gray[light].mean() + gray[~light].mean()) / 2
+        # The background is the majority class; light text on dark is flipped
+        dark_background = light.mean() < 0.5
+        return threshold, dark_background, self.scale_for(light if dark_background else ~light)
+
+    def prepare_region(self, gray, analysis=None):
+        """(region rescaled as dark text on white, scale) for a gray crop"""
+        threshold, dark_background, scale = analysis or self.analyze_region(gray)
+        region = resize(gray, scale)
+        if self.binarize:
+            return np.where((region > threshold) != dark_background, 255, 0).astype(np.uint8), scale
+        return (255 - region if dark_background else region), scale
+
+    def prepare(self, image):
+        """(mosaic, slots) for an image; mosaic is None when it has no text.
+
+        Regions are packed onto shelves, tallest first, in a roughly square
+        mosaic. Each slot is (left, top, width, height, x, y, scale): where
+        the region sits in the mosaic and where it came from in the image.
+        Rescaling can make the regions add up to more pixels than the image
+        (dense small text); OCR would then gain nothing, so the gray image
+        itself is returned as a single slot instead.
+        """
+        gray = to_gray(image, self.order)
+        height, width = gray.shape
+        whole = (gray, [(0, 0, width, height, 0, 0, 1.0)])
+        boxes = self.propose(gray)
+        if not boxes:
+            return None, []
+
+        border = self.border
+        analyses = [self.analyze_region(gray[y:y + h, x:x + w]) for x, y, w, h in boxes]
+        estimate = sum((h * scale + border) * (w * scale + border)
+                       for (_, _, w, h), (_, _, scale) in zip(boxes, analyses))
+        if estimate >= gray.size:
+            return whole
+        regions = []
+        for (x, y, w, h), analysis in zip(boxes, analyses):
+            part, scale = self.prepare_region(gray[y:y + h, x:x + w], analysis)
+            regions.append((part, x, y, scale))
+
+        area = sum((p.shape[0] + border) * (p.shape[1] + border) for p, *_ in regions)
+        mosaic_width = max(max(p.shape[1] for p, *_ in regions) + 2 * border, int(area ** 0.5))
+        slots = []
+        left, top, shelf = border, border, 0
+        for part, x, y, scale in sorted(regions, key=lambda r: -r[0].shape[0]):
+            h, w = part.shape
+            if left + w + border > mosaic_width:
+                left, top, shelf = border, top + shelf + border, 0
+            slots.append((left, top, w, h, x, y, scale))
+            left += w + border
+            shelf = max(shelf, h)
+
+        mosaic = np.full((top + shelf + border, mosaic_width), 255, dtype=np.uint8)
+        for (part, *_), (left, top, w, h, *_) in zip(
+                sorted(regions, key=lambda r: -r[0].shape[0]), slots):
+            mosaic[top:top + h, left:left + w] = part
+        if mosaic.size >= gray.size:
+            return whole
+        return mosaic, slots
+
+    def read(self, image, ocr_fn):
+        """OCR data for an image, in image_to_data format and image coordinates"""
+        data = {'text': [], 'left': [], 'top': [], 'width': [], 'height': [], 'conf': []}
+        mosaic, slots = self.prepare(image)
+        if mosaic is None:
+            return data
+        result = ocr_fn(mosaic)
+        height, width = np.asarray(image).shape[:2]
+        for i, text in enumerate(result['text']):
+            if not str(text).strip():
+                continue
+            left, top = result['left'][i], result['top'][i]
+            w, h = result['width'][i], result['height'][i]
+            slot = self._slot_at(slots, left + w / 2, top + h / 2)
+            if slot is None:
+                continue  # in the white gap between two regions
+            slot_left, slot_top, _, _, x, y, scale = slot
+            word_x = min(max(x + round((left - slot_left) / scale), 0), width - 1)
+            word_y = min(max(y + round((top - slot_top) / scale), 0), height - 1)
+            data['text'].append(text)
+            data['left'].append(word_x)
+            data['top'].append(word_y)
+            data['width'].append(max(1, min(round(w / scale), width - word_x)))
+            data['height'].append(max(1, min(round(h / scale), height - word_y)))
+            data['conf'].append(result['conf'][i])
+        return data
+
+    def _slot_at(self, slots, cx, cy):
+        for slot in slots:
+            left, top, w, h = slot[:4]
+            if left <= cx < left + w and top <= cy < top + h:
+                return slot
+        return None
+
+
+class PreprocessedOCR:
+    """ocr_fn(image) that reads through a TextPreprocessor.
+
+    Picklable when ocr_fn is a module-level function, so it can be handed
+    to OCRPool and run in the worker processes.
+    """
+
+    def __init__(self, ocr_fn, preprocessor=None):
+        self.ocr_fn = ocr_fn
+        self.preprocessor = preprocessor or TextPreprocessor()
+
+    def __call__(self, image):
+        return self.preprocessor.read(image, self.ocr_fn)
@@ -0,0 +1,129 @@
+import random
+from collections import deque
+
+
+class SpaceSaving:
+    """Bounded top-k heavy hitters (Metwally et al. space-saving).
+
+    Tracks at most k items; counts are overestimates by at most the
+    recorded error of each item.
+    """
+
+    def __init__(self, k=50):
+        self.k = k
+        self.counters = {}
+
+    def add(self, item, weight=1):
+        counter = self.counters.get(item)
+        if counter is not None:
+            counter[0] += weight
+            return
+        if len(self.counters) < self.k:
+            self.counters[item] = [weight, 0]
+            return
+        # Replace the smallest counter and inherit its count as error
+        victim = min(self.counters, key=lambda key: self.counters[key][0])
+        floor = self.counters.pop(victim)[0]
+        self.counters[item] = [floor + weight, floor]
+
+    def top(self, n=10):
+        """(item, count) pairs, largest first"""
+        ranked = sorted(self.counters.items(), key=lambda x: x[1][0], reverse=True)
+        return [(item, counter[0]) for item, counter in ranked[:n]]
+
+    def __contains__(self, item):
+        return item in self.counters
+
+    def __len__(self):
+        return len(self.counters)
+
+
+class CountMinSketch:
+    """Approximate per-item counts in fixed memory"""
+
+    def __init__(self, width=2048, depth=4, seed=42):
+        self.width = width
+        self.depth = depth
+        self.seeds = [random.Random(seed + row).getrandbits(32) for row in range(depth)]
+        self.table = [[0] * width for _ in range(depth)]
+
+    def _cells(self, item):
+        return [hash((seed, item)) % self.width for seed in self.seeds]
+
+    def add(self, item, weight=1):
+        for row, cell in zip(self.table, self._cells(item)):
+            row[cell] += weight
+
+    def estimate(self, item):
+        return min(row[cell] for row, cell in zip(self.table, self._cells(item)))
+
+
+class SlidingWindowRate:
+    """Success rate over the last N outcomes, updated in O(1)"""
+
+    def __init__(self, size=100):
+        self.outcomes = deque(maxlen=size)
+        self.successes = 0
+
+    def add(self, success):
+        if len(self.outcomes) == self.outcomes.maxlen and self.outcomes[0]:
+            self.successes -= 1
+        self.outcomes.append(bool(success))
+        if success:
+            self.successes += 1
+
+    @property
+    def rate(self):
+        return self.successes / len(self.outcomes) if self.outcomes else 0
+
+
+class PatternStats:
+    """Incrementally maintained command statistics with bounded memory"""
+
+    def __init__(self, top_k=50, window=100, sketch_width=2048, sketch_depth=4):
+        self.total = 0
+        self.successes = 0
+        self.common = SpaceSaving(top_k)
+        self.successful = SpaceSaving(top_k)
+        self.totals_sketch = CountMinSketch(sketch_width, sketch_depth)
+        self.success_sketch = CountMinSketch(sketch_width, sketch_depth)
+        self.window = SlidingWindowRate(window)
+
+    def record(self, command, success):
+        """Update all statistics with one interaction"""
+        self.add_counts(command, 1, 1 if success else 0)
+        self.window.add(success)
+
+    def add_counts(self, command, total, successes):
+        """Merge aggregated counts, e.g. when loading from storage"""
+        command = command.lower()
+        self.total += total
+        self.successes += successes
+        self.common.add(command, total)
+        self.totals_sketch.add(command, total)
+        if successes:
+            self.successful.add(command, successes)
+            self.success_sketch.add(command, successes)
+
+    def count(self, command):
+        return self.totals_sketch.estimate(command.lower())
+
+    def success_rate(self, command=None):
+        """Overall success rate, or the estimated rate of one command"""
+        if command is None:
+            return self.successes / self.total if self.total else 0
+        command = command.lower()
+        total = self.totals_sketch.estimate(command)
+        if not total:
+            return 0
+        return min(1.0, self.success_sketch.estimate(command) / total)
+
+    @property
+    def recent_success_rate(self):
+        return self.window.rate
+
+    def top(self, n=10):
+        return dict(self.common.top(n))
+
+    def top_successful(self, n=10):
+        return dict(self.successful.top(n))
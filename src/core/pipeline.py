@@ -0,0 +1,177 @@
+import queue
+import threading
+import time
+
+
+class PipelineStage:
+    """One worker thread fed by a bounded input queue.
+
+    The handler returns the item to pass downstream, or None to drop it.
+    """
+
+    def __init__(self, name, handler, maxsize=8):
+        self.name = name
+        self.handler = handler
+        self.queue = queue.Queue(maxsize)
+        self.next_stage = None
+        self.on_error = None
+        self.stop_event = None
+        self.processed = 0
+        self.errors = 0
+        self.max_depth = 0
+        self.busy_time = 0.0
+        self._running = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._running.set()
+        self._thread = threading.Thread(target=self._run, name=f"stage-{self.name}", daemon=True)
+        self._thread.start()
+
+    def put(self, item, stop_event=None):
+        """Blocking put that gives up once stop_event is set"""
+        while not (stop_event and stop_event.is_set()):
+            try:
+                self.queue.put(item, timeout=0.1)
+                self.max_depth = max(self.max_depth, self.queue.qsize())
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def drain(self, timeout):
+        """Wait until every queued item has been handled"""
+        deadline = time.time() + timeout
+        while self.queue.unfinished_tasks and time.time() < deadline:
+            time.sleep(0.01)
+        return not self.queue.unfinished_tasks
+
+    def stop(self, timeout=1.0):
+        self._running.clear()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _run(self):
+        while self._running.is_set():
+            try:
+                item = self.queue.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            try:
+                self._handle(item)
+            finally:
+                self.queue.task_done()
+
+    def _handle(self, item):
+        started = time.perf_counter()
+        try:
+            result = self.handler(item)
+        except Exception as e:
+            self.errors += 1
+            print(f"Error in {self.name} stage: {e}")
+            if self.on_error:
+                self.on_error(self.name, item, e)
+            return
+        finally:
+            self.busy_time += time.perf_counter() - started
+        self.processed += 1
+        if result is not None and self.next_stage is not None:
+            self.next_stage.put(result, self.stop_event)
+
+    def metrics(self):
+        return {
+            "queue_depth": self.queue.qsize(),
+            "max_queue_depth": self.max_depth,
+            "processed": self.processed,
+            "errors": self.errors,
+            "busy_time": self.busy_time,
+            "avg_time": self.busy_time / self.processed if self.processed else 0.0
+        }
+
+
+class AssistantPipeline:
+    """Source thread plus a chain of stages connected by bounded queues.
+
+    The source is polled repeatedly (e.g. microphone capture) and its
+    non-None results enter the first stage. Leave the source out for a
+    text-only pipeline and feed it with submit().
+    """
+
+    def __init__(self, stages, source=None, queue_size=8):
+        self.stages = [PipelineStage(name, handler, queue_size) for name, handler in stages]
+        self.source = source
+        self.source_errors = 0
+        self._stop_source = threading.Event()
+        self._stopped = threading.Event()
+        for stage, next_stage in zip(self.stages, self.stages[1:]):
+            stage.next_stage = next_stage
+        for stage in self.stages:
+            stage.stop_event = self._stopped
+        self._source_thread = None
+
+    @property
+    def text_only(self):
+        return self.source is None
+
+    def stage(self, name):
+        return next(stage for stage in self.stages if stage.name == name)
+
+    def set_error_handler(self, handler):
+        for stage in self.stages:
+            stage.on_error = handler
+
+    def start(self):
+        self._stopped.clear()
+        self._stop_source.clear()
+        for stage in self.stages:
+            stage.start()
+        if self.source is not None:
+            self._source_thread = threading.Thread(target=self._run_source, name="stage-source",
+                                                   daemon=True)
+            self._source_thread.start()
+
+    def submit(self, item, stage=None):
+        """Feed an item directly into a stage (the first one by default)"""
+        target = self.stage(stage) if stage else self.stages[0]
+        return target.put(item, self._stopped)
+
+    def wait(self, timeout=None):
+        """Block until stop() is called"""
+        return self._stopped.wait(timeout)
+
+    def drain(self, timeout=30.0):
+        """Wait for all queued work to pass through every stage"""
+        deadline = time.time() + timeout
+        for stage in self.stages:
+            if not stage.drain(max(0.0, deadline - time.time())):
+                return False
+        return True
+
+    def stop(self, drain=True, timeout=5.0):
+        """Stop the source, optionally finish queued work, then stop the stages"""
+        self._stop_source.set()
+        if self._source_thread is not None:
+            self._source_thread.join(timeout)
+        if drain:
+            self.drain(timeout)
+        for stage in self.stages:
+            stage.stop()
+        self._stopped.set()
+
+    def metrics(self):
+        """Per-stage queue depths and timings"""
+        metrics = {stage.name: stage.metrics() for stage in self.stages}
+        if self.source is not None:
+            metrics["source"] = {"errors": self.source_errors}
+        return metrics
+
+    def _run_source(self):
+        while not self._stop_source.is_set():
+            try:
+                item = self.source()
+            except Exception as e:
+                self.source_errors += 1
+                print(f"Error in capture stage: {e}")
+                continue
+            if item is not None:
+                self.stages[0].put(item, self._stop_source)
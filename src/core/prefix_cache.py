@@ -0,0 +1,112 @@
+import hashlib
+import os
+import pickle
+from collections import OrderedDict
+
+
+class PrefixStateCache:
+    """Reuse llama.cpp KV state for a fixed prompt prefix.
+
+    Before a completion, prepare() makes sure the model's evaluated tokens
+    start with the prefix: either they already do (resident), or a saved
+    state is restored from memory or disk, or the prefix is evaluated once
+    and its state saved. llama.cpp then only evaluates the new suffix.
+    """
+
+    def __init__(self, model, model_id="model", state_dir=None, max_states=4):
+        self.model = model
+        self.model_id = model_id
+        self.state_dir = state_dir
+        self.max_states = max_states
+        self.states = OrderedDict()
+        self.stats = {
+            "resident_hits": 0,
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "tokens_reused": 0,
+            "tokens_evaluated": 0
+        }
+
+    def prepare(self, prefix):
+        """Load or build the KV state for prefix; returns how it was served"""
+        tokens = self.model.tokenize(prefix.encode("utf-8"))
+        key = self._key(tokens)
+
+        if self._evaluated_tokens()[:len(tokens)] == tokens:
+            return self._hit("resident", tokens)
+
+        state = self.states.get(key)
+        if state is not None:
+            self.states.move_to_end(key)
+            self.model.load_state(state)
+            return self._hit("memory", tokens)
+
+        state = self._load_from_disk(key)
+        if state is not None:
+            self._remember(key, state)
+            self.model.load_state(state)
+            return self._hit("disk", tokens)
+
+        self.model.reset()
+        self.model.eval(tokens)
+        state = self.model.save_state()
+        self._remember(key, state)
+        self._save_to_disk(key, state)
+        self.stats["misses"] += 1
+        self.stats["tokens_evaluated"] += len(tokens)
+        return "miss"
+
+    def hit_rate(self):
+        hits = sum(self.stats[k] for k in ("resident_hits", "memory_hits", "disk_hits"))
+        total = hits + self.stats["misses"]
+        return hits / total if total else 0.0
+
+    def get_stats(self):
+        stats = dict(self.stats)
+        stats["hit_rate"] = self.hit_rate()
+        return stats
+
+    def _hit(self, kind, tokens):
+        self.stats[f"{kind}_hits"] += 1
+        self.stats["tokens_reused"] += len(tokens)
+        return kind
+
+    def _evaluated_tokens(self):
+        n_tokens = getattr(self.model, "n_tokens", 0)
+        return list(self.model.input_ids[:n_tokens]) if n_tokens else []
+
+    def _key(self, tokens):
+        digest = hashlib.sha1(",".join(map(str, tokens)).encode()).hexdigest()
+        return f"{self.model_id}-{digest}"
+
+    def _remember(self, key, state):
+        self.states[key] = state
+        self.states.move_to_end(key)
+        while len(self.states) > self.max_states:
+            self.states.popitem(last=False)
+
+    def _state_path(self, key):
+        return os.path.join(self.state_dir, f"{key}.state")
+
+    def _load_from_disk(self, key):
+        if not self.state_dir or not os.path.exists(self._state_path(key)):
+            return None
+        try:
+            with open(self._state_path(key), "rb") as f:
+                return pickle.load(f)
+        except Exception as e:
+            print(f"Error loading prompt state: {e}")
+            return None
+
+    def _save_to_disk(self, key, state):
+        if not self.state_dir:
+            return
+        try:
+            os.makedirs(self.state_dir, exist_ok=True)
+            tmp_path = self._state_path(key) + ".tmp"
+            with open(tmp_path, "wb") as f:
+                pickle.dump(state, f)
+            os.replace(tmp_path, self._state_path(key))
+        except Exception as e:
+            print(f"Error saving prompt state: {e}")
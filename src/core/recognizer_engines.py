@@ -0,0 +1,264 @@
+import threading
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+
+class RecognitionCancelled(Exception):
+    """Raised by engines that notice another engine already won"""
+
+
+class RecognitionResult:
+    __slots__ = ("engine", "text", "confidence", "latency")
+
+    def __init__(self, engine, text, confidence, latency):
+        self.engine = engine
+        self.text = text
+        self.confidence = confidence
+        self.latency = latency
+
+    def __repr__(self):
+        return f"RecognitionResult({self.engine}, {self.text!r}, {self.confidence:.2f})"
+
+
+class RecognizerEngine(ABC):
+    """Interface every speech-to-text engine implements"""
+
+    name = "engine"
+
+    @abstractmethod
+    def recognize(self, audio, cancel=None):
+        """Return (text, confidence), or None when nothing was understood.
+
+        `cancel` is a threading.Event set once the pool no longer needs the
+        answer; engines that can stop early should check it.
+        """
+
+
+class GoogleEngine(RecognizerEngine):
+    name = "google"
+
+    def __init__(self, recognizer):
+        self.recognizer = recognizer
+
+    def recognize(self, audio, cancel=None):
+        import speech_recognition as sr
+
+        try:
+            response = self.recognizer.recognize_google(audio, show_all=True)
+        except sr.UnknownValueError:
+            return None
+        alternatives = response.get("alternative") if isinstance(response, dict) else None
+        if not alternatives:
+            return None
+        best = alternatives[0]
+        return best["transcript"], best.get("confidence", 0.8)
+
+
+class SphinxEngine(RecognizerEngine):
+    """Offline fallback; pocketsphinx reports no usable confidence"""
+
+    name = "sphinx"
+
+    def __init__(self, recognizer, confidence=0.5):
+        self.recognizer = recognizer
+        self.confidence = confidence
+
+    def recognize(self, audio, cancel=None):
+        import speech_recognition as sr
+
+        try:
+            text = self.recognizer.recognize_sphinx(audio)
+        except sr.UnknownValueError:
+            return None
+        return (text, self.confidence) if text else None
+
+
+class StubEngine(RecognizerEngine):
+    """Engine with a fixed answer and delay for tests and benchmarks"""
+
+    def __init__(self, name, text=None, confidence=1.0, delay=0.0, error=None):
+        self.name = name
+        self.text = text
+        self.confidence = confidence
+        self.delay = delay
+        self.error = error
+        self.calls = 0
+        self.cancelled = 0
+
+    def recognize(self, audio, cancel=None):
+        self.calls += 1
+        if cancel is not None and cancel.wait(self.delay):
+            self.cancelled += 1
+            raise RecognitionCancelled(self.name)
+        elif cancel is None:
+            time.sleep(self.delay)
+        if self.error is not None:
+            raise self.error
+        if self.text is None:
+            return None
+        return self.text, self.confidence
+
+
+class EngineStats:
+    """Running latency and error rate for one engine"""
+
+    def __init__(self, smoothing=0.3):
+        self.smoothing = smoothing
+        self.calls = 0
+        self.errors = 0
+        self.empty = 0
+        self.wins = 0
+        self.cancelled = 0
+        self.latency = None  # exponentially weighted, seconds
+
+    def record(self, latency, error=False, empty=False):
+        self.calls += 1
+        self.errors += error
+        self.empty += empty
+        if self.latency is None:
+            self.latency = latency
+        else:
+            self.latency += self.smoothing * (latency - self.latency)
+
+    @property
+    def error_rate(self):
+        return self.errors / self.calls if self.calls else 0.0
+
+    @property
+    def score(self):
+        """Expected seconds to a usable answer; lower ranks first"""
+        if self.latency is None:
+            return 0.0  # untried engines are tried early
+        return self.latency / max(1.0 - self.error_rate, 0.05)
+
+    def to_dict(self):
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "empty": self.empty,
+            "wins": self.wins,
+            "cancelled": self.cancelled,
+            "latency": self.latency,
+            "error_rate": self.error_rate
+        }
+
+
+class EnginePool:
+    """Runs recognizer engines concurrently and keeps the answer that wins.
+
+    In "first" mode the first result with at least `min_confidence` is
+    returned; in "best" mode the most confident result available by the
+    deadline is. With `hedge_delay` the top-ranked engine gets a head start
+    and the others are only launched if it has not answered by then. The
+    losers are told to stop via a cancel event, and engines are re-ranked
+    after every call by their observed latency and error rate.
+    """
+
+    def __init__(self, engines, mode="first", deadline=10.0, min_confidence=0.0,
+                 hedge_delay=0.0, adaptive=True):
+        if mode not in ("first", "best"):
+            raise ValueError(f"Unknown pool mode: {mode}")
+        self.engines = list(engines)
+        self.mode = mode
+        self.deadline = deadline
+        self.min_confidence = min_confidence
+        self.hedge_delay = hedge_delay
+        self.adaptive = adaptive
+        self._stats = {engine.name: EngineStats() for engine in self.engines}
+        self._lock = threading.Lock()
+        # Engines that ignore cancellation keep a worker busy until they
+        # return, so leave room for a straggler per engine
+        self._executor = ThreadPoolExecutor(max_workers=2 * len(self.engines),
+                                            thread_name_prefix="recognizer")
+
+    def ranked(self):
+        """Engines in the order they should be tried"""
+        if not self.adaptive:
+            return list(self.engines)
+        with self._lock:
+            return sorted(self.engines, key=lambda engine: self._stats[engine.name].score)
+
+    def recognize(self, audio):
+        """Best RecognitionResult under the pool policy, or None"""
+        engines = self.ranked()
+        cancel = threading.Event()
+        started = time.perf_counter()
+        deadline = None if self.deadline is None else started + self.deadline
+        pending = set()
+        results = []
+        winner = None
+
+        launch = engines
+        if self.hedge_delay > 0 and len(engines) > 1:
+            launch, engines = engines[:1], engines[1:]
+        else:
+            engines = []
+        pending.update(self._submit(engine, audio, cancel) for engine in launch)
+
+        try:
+            while pending or engines:
+                timeout = None if deadline is None else max(0.0, deadline - time.perf_counter())
+                if engines:
+                    hedge_at = started + self.hedge_delay - time.perf_counter()
+                    timeout = max(0.0, hedge_at) if timeout is None else min(timeout, max(0.0, hedge_at))
+                done, pending = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+
+                for future in done:
+                    result = future.result()
+                    if result is not None and result.confidence >= self.min_confidence:
+                        results.append(result)
+                if self.mode == "first" and results:
+                    break
+
+                if engines and (not pending or time.perf_counter() >= started + self.hedge_delay):
+                    # The head start ran out (or the primary failed): hedge
+                    pending.update(self._submit(engine, audio, cancel) for engine in engines)
+                    engines = []
+                elif deadline is not None and time.perf_counter() >= deadline:
+                    break
+
+            if winner is None and results:
+                winner = max(results, key=lambda result: result.confidence)
+        finally:
+            cancel.set()
+            for future in pending:
+                future.cancel()
+
+        if winner is not None:
+            with self._lock:
+                self._stats[winner.engine].wins += 1
+        return winner
+
+    def stats(self):
+        """Per-engine call, error and latency figures"""
+        with self._lock:
+            return {name: stats.to_dict() for name, stats in self._stats.items()}
+
+    def close(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _submit(self, engine, audio, cancel):
+        return self._executor.submit(self._run, engine, audio, cancel)
+
+    def _run(self, engine, audio, cancel):
+        started = time.perf_counter()
+        try:
+            answer = engine.recognize(audio, cancel)
+        except RecognitionCancelled:
+            with self._lock:
+                self._stats[engine.name].cancelled += 1
+            return None
+        except Exception as e:
+            with self._lock:
+                self._stats[engine.name].record(time.perf_counter() - started, error=True)
+            print(f"Recognizer {engine.name} failed: {e}")
+            return None
+
+        latency = time.perf_counter() - started
+        with self._lock:
+            self._stats[engine.name].record(latency, empty=answer is None)
+        if answer is None:
+            return None
+        text, confidence = answer
+        return RecognitionResult(engine.name, text, confidence, latency)
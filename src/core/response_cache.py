@@ -0,0 +1,170 @@
+import time
+from collections import OrderedDict, defaultdict
+from difflib import SequenceMatcher
+
+
+class ResponseCache:
+    """Bounded response cache with an n-gram candidate index.
+
+    Lookups only score the few cached commands that share character
+    n-grams with the query instead of running SequenceMatcher against
+    every entry.
+    """
+
+    # Commands whose answers go stale immediately
+    DEFAULT_UNCACHEABLE = ("time", "date", "today", "now", "weather", "clock")
+
+    def __init__(self, max_entries=256, ttl=3600, threshold=0.8,
+                 ngram_size=3, max_candidates=8, uncacheable=None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.threshold = threshold
+        self.ngram_size = ngram_size
+        self.max_candidates = max_candidates
+        self.uncacheable = set(uncacheable if uncacheable is not None
+                               else self.DEFAULT_UNCACHEABLE)
+
+        self.entries = OrderedDict()
+        self.index = defaultdict(set)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _normalize(self, command):
+        return " ".join(command.lower().split())
+
+    def _ngrams(self, text):
+        """Character n-grams of the padded command"""
+        padded = f" {text} "
+        n = self.ngram_size
+        if len(padded) <= n:
+            return {padded}
+        return {padded[i:i + n] for i in range(len(padded) - n + 1)}
+
+    def is_cacheable(self, command, response=None):
+        """Check whether a command/response pair may be cached"""
+        if not command or not command.strip():
+            return False
+        if response is None or not str(response).strip():
+            return False
+        words = set(self._normalize(command).split())
+        return not (words & self.uncacheable)
+
+    def get(self, command):
+        """Return cached response for a similar command or None"""
+        key = self._normalize(command)
+        now = time.time()
+
+        entry = self.entries.get(key)
+        if entry is not None:
+            if self._expired(entry, now):
+                self._remove(key)
+            else:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return entry["response"]
+
+        match = self._best_candidate(key, now)
+        if match is not None:
+            self.entries.move_to_end(match)
+            self.hits += 1
+            return self.entries[match]["response"]
+
+        self.misses += 1
+        return None
+
+    def put(self, command, response):
+        """Cache a response; returns False if the entry is not cacheable"""
+        if not self.is_cacheable(command, response):
+            return False
+
+        key = self._normalize(command)
+        if key in self.entries:
+            self._remove(key)
+
+        grams = self._ngrams(key)
+        self.entries[key] = {
+            "response": response,
+            "created": time.time(),
+            "grams": grams
+        }
+        for gram in grams:
+            self.index[gram].add(key)
+
+        while len(self.entries) > self.max_entries:
+            oldest = next(iter(self.entries))
+            self._remove(oldest)
+            self.evictions += 1
+        return True
+
+    def purge_expired(self):
+        """Drop all entries older than the TTL"""
+        now = time.time()
+        expired = [k for k, e in self.entries.items() if self._expired(e, now)]
+        for key in expired:
+            self._remove(key)
+        return len(expired)
+
+    def clear(self):
+        self.entries.clear()
+        self.index.clear()
+
+    def stats(self):
+        """Get cache hit/miss counters"""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self.entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0
+        }
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, command):
+        return self._normalize(command) in self.entries
+
+    def _best_candidate(self, key, now):
+        """Score only the entries sharing the most n-grams with key"""
+        grams = self._ngrams(key)
+        shared = defaultdict(int)
+        for gram in grams:
+            for candidate in self.index.get(gram, ()):
+                shared[candidate] += 1
+        if not shared:
+            return None
+
+        candidates = sorted(shared, key=shared.get, reverse=True)
+        best_key, best_ratio = None, self.threshold
+        for candidate in candidates[:self.max_candidates]:
+            entry = self.entries[candidate]
+            if self._expired(entry, now):
+                self._remove(candidate)
+                continue
+            # Upper bound of SequenceMatcher.ratio() from lengths alone
+            total = len(key) + len(candidate)
+            if 2.0 * min(len(key), len(candidate)) / total <= best_ratio:
+                continue
+            matcher = SequenceMatcher(None, key, candidate)
+            if matcher.quick_ratio() <= best_ratio:
+                continue
+            ratio = matcher.ratio()
+            if ratio > best_ratio:
+                best_key, best_ratio = candidate, ratio
+        return best_key
+
+    def _expired(self, entry, now):
+        return self.ttl is not None and now - entry["created"] > self.ttl
+
+    def _remove(self, key):
+        entry = self.entries.pop(key, None)
+        if entry is None:
+            return
+        for gram in entry["grams"]:
+            bucket = self.index.get(gram)
+            if bucket is not None:
+                bucket.discard(key)
+                if not bucket:
+                    del self.index[gram]
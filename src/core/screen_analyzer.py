@@ -1,63 +1,69 @@
-import cv2
-import numpy as np
-import pyautogui
-import pytesseract
-from PIL import Image
-import torch
-from transformers import AutoModelForObjectDetection, AutoFeatureExtractor
+from .tile_ocr import TileOCR
+from .screen_map import ScreenMap
+from .ocr_pool import OCRPool, tesseract_data
+from .ocr_preprocess import PreprocessedOCR, TextPreprocessor
+from .screen_capture import get_capture
 
 class ScreenAnalyzer:
-    def __init__(self):
+    def __init__(self, tile_size=256, margin=64, map_ttl=2.0, ocr_workers=None,
+                 preprocessor=None, capture=None, ocr_options=None, capture_options=None):
+        # Frames are shared with every other screen reader in the process;
+        # capture_options are get_capture() arguments
+        self.capture = capture or get_capture(**(capture_options or {}))
         self.screen_map = {}
+        self.current_map = None
+        self.map_ttl = map_ttl
         self.last_analyzed = None
-        
+        # Tesseract only sees the rescaled, binarized text regions of a tile;
+        # ocr_options are TextPreprocessor settings
+        self.preprocessor = preprocessor or TextPreprocessor(**(ocr_options or {}))
+        self.ocr_fn = PreprocessedOCR(tesseract_data, self.preprocessor)
+        import pytesseract
+
+        # Changed tiles are OCR'd in parallel across worker processes
+        self.ocr_pool = OCRPool(self.ocr_fn, workers=ocr_workers,
+                                tesseract_cmd=pytesseract.pytesseract.tesseract_cmd)
+        # Only tiles that changed since the last call are OCR'd again
+        self.tile_ocr = TileOCR(self.ocr_fn, tile_size=tile_size, margin=margin,
+                                ocr_regions=self.ocr_pool.ocr_regions)
+
     def analyze_screen(self):
         """Capture and analyze screen content"""
-        screenshot = pyautogui.screenshot()
-        img_np = np.array(screenshot)
+        frame = self.capture.grab()
         
-        # Convert to grayscale for text detection
-        gray = cv2.cvtColor(img_np, cv2.COLOR_BGR2GRAY)
+        # Converted to grayscale once per frame, in the backend's channel order
+        gray = frame.gray()
         
-        # Extract text and clickable elements
-        data = pytesseract.image_to_data(gray, output_type=pytesseract.Output.DICT)
+        # Extract text and map screen elements with their locations
+        self.tile_ocr.analyze(gray)
+        self.current_map = ScreenMap.from_ocr_words(self.tile_ocr.words(), ttl=self.map_ttl)
+        self.screen_map = self.current_map.to_dict()
         
-        # Map screen elements with their locations
-        self.screen_map = {}
-        for i, text in enumerate(data['text']):
-            if text.strip():
-                x, y = data['left'][i], data['top'][i]
-                w, h = data['width'][i], data['height'][i]
-                self.screen_map[text.lower()] = {
-                    'position': (x + w//2, y + h//2),
-                    'bounds': (x, y, w, h),
-                    'confidence': data['conf'][i]
-                }
-        
-        self.last_analyzed = screenshot
+        self.last_analyzed = frame
         return self.screen_map
+
+    def get_map(self, max_age=None):
+        """Current ScreenMap, re-analyzing only when it has gone stale"""
+        max_age = self.map_ttl if max_age is None else max_age
+        if self.current_map is None or self.current_map.age >= max_age:
+            self.analyze_screen()
+        return self.current_map
+
+    def invalidate(self):
+        """Force the next lookup to look at the screen again (e.g. after a click)"""
+        self.current_map = None
+        self.capture.invalidate()
     
-    def find_element(self, target_text):
-        """Find specific element on screen"""
-        current_map = self.analyze_screen()
-        
-        # Try exact match first
-        target_text = target_text.lower()
-        if target_text in current_map:
-            return current_map[target_text]['position']
-        
-        # Try fuzzy matching
-        best_match = None
-        best_ratio = 0
-        for text, info in current_map.items():
-            ratio = self._similarity_ratio(target_text, text)
-            if ratio > 0.8 and ratio > best_ratio:
-                best_ratio = ratio
-                best_match = info['position']
-        
-        return best_match
-    
-    def _similarity_ratio(self, a, b):
-        """Calculate text similarity ratio"""
-        from difflib import SequenceMatcher
-        return SequenceMatcher(None, a, b).ratio()
\ No newline at end of file
+    def find_element(self, target_text, region=None):
+        """Find specific element (a word or phrase) on screen"""
+        element = self.get_map().find(target_text, region=region)
+        return element.position if element else None
+
+    def find_near(self, target_text, anchor_text, max_distance=None):
+        """Find target_text closest to anchor_text, e.g. the button near "Name" """
+        element = self.get_map().near(anchor_text, target_text, max_distance)
+        return element.position if element else None
+
+    def elements_in_region(self, region):
+        """Words inside an (x, y, w, h) screen region"""
+        return self.get_map().in_region(region)
\ No newline at end of file
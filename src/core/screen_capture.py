@@ -0,0 +1,239 @@
+import os
+import threading
+import time
+import numpy as np
+from .ocr_preprocess import to_gray
+
+
+class PyAutoGUISource:
+    """Primary screen through pyautogui (one PIL -> NumPy copy per capture)"""
+
+    order = "RGB"
+
+    def grab(self):
+        import pyautogui
+
+        return np.asarray(pyautogui.screenshot()), (0, 0)
+
+    def close(self):
+        pass
+
+
+class MSSSource:
+    """Screen through mss; frames are views of the shot's raw BGRA buffer, no copy"""
+
+    order = "BGR"
+
+    def __init__(self, monitor=1):
+        self.monitor = monitor
+        self._local = threading.local()  # mss handles are per thread
+
+    def grab(self):
+        sct = getattr(self._local, "sct", None)
+        if sct is None:
+            import mss
+
+            sct = self._local.sct = mss.mss()
+        monitor = sct.monitors[self.monitor]
+        shot = sct.grab(monitor)
+        # shot.bgra is bytes(shot.raw), a full copy; view the raw buffer instead
+        image = np.frombuffer(shot.raw, dtype=np.uint8).reshape(shot.height, shot.width, 4)
+        return image, (monitor["left"], monitor["top"])
+
+    def close(self):
+        sct = getattr(self._local, "sct", None)
+        if sct is not None:
+            sct.close()
+            self._local.sct = None
+
+
+class ArraySource:
+    """Serves frames from memory; stands in for the screen in headless tests.
+
+    Each grab returns the next frame and the last one is repeated once
+    they run out; set_frame() replaces what the "screen" shows.
+    """
+
+    def __init__(self, frames, order="RGB"):
+        frames = frames if isinstance(frames, (list, tuple)) else [frames]
+        self.frames = [np.asarray(frame) for frame in frames]
+        self.order = order
+        self.position = 0
+
+    def set_frame(self, frame):
+        self.frames = [np.asarray(frame)]
+        self.position = 0
+
+    def grab(self):
+        frame = self.frames[min(self.position, len(self.frames) - 1)]
+        self.position += 1
+        return frame, (0, 0)
+
+    def close(self):
+        pass
+
+
+class ImageFileSource(ArraySource):
+    """Serves an image file (.npy or anything Pillow opens), reloaded when it changes"""
+
+    def __init__(self, path, order="RGB"):
+        super().__init__([np.zeros((1, 1, 3), dtype=np.uint8)], order)
+        self.path = path
+        self.mtime = None
+
+    def grab(self):
+        mtime = os.path.getmtime(self.path)
+        if mtime != self.mtime:
+            if self.path.endswith(".npy"):
+                frame = np.load(self.path)
+            else:
+                from PIL import Image
+
+                with Image.open(self.path) as image:
+                    frame = np.asarray(image.convert("RGB"))
+            self.set_frame(frame)
+            self.mtime = mtime
+        return super().grab()
+
+
+def make_source(name="auto"):
+    """Capture backend by name: "mss", "pyautogui" or "auto" (mss when installed)"""
+    if name == "auto":
+        try:
+            import mss  # noqa: F401
+            name = "mss"
+        except ImportError:
+            name = "pyautogui"
+    if name == "mss":
+        return MSSSource()
+    if name == "pyautogui":
+        return PyAutoGUISource()
+    raise ValueError(f"Unknown capture backend: {name}")
+
+
+class Frame:
+    """A captured frame: a read-only array, its channel order, origin and time.
+
+    crop() returns views, never copies, and the grayscale image is
+    computed once per captured frame and sliced for every crop of it.
+    """
+
+    __slots__ = ("image", "order", "origin", "captured_at", "_gray", "_root", "_box")
+
+    def __init__(self, image, order="RGB", origin=(0, 0), captured_at=None, root=None,
+                 box=None):
+        self.image = image
+        self.order = order
+        self.origin = origin        # screen position of the top-left pixel
+        self.captured_at = captured_at if captured_at is not None else time.time()
+        self._gray = None
+        self._root = root           # full frame this is a crop of
+        self._box = box             # (x, y, w, h) of the crop in the root frame
+
+    @property
+    def age(self):
+        return time.time() - self.captured_at
+
+    @property
+    def shape(self):
+        return self.image.shape
+
+    @property
+    def region(self):
+        """(x, y, w, h) of the frame in screen coordinates"""
+        return (self.origin[0], self.origin[1], self.image.shape[1], self.image.shape[0])
+
+    def gray(self):
+        if self._gray is None:
+            if self._root is not None:
+                x, y, w, h = self._box
+                self._gray = self._root.gray()[y:y + h, x:x + w]
+            else:
+                self._gray = to_gray(self.image, self.order)
+                self._gray.flags.writeable = False
+        return self._gray
+
+    def crop(self, region):
+        """View of an (x, y, w, h) screen region, clipped to the frame"""
+        x, y, w, h = self._local_box(region)
+        root = self._root or self
+        offset = self._box[:2] if self._root is not None else (0, 0)
+        return Frame(self.image[y:y + h, x:x + w], self.order,
+                     (self.origin[0] + x, self.origin[1] + y), self.captured_at,
+                     root, (offset[0] + x, offset[1] + y, w, h))
+
+    def _local_box(self, region):
+        height, width = self.image.shape[:2]
+        x, y, w, h = region
+        left = min(max(x - self.origin[0], 0), width)
+        top = min(max(y - self.origin[1], 0), height)
+        right = min(max(x - self.origin[0] + w, left), width)
+        bottom = min(max(y - self.origin[1] + h, top), height)
+        return left, top, right - left, bottom - top
+
+
+class ScreenCapture:
+    """Single capture service shared by everything that looks at the screen.
+
+    The latest full frame is kept with its timestamp; requests within
+    `max_age` seconds of it are answered with views of that frame instead
+    of another screenshot. Concurrent callers wait for the capture in
+    progress rather than starting their own.
+    """
+
+    def __init__(self, source=None, max_age=0.2):
+        self.source = source or make_source()
+        self.max_age = max_age
+        self.frame = None
+        self.captures = 0
+        self.reused = 0
+        self.capture_time = 0.0
+        self._lock = threading.Lock()
+
+    def grab(self, region=None, max_age=None):
+        """Frame (or a region of it) no older than max_age seconds"""
+        max_age = self.max_age if max_age is None else max_age
+        with self._lock:
+            frame = self.frame
+            if frame is None or frame.age >= max_age:
+                started = time.perf_counter()
+                image, origin = self.source.grab()
+                image = image.view()
+                image.flags.writeable = False
+                frame = self.frame = Frame(image, self.source.order, origin)
+                self.captures += 1
+                self.capture_time += time.perf_counter() - started
+            else:
+                self.reused += 1
+        return frame if region is None else frame.crop(region)
+
+    def invalidate(self):
+        """Drop the held frame, e.g. after a click or a window change"""
+        with self._lock:
+            self.frame = None
+
+    def stats(self):
+        return {
+            "captures": self.captures,
+            "reused": self.reused,
+            "avg_capture_time": self.capture_time / self.captures if self.captures else 0.0
+        }
+
+    def close(self):
+        self.source.close()
+
+
+_capture = None
+_capture_lock = threading.Lock()
+
+
+def get_capture(backend="auto", max_age=0.2):
+    """Capture service shared by every screen reader in this process.
+
+    backend and max_age apply to the call that creates it.
+    """
+    global _capture
+    with _capture_lock:
+        if _capture is None:
+            _capture = ScreenCapture(make_source(backend), max_age)
+        return _capture
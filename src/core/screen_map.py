@@ -0,0 +1,262 @@
+import bisect
+import time
+from collections import defaultdict
+from difflib import SequenceMatcher, get_close_matches
+
+
+class ScreenElement:
+    __slots__ = ("text", "bounds", "confidence", "kind", "words")
+
+    def __init__(self, text, bounds, confidence, kind="word", words=None):
+        self.text = text
+        self.bounds = bounds          # (x, y, w, h) in screen pixels
+        self.confidence = confidence
+        self.kind = kind              # "word", "line" or "phrase"
+        self.words = words or []      # word elements making up a line/phrase
+
+    @property
+    def position(self):
+        x, y, w, h = self.bounds
+        return (x + w // 2, y + h // 2)
+
+    def to_dict(self):
+        return {
+            'position': self.position,
+            'bounds': self.bounds,
+            'confidence': self.confidence
+        }
+
+    def __repr__(self):
+        return f"ScreenElement({self.text!r}, {self.bounds})"
+
+
+def _union(elements):
+    left = min(e.bounds[0] for e in elements)
+    top = min(e.bounds[1] for e in elements)
+    right = max(e.bounds[0] + e.bounds[2] for e in elements)
+    bottom = max(e.bounds[1] + e.bounds[3] for e in elements)
+    return (left, top, right - left, bottom - top)
+
+
+def _intersects(bounds, region):
+    x, y, w, h = bounds
+    rx, ry, rw, rh = region
+    return x < rx + rw and rx < x + w and y < ry + rh and ry < y + h
+
+
+def group_lines(words, gap_factor=1.5, min_words=2):
+    """Group word elements into text lines.
+
+    Words join a line when their vertical centres are within half a word
+    height of it and the horizontal gap to the previous word is at most
+    gap_factor word heights. Lines shorter than min_words are left out.
+    """
+    lines = []
+    for word in sorted(words, key=lambda w: (w.position[1], w.bounds[0])):
+        cy = word.position[1]
+        height = max(word.bounds[3], 1)
+        for line in lines:
+            last = line[-1]
+            same_row = abs(last.position[1] - cy) <= max(last.bounds[3], height) / 2
+            gap = word.bounds[0] - (last.bounds[0] + last.bounds[2])
+            if same_row and -height <= gap <= gap_factor * height:
+                line.append(word)
+                break
+        else:
+            lines.append([word])
+    return [ScreenElement(" ".join(w.text for w in line), _union(line),
+                          min(float(w.confidence) for w in line), "line", line)
+            for line in lines if len(line) >= min_words]
+
+
+class ScreenMap:
+    """Snapshot of the text on screen with text and spatial indexes.
+
+    Words are grouped into lines so multi-word targets ("save as") can be
+    found, an inverted index over lowercase tokens answers exact, prefix
+    and fuzzy lookups without scanning every word, and a uniform grid
+    answers region and nearest-element queries. A map is `fresh` for `ttl`
+    seconds after capture.
+    """
+
+    def __init__(self, words=(), ttl=2.0, cell_size=128, captured_at=None):
+        self.ttl = ttl
+        self.cell_size = cell_size
+        self.captured_at = captured_at if captured_at is not None else time.time()
+        self.words = [w for w in words if w.text.strip()]
+        self.lines = group_lines(self.words)
+
+        self.tokens = defaultdict(list)   # lowercase token -> word indexes
+        for i, word in enumerate(self.words):
+            self.tokens[word.text.lower()].append(i)
+        self.vocabulary = sorted(self.tokens)
+
+        self.grid = defaultdict(list)     # (cell_x, cell_y) -> word indexes
+        for i, word in enumerate(self.words):
+            for cell in self._cells(word.bounds):
+                self.grid[cell].append(i)
+
+    @classmethod
+    def from_ocr_words(cls, words, **kwargs):
+        """Build from parse_ocr_data-style dicts"""
+        return cls([ScreenElement(w['text'], tuple(w['bounds']), w['confidence'])
+                    for w in words], **kwargs)
+
+    @property
+    def age(self):
+        return time.time() - self.captured_at
+
+    @property
+    def fresh(self):
+        return self.age < self.ttl
+
+    def __len__(self):
+        return len(self.words)
+
+    def find(self, text, region=None, fuzzy_cutoff=0.8):
+        """Best element for text: exact word/phrase, then prefix, then fuzzy"""
+        matches = self.find_all(text, region, fuzzy_cutoff)
+        return matches[0] if matches else None
+
+    def find_all(self, text, region=None, fuzzy_cutoff=0.8):
+        tokens = text.lower().split()
+        if not tokens:
+            return []
+        for lookup in (self._exact, self._prefix, self._fuzzy):
+            found = lookup(tokens, fuzzy_cutoff)
+            if region is not None:
+                found = [e for e in found if _intersects(e.bounds, region)]
+            if found:
+                return sorted(found, key=lambda e: -float(e.confidence))
+        return []
+
+    def in_region(self, region):
+        """Words overlapping an (x, y, w, h) region, in reading order"""
+        seen = set()
+        for cell in self._cells(region):
+            seen.update(self.grid.get(cell, ()))
+        words = [self.words[i] for i in seen if _intersects(self.words[i].bounds, region)]
+        return sorted(words, key=lambda w: (w.bounds[1], w.bounds[0]))
+
+    def nearest(self, point, max_distance=None, predicate=None):
+        """Closest word to a point, searching outward ring by ring in the grid"""
+        px, py = point
+        cx, cy = px // self.cell_size, py // self.cell_size
+        limit = self._max_ring(cx, cy) if max_distance is None else max_distance // self.cell_size + 1
+        best, best_distance = None, None
+        for ring in range(limit + 1):
+            for cell in self._ring(cx, cy, ring):
+                for i in self.grid.get(cell, ()):
+                    word = self.words[i]
+                    if predicate is not None and not predicate(word):
+                        continue
+                    distance = self._distance(word.bounds, px, py)
+                    if best_distance is None or distance < best_distance:
+                        best, best_distance = word, distance
+            # Anything in further rings is at least ring * cell_size away
+            if best is not None and best_distance <= ring * self.cell_size:
+                break
+        if best is not None and max_distance is not None and best_distance > max_distance:
+            return None
+        return best
+
+    def near(self, anchor_text, target_text=None, max_distance=None):
+        """Element closest to the anchor text, optionally matching target_text"""
+        anchor = self.find(anchor_text)
+        if anchor is None:
+            return None
+        anchor_words = set(map(id, anchor.words or [anchor]))
+        if target_text is None:
+            return self.nearest(anchor.position, max_distance,
+                                lambda w: id(w) not in anchor_words)
+
+        px, py = anchor.position
+        candidates = [(self._distance(e.bounds, px, py), i, e)
+                      for i, e in enumerate(self.find_all(target_text))
+                      if not anchor_words & set(map(id, e.words or [e]))]
+        if not candidates:
+            return None
+        distance, _, element = min(candidates)
+        if max_distance is not None and distance > max_distance:
+            return None
+        return element
+
+    def to_dict(self, region=None):
+        """Legacy {text: element} map; the most confident reading wins"""
+        merged = {}
+        elements = self.words + self.lines
+        if region is not None:
+            elements = [e for e in elements if _intersects(e.bounds, region)]
+        for element in elements:
+            key = element.text.lower()
+            current = merged.get(key)
+            if current is None or float(element.confidence) > float(current['confidence']):
+                merged[key] = element.to_dict()
+        return merged
+
+    def _exact(self, tokens, cutoff):
+        if len(tokens) == 1:
+            return [self.words[i] for i in self.tokens.get(tokens[0], ())]
+        return self._phrases(tokens, lambda word, token: word == token)
+
+    def _prefix(self, tokens, cutoff):
+        if len(tokens) == 1:
+            start = bisect.bisect_left(self.vocabulary, tokens[0])
+            found = []
+            for token in self.vocabulary[start:]:
+                if not token.startswith(tokens[0]):
+                    break
+                found.extend(self.words[i] for i in self.tokens[token])
+            return found
+        # A phrase whose last word is still being typed/spoken
+        return self._phrases(tokens, lambda word, token, last=tokens[-1]:
+                             word == token or (token == last and word.startswith(token)))
+
+    def _fuzzy(self, tokens, cutoff):
+        if len(tokens) == 1:
+            close = get_close_matches(tokens[0], self.vocabulary, n=5, cutoff=cutoff)
+            return [self.words[i] for token in close for i in self.tokens[token]]
+        return self._phrases(tokens, lambda word, token:
+                             SequenceMatcher(None, word, token).ratio() >= cutoff)
+
+    def _phrases(self, tokens, same):
+        """Runs of consecutive words on one line matching tokens"""
+        found = []
+        for line in self.lines:
+            words = [w.text.lower() for w in line.words]
+            for start in range(len(words) - len(tokens) + 1):
+                if all(same(words[start + k], token) for k, token in enumerate(tokens)):
+                    run = line.words[start:start + len(tokens)]
+                    found.append(ScreenElement(" ".join(w.text for w in run), _union(run),
+                                               min(float(w.confidence) for w in run),
+                                               "phrase", run))
+        return found
+
+    def _cells(self, bounds):
+        x, y, w, h = bounds
+        size = self.cell_size
+        for cx in range(x // size, (x + max(w, 1) - 1) // size + 1):
+            for cy in range(y // size, (y + max(h, 1) - 1) // size + 1):
+                yield (cx, cy)
+
+    def _ring(self, cx, cy, ring):
+        if ring == 0:
+            yield (cx, cy)
+            return
+        for dx in range(-ring, ring + 1):
+            yield (cx + dx, cy - ring)
+            yield (cx + dx, cy + ring)
+        for dy in range(-ring + 1, ring):
+            yield (cx - ring, cy + dy)
+            yield (cx + ring, cy + dy)
+
+    def _max_ring(self, cx, cy):
+        """Ring that reaches the farthest occupied cell"""
+        return max((max(abs(x - cx), abs(y - cy)) for x, y in self.grid), default=0)
+
+    def _distance(self, bounds, px, py):
+        """Distance from a point to the nearest edge of a box (0 inside)"""
+        x, y, w, h = bounds
+        dx = max(x - px, 0, px - (x + w))
+        dy = max(y - py, 0, py - (y + h))
+        return (dx * dx + dy * dy) ** 0.5
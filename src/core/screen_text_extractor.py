@@ -1,19 +1,40 @@
 import pytesseract
-import pyautogui
-from PIL import Image
-import numpy as np
-import cv2
+from .ocr_pool import OCRPool, tesseract_data
+from .ocr_preprocess import PreprocessedOCR, TextPreprocessor
+from .screen_capture import get_capture
+from .screen_map import ScreenElement, group_lines
 
 # Configure Tesseract path
 pytesseract.pytesseract.tesseract_cmd = r'C:\Program Files\Tesseract-OCR\tesseract.exe'
 
+_pool = None
+
+def get_ocr_pool(ocr_options=None):
+    """Process pool shared by every extraction in this process.
+
+    ocr_options (TextPreprocessor settings) apply to the call that creates it.
+    """
+    global _pool
+    if _pool is None:
+        preprocessor = TextPreprocessor(**(ocr_options or {}))
+        _pool = OCRPool(PreprocessedOCR(tesseract_data, preprocessor),
+                        tesseract_cmd=pytesseract.pytesseract.tesseract_cmd)
+    return _pool
+
+def words_to_text(words):
+    """Rebuild text lines from word boxes in reading order"""
+    elements = [ScreenElement(w['text'], w['bounds'], w['confidence']) for w in words]
+    lines = group_lines(elements, gap_factor=float("inf"), min_words=1)
+    lines.sort(key=lambda line: (line.bounds[1], line.bounds[0]))
+    return "\n".join(line.text for line in lines)
+
 def extract_text(region=None):
     """Extract text from screen or specific region"""
     try:
-        screenshot = pyautogui.screenshot(region=region)
-        image_np = np.array(screenshot)
-        gray = cv2.cvtColor(image_np, cv2.COLOR_BGR2GRAY)
-        text = pytesseract.image_to_string(gray)
+        # A view of the shared frame; captured again only when it is stale
+        gray = get_capture().grab(region).gray()
+        # Large captures are read as parallel bands
+        text = words_to_text(get_ocr_pool().recognize(gray))
         return text.strip()
     except Exception as e:
         print(f"Error extracting text: {str(e)}")
@@ -22,14 +43,10 @@ def extract_text(region=None):
 def get_screen_elements():
     """Get clickable elements on screen"""
     try:
-        screenshot = pyautogui.screenshot()
-        image_np = np.array(screenshot)
-        data = pytesseract.image_to_data(image_np, output_type=pytesseract.Output.DICT)
+        gray = get_capture().grab().gray()
         elements = {}
-        for i, text in enumerate(data['text']):
-            if text.strip():
-                x, y = data['left'][i], data['top'][i]
-                elements[text] = (x, y)
+        for word in get_ocr_pool().recognize(gray):
+            elements[word['text']] = word['bounds'][:2]
         return elements
     except Exception as e:
         print(f"Error getting elements: {str(e)}")
@@ -0,0 +1,135 @@
+import queue
+import re
+import threading
+import time
+
+# End of sentence: terminal punctuation (plus closing quotes/brackets) then whitespace
+_SENTENCE_END = re.compile(r"[.!?]+[\"')\]]*\s+")
+_CLAUSE_END = re.compile(r"[,;:]\s+")
+_DONE = object()
+
+
+class SentenceSegmenter:
+    """Split a token stream into speakable sentences and long clauses"""
+
+    def __init__(self, min_clause_chars=40, max_chars=200):
+        self.min_clause_chars = min_clause_chars
+        self.max_chars = max_chars
+        self.buffer = ""
+
+    def feed(self, text):
+        """Add streamed text; returns the segments completed so far"""
+        self.buffer += text
+        segments = []
+        while True:
+            segment = self._next_segment()
+            if segment is None:
+                return segments
+            if segment:
+                segments.append(segment)
+
+    def flush(self):
+        """Return whatever is left once the stream ends"""
+        rest, self.buffer = self.buffer.strip(), ""
+        return [rest] if rest else []
+
+    def _next_segment(self):
+        match = _SENTENCE_END.search(self.buffer)
+        if match is None and len(self.buffer) >= self.min_clause_chars:
+            # Speak long clauses early rather than waiting for a full stop
+            clauses = list(_CLAUSE_END.finditer(self.buffer))
+            match = clauses[-1] if clauses else None
+        if match is not None:
+            end = match.end()
+        elif len(self.buffer) > self.max_chars:
+            end = self.buffer.rfind(" ", 0, self.max_chars) + 1 or self.max_chars
+        else:
+            return None
+        segment, self.buffer = self.buffer[:end].strip(), self.buffer[end:]
+        return segment
+
+
+def segment_stream(tokens, segmenter=None):
+    """Turn an iterable of text tokens into an iterable of segments"""
+    segmenter = segmenter or SentenceSegmenter()
+    for token in tokens:
+        for segment in segmenter.feed(token):
+            yield segment
+    for segment in segmenter.flush():
+        yield segment
+
+
+def prefetch(items):
+    """Start producing items on a background thread; returns an iterator of them.
+
+    Work behind the iterator (e.g. a model generating) begins now rather
+    than when the consumer first asks for an item. Errors are re-raised
+    in the consumer.
+    """
+    pending = queue.Queue()
+
+    def produce():
+        try:
+            for item in items:
+                pending.put((item, None))
+        except Exception as e:
+            pending.put((None, e))
+        finally:
+            pending.put((_DONE, None))
+
+    threading.Thread(target=produce, name="prefetch", daemon=True).start()
+
+    def consume():
+        while True:
+            item, error = pending.get()
+            if error is not None:
+                raise error
+            if item is _DONE:
+                return
+            yield item
+
+    return consume()
+
+
+def stream_to_speech(segments, speak_fn, started_at=None):
+    """Speak segments as they arrive while the producer keeps generating.
+
+    The segment iterator is drained on a background thread so generation
+    overlaps with playback. Returns the full text and timing metrics,
+    including time to first audio.
+    """
+    started_at = started_at or time.perf_counter()
+    pending = queue.Queue()
+
+    def produce():
+        try:
+            for segment in segments:
+                pending.put(segment)
+        except Exception as e:
+            print(f"Streaming error: {e}")
+            pending.put("I encountered an error. Please try again.")
+        finally:
+            pending.put(_DONE)
+
+    producer = threading.Thread(target=produce, daemon=True)
+    producer.start()
+
+    spoken = []
+    first_audio = None
+    while True:
+        segment = pending.get()
+        if segment is _DONE:
+            break
+        if first_audio is None:
+            first_audio = time.perf_counter()
+        speak_fn(segment)
+        spoken.append(segment)
+    producer.join()
+
+    finished = time.perf_counter()
+    metrics = {
+        "time_to_first_audio": first_audio - started_at if first_audio else None,
+        "total_time": finished - started_at,
+        "segments": len(spoken)
+    }
+    return " ".join(spoken), metrics
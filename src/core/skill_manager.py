@@ -1,10 +1,13 @@
 import os
-import json
 import importlib.util
 from datetime import datetime
+from .storage import get_store
+from .keyword_matcher import KeywordMatcher
 
 class SkillManager:
-    def __init__(self):
+    def __init__(self, store=None, matcher=None):
+        self.store = store or get_store()
+        self.matcher = matcher or KeywordMatcher()
         self.skills = {}
         self.learned_skills = {}
         self.skill_patterns = {}
@@ -37,46 +40,55 @@ class SkillManager:
                 "handler": self._file_operation_skill
             }
         })
+        for name, skill in self.skills.items():
+            self.matcher.add_many(skill["patterns"], "skill", name)
 
     def _load_learned_skills(self):
         """Load learned skills from storage"""
         try:
-            with open("data/skills/learned_skills.json", "r") as f:
-                self.learned_skills = json.load(f)
-        except FileNotFoundError:
+            self.learned_skills = self.store.get_skills()
+        except Exception as e:
+            print(f"Error loading learned skills: {e}")
             self.learned_skills = {}
+        for name, skill in self.learned_skills.items():
+            self.matcher.add_many(self._learned_patterns(skill), "learned_skill", name)
+
+    def _learned_patterns(self, skill):
+        # Older skill files stored the pattern list directly
+        return skill["patterns"] if isinstance(skill, dict) else skill
+
+    def route(self, command):
+        """Return (kind, skill name) for the command, or None"""
+        result = self.matcher.match(command)
+        for kind in ("skill", "learned_skill"):
+            name = result.first(kind)
+            if name is not None:
+                return kind, name
+        return None
 
     def has_skill_for(self, command):
         """Check if a skill exists for the command"""
-        command = command.lower()
-        
-        # Check built-in skills
-        for skill in self.skills.values():
-            if any(pattern in command for pattern in skill["patterns"]):
-                return True
-                
-        # Check learned skills
-        for patterns in self.learned_skills.values():
-            if any(pattern in command for pattern in patterns):
-                return True
-                
-        return False
+        return self.route(command) is not None
 
     def execute_skill(self, command):
         """Execute appropriate skill for command"""
+        route = self.route(command)
+        if route is None:
+            return "No skill found for this command"
+
+        kind, skill_name = route
         command = command.lower()
-        
-        # Try built-in skills
-        for skill_name, skill in self.skills.items():
-            if any(pattern in command for pattern in skill["patterns"]):
-                return skill["handler"](command)
-                
-        # Try learned skills
-        for skill_name, patterns in self.learned_skills.items():
-            if any(pattern in command for pattern in patterns):
-                return self._execute_learned_skill(skill_name, command)
-                
-        return "No skill found for this command"
+        if kind == "skill":
+            return self.skills[skill_name]["handler"](command)
+        return self._execute_learned_skill(skill_name, command)
+
+    def _execute_learned_skill(self, skill_name, command):
+        """Run the actions recorded for a learned skill"""
+        skill = self.learned_skills.get(skill_name)
+        actions = skill.get("actions") if isinstance(skill, dict) else None
+        if isinstance(actions, dict) and "response" in actions:
+            return actions["response"]
+        return f"Executing learned skill: {skill_name}"
 
     def _system_control_skill(self, command):
         """Built-in system control skill"""
@@ -121,14 +133,18 @@ class SkillManager:
 
     def learn_new_skill(self, name, patterns, actions):
         """Learn a new skill from user interaction"""
+        if name in self.learned_skills:
+            self.matcher.discard("learned_skill", name)
+        self.matcher.add_many(patterns, "learned_skill", name)
         self.learned_skills[name] = {
             "patterns": patterns,
             "actions": actions,
             "learned_at": datetime.now().isoformat()
         }
-        self.save_learned_skills()
+        self.store.save_skill(name, self.learned_skills[name])
 
     def save_learned_skills(self):
         """Save learned skills to storage"""
-        with open("data/skills/learned_skills.json", "w") as f:
-            json.dump(self.learned_skills, f, indent=2)
\ No newline at end of file
+        for name, skill in self.learned_skills.items():
+            self.store.save_skill(name, skill)
+        self.store.flush()
\ No newline at end of file
@@ -0,0 +1,76 @@
+import json
+import os
+import tempfile
+import threading
+import time
+
+
+def atomic_write_json(path, data):
+    """Write JSON to a temp file in the same directory and rename it over path"""
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-", suffix=".json")
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(data, f, separators=(",", ":"))
+        os.replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+class SnapshotWriter:
+    """Debounced, coalescing snapshot writer.
+
+    mark_dirty() is cheap and may be called on every change; the snapshot
+    callback is serialized at most once per interval on a timer thread, or
+    immediately by flush().
+    """
+
+    def __init__(self, path, snapshot_fn, interval=5.0):
+        self.path = path
+        self.snapshot_fn = snapshot_fn
+        self.interval = interval
+        self.writes = 0
+        self._dirty = False
+        self._last_write = 0.0
+        self._timer = None
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+
+    def mark_dirty(self):
+        """Schedule a snapshot if one is not already pending"""
+        with self._lock:
+            self._dirty = True
+            if self._timer is not None:
+                return
+            delay = max(0.0, self.interval - (time.time() - self._last_write))
+            self._timer = threading.Timer(delay, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def flush(self):
+        """Write the snapshot now if anything changed"""
+        with self._write_lock:
+            with self._lock:
+                if self._timer is not None:
+                    self._timer.cancel()
+                    self._timer = None
+                if not self._dirty:
+                    return False
+                self._dirty = False
+                self._last_write = time.time()
+            try:
+                atomic_write_json(self.path, self.snapshot_fn())
+                self.writes += 1
+                return True
+            except Exception as e:
+                print(f"Error writing snapshot {self.path}: {e}")
+                with self._lock:
+                    self._dirty = True
+                return False
+
+    @property
+    def pending(self):
+        return self._dirty
@@ -6,11 +6,33 @@ import os
 # Adding the project root to sys.path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
 from src.config.settings import Config
+from src.core.audio_stream import AudioCapture, MicrophoneSource, NoiseFloorEstimator
+from src.core.recognizer_engines import EnginePool, GoogleEngine, SphinxEngine
+from src.core.voice_gate import VoiceActivityDetector, VoiceGate, WakeWordSpotter
 
 class VoiceRecognizer:
-    def __init__(self):
+    def __init__(self, source=None, engines=None, gate=None):
         self.recognizer = sr.Recognizer()
+        self.source = source
+        self.audio = None
+        # Called from the capture thread as soon as the user starts talking
+        self.on_speech_start = None
+        # Called with a phrase's (start, end) wall-clock times; phrases it
+        # returns True for, e.g. the assistant's own voice, are dropped
+        self.ignore_phrase = None
         self.setup_recognizer()
+        self.gate = gate or VoiceGate(
+            VoiceActivityDetector(Config.AUDIO_SAMPLE_RATE, min_energy=Config.AUDIO_MIN_ENERGY),
+            WakeWordSpotter.from_directory(Config.WAKE_WORD_TEMPLATE_DIR, Config.AUDIO_SAMPLE_RATE,
+                                           Config.WAKE_WORD_THRESHOLD)
+        )
+        self.engines = EnginePool(
+            engines or [GoogleEngine(self.recognizer), SphinxEngine(self.recognizer)],
+            mode=Config.RECOGNIZER_MODE,
+            deadline=Config.RECOGNIZER_DEADLINE,
+            min_confidence=Config.RECOGNIZER_MIN_CONFIDENCE,
+            hedge_delay=Config.RECOGNIZER_HEDGE_DELAY
+        )
         
     def setup_recognizer(self):
         """Configure the recognizer for better accuracy"""
@@ -22,40 +44,78 @@ class VoiceRecognizer:
         
     def listen(self):
         """Listen for voice input with improved error handling"""
-        with sr.Microphone() as source:
+        audio = self.capture()
+        if audio is None:
+            return None
+        return self.recognize(audio)
+
+    def start_capture(self):
+        """Open the input stream once; it keeps calibrating in the background"""
+        if self.audio is None:
+            source = self.source or MicrophoneSource(
+                Config.AUDIO_SAMPLE_RATE,
+                Config.AUDIO_SAMPLE_RATE * Config.AUDIO_FRAME_MS // 1000
+            )
+            self.audio = AudioCapture(
+                source,
+                buffer_seconds=Config.AUDIO_BUFFER_SECONDS,
+                pre_roll=Config.AUDIO_PRE_ROLL,
+                pause_threshold=self.recognizer.pause_threshold,
+                phrase_threshold=self.recognizer.phrase_threshold,
+                phrase_time_limit=15.0,
+                noise=NoiseFloorEstimator(min_threshold=Config.AUDIO_MIN_ENERGY),
+                on_speech_start=self._speech_started
+            )
+        self.audio.start()
+        return self.audio
+
+    def _speech_started(self):
+        if self.on_speech_start is not None:
+            self.on_speech_start()
+
+    def stop_capture(self):
+        if self.audio is not None:
+            self.audio.stop()
+            self.audio = None
+        self.engines.close()
+
+    def capture(self, passive=False):
+        """Take the next phrase cut from the live input stream.
+
+        Phrases without speech, or without the wake word while passive, are
+        dropped here so they never reach the recognizer engines.
+        """
+        try:
+            audio = self.start_capture()
             print("Listening...")
-            try:
-                # Adjust for ambient noise before each listen
-                self.recognizer.adjust_for_ambient_noise(source, duration=0.5)
-                
-                # Get audio input
-                audio = self.recognizer.listen(source, 
-                                             timeout=5.0,
-                                             phrase_time_limit=15.0)
-                
-                print("Processing...")
-                
-                # Try multiple recognition services
-                try:
-                    # Try Google's recognizer first
-                    text = self.recognizer.recognize_google(audio)
-                except:
-                    try:
-                        # Fallback to Sphinx (offline)
-                        text = self.recognizer.recognize_sphinx(audio)
-                    except:
-                        print("Could not understand audio")
-                        return None
-                
-                print(f"Recognized: {text}")
-                return text
-                
-            except sr.WaitTimeoutError:
+            phrase = audio.get_phrase(timeout=5.0)
+            if phrase is None:
                 print("Listening timed out. Please try again.")
                 return None
-            except sr.RequestError as e:
-                print(f"Could not request results; {e}")
+            if (self.ignore_phrase is not None
+                    and self.ignore_phrase(phrase.captured_at - phrase.duration,
+                                           phrase.captured_at)):
                 return None
-            except Exception as e:
-                print(f"Error in speech recognition: {e}")
-                return None
\ No newline at end of file
+            if not self.gate.admit(phrase.samples, passive):
+                return None
+            return sr.AudioData(phrase.samples.tobytes(), phrase.sample_rate, 2)
+        except Exception as e:
+            print(f"Error in speech recognition: {e}")
+            return None
+
+    def recognize(self, audio):
+        """Convert captured audio to text"""
+        print("Processing...")
+        try:
+            # Engines run side by side; the pool keeps the winning transcript
+            result = self.engines.recognize(audio)
+            if result is None:
+                print("Could not understand audio")
+                return None
+
+            print(f"Recognized: {result.text}")
+            return result.text
+
+        except Exception as e:
+            print(f"Error in speech recognition: {e}")
+            return None
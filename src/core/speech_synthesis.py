@@ -1,9 +1,39 @@
+import threading
+import time
+from collections import OrderedDict
 import pyttsx3
+from .sentence_stream import stream_to_speech
+from .audio_cache import AudioCache, play_wav
+from .speech_worker import NORMAL, SpeechWorker
 
 class VoiceSynthesizer:
-    def __init__(self):
+    def __init__(self, cache_dir=None, cache_max_bytes=64 * 1024 * 1024, player=play_wav):
         self.engine = pyttsx3.init()
         self._configure_voice()
+        self.last_stream_metrics = None
+        # pyttsx3 engines are not thread-safe, and pyttsx3.init() hands out
+        # one engine per driver, so rendering shares this one. Renders only
+        # start while the worker is idle (see _render)
+        self._engine_lock = threading.Lock()
+        # What the engine is doing ("speak", "render" or None), so stopping
+        # live speech never aborts a render instead
+        self._engine_use = None
+        self._engine_use_lock = threading.Lock()
+        self.cache = AudioCache(cache_dir, cache_max_bytes) if cache_dir else None
+        self.player = player
+        self._spoken = OrderedDict()  # recently spoken cache keys
+        self._rendering = set()  # keys being rendered in the background
+        self._spoken_lock = threading.Lock()
+        self._stop = threading.Event()
+        # Speech is queued to a worker so callers never wait on playback
+        self.worker = SpeechWorker(self.speak, stop_fn=self.stop_speaking)
+
+    @property
+    def speaking(self):
+        return self.worker.speaking
+
+    def spoke_during(self, start, end):
+        return self.worker.spoke_during(start, end)
         
     def _configure_voice(self):
         """Configure voice properties for natural speech"""
@@ -13,15 +43,170 @@ class VoiceSynthesizer:
         self.engine.setProperty('rate', 175)  # Slightly slower for clarity
         self.engine.setProperty('volume', 0.9)  # Slightly lower volume
         
+    def say(self, text, priority=NORMAL):
+        """Queue text on the speech worker; returns a Future"""
+        return self.worker.say(text, priority)
+
+    def interrupt(self):
+        """Stop talking and drop queued speech, e.g. when the user talks"""
+        self.worker.interrupt()
+
+    def stop_speaking(self):
+        """Cut the sentence currently playing short"""
+        self._stop.set()
+        with self._engine_use_lock:
+            if self._engine_use != "speak":
+                return
+            try:
+                self.engine.stop()
+            except Exception as e:
+                print(f"Speech stop error: {str(e)}")
+
     def speak(self, text):
+        """Speak text on the calling thread, blocking until done"""
         try:
+            self._stop.clear()
             # Add speech marks for more natural pauses
             processed_text = self._process_text_for_speech(text)
-            self.engine.say(processed_text)
-            self.engine.runAndWait()
+            render_key = None
+            if self.cache is not None:
+                path, render_key = self._cached_audio(processed_text)
+                if path is not None:
+                    # Play the rendered audio without touching the engine
+                    self.player(path, self._stop)
+                    return
+            try:
+                with self._engine_lock:
+                    self._use_engine("speak")
+                    try:
+                        self.engine.say(processed_text)
+                        self.engine.runAndWait()
+                    finally:
+                        self._use_engine(None)
+            finally:
+                if render_key is not None:
+                    # Rendered in the background once the worker is idle
+                    threading.Thread(target=self._render_in_background,
+                                     args=(render_key, processed_text),
+                                     name="tts-render", daemon=True).start()
         except Exception as e:
             print(f"Speech synthesis error: {str(e)}")
 
+    def prerender(self, phrases):
+        """Render fixed phrases into the audio cache on a background thread"""
+        if self.cache is None:
+            return None
+        thread = threading.Thread(target=self._prerender, args=(list(phrases),),
+                                  name="tts-prerender", daemon=True)
+        thread.start()
+        return thread
+
+    def _prerender(self, phrases):
+        for text in phrases:
+            try:
+                processed_text = self._process_text_for_speech(text)
+                key = self._cache_key(processed_text)
+                if key not in self.cache:
+                    self._render(key, processed_text)
+            except Exception as e:
+                print(f"Pre-render error: {str(e)}")
+
+    def _cached_audio(self, processed_text):
+        """(cached audio path, key to render or None).
+
+        Text spoken before is not rendered synchronously on its repeat:
+        the caller speaks it live and then renders the returned key in the
+        background, so later repeats play from the cache.
+        """
+        key = self._cache_key(processed_text)
+        path = self.cache.get(key)
+        with self._spoken_lock:
+            render = path is None and key in self._spoken and key not in self._rendering
+            if render:
+                self._rendering.add(key)
+            self._spoken[key] = True
+            self._spoken.move_to_end(key)
+            if len(self._spoken) > 1024:
+                self._spoken.popitem(last=False)
+        return path, key if render else None
+
+    def _render_in_background(self, key, processed_text):
+        try:
+            self._render(key, processed_text)
+        except Exception as e:
+            print(f"Render error: {str(e)}")
+        finally:
+            with self._spoken_lock:
+                self._rendering.discard(key)
+
+    def _render(self, key, processed_text, poll=0.1):
+        """Render into the cache once no speech is playing or queued.
+
+        Called from background threads. The worker is checked again with
+        the engine held, so at most a say() queued during this one render
+        waits for it.
+        """
+        def save(path):
+            while True:
+                while not self._idle():
+                    time.sleep(poll)
+                with self._engine_lock:
+                    if not self._idle():
+                        continue
+                    self._use_engine("render")
+                    try:
+                        self.engine.save_to_file(processed_text, path)
+                        self.engine.runAndWait()
+                    finally:
+                        self._use_engine(None)
+                    return
+        return self.cache.render(key, save)
+
+    def _idle(self):
+        return not self.worker.speaking and self.worker.queue.empty()
+
+    def _use_engine(self, use):
+        with self._engine_use_lock:
+            self._engine_use = use
+
+    def _cache_key(self, processed_text):
+        return AudioCache.make_key(
+            processed_text,
+            self.engine.getProperty('voice'),
+            self.engine.getProperty('rate'),
+            self.engine.getProperty('volume')
+        )
+
+    def speak_stream(self, segments, started_at=None, on_first_audio=None):
+        """Queue each segment as soon as it is produced; returns the full text.
+
+        Segments produced after an interruption are not spoken. Time to
+        first audio is taken when the worker starts playing the first
+        segment, which may be after this returns; it is then filled into
+        last_stream_metrics and passed to on_first_audio.
+        """
+        started_at = started_at or time.perf_counter()
+        generation = self.worker.generation
+        metrics = {"time_to_first_audio": None}
+        queued = []
+
+        def first_audio():
+            metrics["time_to_first_audio"] = time.perf_counter() - started_at
+            if on_first_audio is not None:
+                on_first_audio(metrics["time_to_first_audio"])
+
+        def queue_segment(segment):
+            if self.worker.generation == generation:
+                self.worker.say(segment, NORMAL, None if queued else first_audio)
+                queued.append(segment)
+
+        text, stream_metrics = stream_to_speech(segments, queue_segment, started_at)
+        # stream_to_speech timed the hand-off to the worker, not the audio
+        metrics["time_to_first_segment"] = stream_metrics.pop("time_to_first_audio")
+        metrics.update(stream_metrics)
+        self.last_stream_metrics = metrics
+        return text
+
     def _process_text_for_speech(self, text):
         """Add processing for more natural speech patterns"""
         # Add pauses at punctuation
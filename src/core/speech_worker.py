@@ -0,0 +1,184 @@
+import itertools
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from .sentence_stream import segment_stream
+
+URGENT = 0
+NORMAL = 1
+LOW = 2
+
+
+class SpeechRequest:
+    __slots__ = ("priority", "seq", "text", "future", "enqueued_at", "generation", "on_start")
+
+    def __init__(self, priority, seq, text, generation, on_start=None):
+        self.priority = priority
+        self.seq = seq
+        self.text = text
+        self.future = Future()
+        self.enqueued_at = time.perf_counter()
+        self.generation = generation
+        self.on_start = on_start  # called when its audio starts
+
+    def __lt__(self, other):
+        return (self.priority, self.seq) < (other.priority, other.seq)
+
+
+class SpeechWorker:
+    """Speaks queued text on a dedicated thread.
+
+    say() returns a Future right away; it resolves to True once the text
+    has been spoken and False if it was interrupted or dropped. Text is
+    split into sentences so playback starts with the first one and an
+    interruption takes effect at the next sentence boundary (or sooner
+    if a stop_fn is given that can cut the current sentence short).
+    """
+
+    def __init__(self, speak_fn, stop_fn=None):
+        self.speak_fn = speak_fn
+        self.stop_fn = stop_fn
+        self.queue = queue.PriorityQueue()
+        self.generation = 0
+        self.requests = 0
+        self.started = 0
+        self.completed = 0
+        self.interrupted = 0
+        self.chunks = 0
+        self.speaking_time = 0.0
+        self.queue_latency_total = 0.0
+        self.queue_latency_max = 0.0
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+        self._speaking = threading.Event()
+        # (started, ended) wall-clock times of recently played chunks
+        self._played = deque(maxlen=64)
+        self._playing_since = None
+        self._running = threading.Event()
+        self._thread = None
+
+    @property
+    def speaking(self):
+        return self._speaking.is_set()
+
+    def spoke_during(self, start, end):
+        """True if audio played at any time between start and end (time.time())"""
+        playing_since = self._playing_since
+        if playing_since is not None and playing_since <= end:
+            return True
+        return any(started <= end and ended >= start for started, ended in list(self._played))
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._running.set()
+        self._thread = threading.Thread(target=self._run, name="speech-worker", daemon=True)
+        self._thread.start()
+
+    def say(self, text, priority=NORMAL, on_start=None):
+        """Queue text for speaking; returns a Future.
+
+        on_start, if given, is called just before the text starts playing.
+        """
+        self.start()
+        with self._lock:
+            request = SpeechRequest(priority, next(self._seq), text, self.generation, on_start)
+            self.requests += 1
+        self.queue.put(request)
+        return request.future
+
+    def interrupt(self):
+        """Barge-in: stop the current utterance and drop everything queued"""
+        with self._lock:
+            self.generation += 1
+        while True:
+            try:
+                request = self.queue.get_nowait()
+            except queue.Empty:
+                break
+            self._finish(request, False)
+            self.queue.task_done()
+        if self.stop_fn is not None and self.speaking:
+            self.stop_fn()
+
+    def wait(self, timeout=None):
+        """Block until the queue is empty and nothing is being spoken"""
+        deadline = None if timeout is None else time.time() + timeout
+        while self.queue.unfinished_tasks:
+            if deadline is not None and time.time() >= deadline:
+                return False
+            time.sleep(0.01)
+        return True
+
+    def stop(self, timeout=1.0):
+        self._running.clear()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def metrics(self):
+        return {
+            "queue_depth": self.queue.qsize(),
+            "requests": self.requests,
+            "completed": self.completed,
+            "interrupted": self.interrupted,
+            "chunks": self.chunks,
+            "speaking_time": self.speaking_time,
+            "avg_queue_latency": (self.queue_latency_total / self.started
+                                  if self.started else 0.0),
+            "max_queue_latency": self.queue_latency_max
+        }
+
+    def _run(self):
+        while self._running.is_set():
+            try:
+                request = self.queue.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            try:
+                self._speak(request)
+            finally:
+                self.queue.task_done()
+
+    def _speak(self, request):
+        if not request.future.set_running_or_notify_cancel():
+            self.interrupted += 1
+            return
+        latency = time.perf_counter() - request.enqueued_at
+        self.started += 1
+        self.queue_latency_total += latency
+        self.queue_latency_max = max(self.queue_latency_max, latency)
+
+        for chunk in segment_stream([request.text]):
+            if request.generation != self.generation:
+                break
+            self._playing_since = time.time()
+            self._speaking.set()
+            if request.on_start is not None:
+                on_start, request.on_start = request.on_start, None
+                try:
+                    on_start()
+                except Exception as e:
+                    print(f"Speech worker error: {e}")
+            started = time.perf_counter()
+            try:
+                self.speak_fn(chunk)
+            except Exception as e:
+                print(f"Speech worker error: {e}")
+            finally:
+                self.speaking_time += time.perf_counter() - started
+                self._played.append((self._playing_since, time.time()))
+                self._playing_since = None
+                self._speaking.clear()
+            self.chunks += 1
+        self._finish(request, request.generation == self.generation)
+
+    def _finish(self, request, spoken):
+        if spoken:
+            self.completed += 1
+        else:
+            self.interrupted += 1
+        future = request.future
+        if future.running() or future.set_running_or_notify_cancel():
+            future.set_result(spoken)
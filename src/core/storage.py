@@ -0,0 +1,408 @@
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime
+
+# Flushes a statement failing with a transient error is retried in
+# before it is dropped
+MAX_FLUSH_ATTEMPTS = 5
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS interactions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    source TEXT NOT NULL,
+    timestamp TEXT NOT NULL,
+    command TEXT NOT NULL,
+    command_key TEXT NOT NULL,
+    response TEXT,
+    success INTEGER NOT NULL,
+    context TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_interactions_command
+    ON interactions (source, command_key);
+CREATE INDEX IF NOT EXISTS idx_interactions_timestamp
+    ON interactions (source, timestamp);
+CREATE TABLE IF NOT EXISTS skills (
+    name TEXT PRIMARY KEY,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS rollups (
+    source TEXT NOT NULL,
+    granularity TEXT NOT NULL,
+    bucket TEXT NOT NULL,
+    command_key TEXT NOT NULL,
+    total INTEGER NOT NULL,
+    success INTEGER NOT NULL,
+    PRIMARY KEY (source, granularity, bucket, command_key)
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+_INSERT_INTERACTION = (
+    "INSERT INTO interactions "
+    "(source, timestamp, command, command_key, response, success, context) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?)"
+)
+
+_SAVE_SKILL = "INSERT OR REPLACE INTO skills (name, data) VALUES (?, ?)"
+_SET_META = "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)"
+
+_UPSERT_ROLLUP = (
+    "INSERT INTO rollups (source, granularity, bucket, command_key, total, success) "
+    "VALUES (?, ?, ?, ?, ?, ?) "
+    "ON CONFLICT (source, granularity, bucket, command_key) DO UPDATE SET "
+    "total = total + excluded.total, success = success + excluded.success"
+)
+
+# Rollup buckets are ISO timestamp prefixes: "2025-05-14T04" / "2025-05-14"
+BUCKET_LENGTHS = {"hour": 13, "day": 10}
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def get_store(db_path="data/assistant.db"):
+    """Get the shared Storage instance for a database path"""
+    with _stores_lock:
+        store = _stores.get(db_path)
+        if store is None or store.closed:
+            store = Storage(db_path)
+            _stores[db_path] = store
+        return store
+
+
+class Storage:
+    """SQLite (WAL) store shared by memory, learning, skills and history.
+
+    Writes are queued and committed in batches by a background flusher;
+    every read flushes first so callers always see their own writes.
+    """
+
+    def __init__(self, db_path, flush_interval=1.0, batch_size=50):
+        self.db_path = db_path
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.closed = False
+
+        if db_path != ":memory:":
+            os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+
+        self._lock = threading.RLock()
+        self._pending = []
+        self.dropped = 0  # queued writes that could not be committed
+        self._wakeup = threading.Event()
+        self._flusher = threading.Thread(target=self._flush_loop, daemon=True)
+        self._flusher.start()
+
+    # Writes
+
+    def add_interaction(self, source, command, response, success,
+                        timestamp=None, context=None):
+        """Queue an interaction record for the next batch commit"""
+        self._enqueue(_INSERT_INTERACTION, self._interaction_params(
+            source, command, response, success, timestamp, context))
+
+    def save_skill(self, name, data):
+        self._enqueue(_SAVE_SKILL, (name, json.dumps(data)))
+
+    def delete_skill(self, name):
+        self._enqueue("DELETE FROM skills WHERE name = ?", (name,))
+
+    def set_meta(self, key, value):
+        self._enqueue(_SET_META, (key, json.dumps(value)))
+
+    def apply(self, statements):
+        """Flush pending writes, then run statements in one transaction now"""
+        with self._lock:
+            self.flush()
+            with self._conn:
+                for sql, params in statements:
+                    self._conn.execute(sql, params)
+
+    def archive_interactions(self, ids, rollups, meta=None):
+        """Delete archived rows and merge their rollup counts atomically.
+
+        meta entries (e.g. the archive's progress marker) are set in the
+        same transaction.
+        """
+        statements = [(_UPSERT_ROLLUP, row) for row in rollups]
+        statements.extend((_SET_META, (key, json.dumps(value)))
+                          for key, value in (meta or {}).items())
+        for start in range(0, len(ids), 500):
+            chunk = ids[start:start + 500]
+            statements.append((
+                f"DELETE FROM interactions WHERE id IN ({','.join('?' * len(chunk))})",
+                chunk
+            ))
+        self.apply(statements)
+
+    def flush(self):
+        """Commit all queued writes in one transaction.
+
+        If the batch fails, its statements are retried one at a time: a
+        statement that is invalid (constraint, type or SQL errors) is
+        logged and dropped, so it cannot block the writes queued after it;
+        one that fails for an operational reason (e.g. a locked database)
+        is kept for the next flush, up to MAX_FLUSH_ATTEMPTS times.
+        """
+        with self._lock:
+            if not self._pending or self.closed:
+                return 0
+            batch, self._pending = self._pending, []
+            try:
+                with self._conn:
+                    for item in batch:
+                        self._conn.execute(item[0], item[1])
+                return len(batch)
+            except Exception as e:
+                print(f"Error flushing storage: {e}")
+
+            written, retry = 0, []
+            for item in batch:
+                sql, params = item[0], item[1]
+                attempts = item[2] + 1 if len(item) > 2 else 1
+                try:
+                    with self._conn:
+                        self._conn.execute(sql, params)
+                    written += 1
+                except sqlite3.OperationalError as e:
+                    if attempts < MAX_FLUSH_ATTEMPTS:
+                        retry.append((sql, params, attempts))
+                    else:
+                        self.dropped += 1
+                        print(f"Dropping write after {attempts} attempts: {e}")
+                except Exception as e:
+                    self.dropped += 1
+                    print(f"Dropping invalid write ({e}): {sql}")
+            self._pending = retry + self._pending
+            return written
+
+    def close(self):
+        """Flush pending writes and close the database"""
+        if self.closed:
+            return
+        self.flush()
+        self.closed = True
+        self._wakeup.set()
+        self._flusher.join(timeout=self.flush_interval + 1)
+        with self._lock:
+            self._conn.close()
+
+    # Reads
+
+    def count_interactions(self, source, success=None):
+        sql = "SELECT COUNT(*) FROM interactions WHERE source = ?"
+        params = [source]
+        if success is not None:
+            sql += " AND success = ?"
+            params.append(1 if success else 0)
+        return self._query(sql, params)[0][0]
+
+    def command_stats(self, source, limit=None, since=None, until=None):
+        """Per-command totals and successes, most frequent first"""
+        sql = ("SELECT command_key, COUNT(*) AS total, SUM(success) AS success "
+               "FROM interactions WHERE source = ?")
+        params = [source]
+        if since is not None:
+            sql += " AND timestamp >= ?"
+            params.append(since)
+        if until is not None:
+            sql += " AND timestamp < ?"
+            params.append(until)
+        sql += " GROUP BY command_key ORDER BY total DESC"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return {row["command_key"]: {"success": row["success"], "total": row["total"]}
+                for row in self._query(sql, params)}
+
+    def find_interactions(self, source, command=None, since=None, until=None,
+                          success=None, limit=None):
+        """Query interactions by command and/or timestamp range"""
+        sql = "SELECT * FROM interactions WHERE source = ?"
+        params = [source]
+        if command is not None:
+            sql += " AND command_key = ?"
+            params.append(command.lower())
+        if since is not None:
+            sql += " AND timestamp >= ?"
+            params.append(since)
+        if until is not None:
+            sql += " AND timestamp < ?"
+            params.append(until)
+        if success is not None:
+            sql += " AND success = ?"
+            params.append(1 if success else 0)
+        sql += " ORDER BY id"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return [self._row_to_interaction(row) for row in self._query(sql, params)]
+
+    def recent_interactions(self, source, limit):
+        """Most recent interactions, oldest first"""
+        rows = self._query(
+            "SELECT * FROM interactions WHERE source = ? ORDER BY id DESC LIMIT ?",
+            (source, limit)
+        )
+        return [self._row_to_interaction(row) for row in reversed(rows)]
+
+    def iter_interactions(self, source, success=None, batch=500):
+        """Stream interactions without loading them all into memory"""
+        last_id = 0
+        while True:
+            sql = "SELECT * FROM interactions WHERE source = ? AND id > ?"
+            params = [source, last_id]
+            if success is not None:
+                sql += " AND success = ?"
+                params.append(1 if success else 0)
+            sql += " ORDER BY id LIMIT ?"
+            params.append(batch)
+            rows = self._query(sql, params)
+            if not rows:
+                return
+            for row in rows:
+                yield self._row_to_interaction(row)
+            last_id = rows[-1]["id"]
+
+    def interactions_before(self, source, until, limit):
+        """Oldest interactions older than until, as (id, interaction) pairs"""
+        rows = self._query(
+            "SELECT * FROM interactions WHERE source = ? AND timestamp < ? "
+            "ORDER BY id LIMIT ?",
+            (source, until, limit)
+        )
+        return [(row["id"], self._row_to_interaction(row)) for row in rows]
+
+    def rollup_stats(self, source, granularity="day", since=None, until=None):
+        """Per-command totals summed over rollup buckets"""
+        sql = ("SELECT command_key, SUM(total) AS total, SUM(success) AS success "
+               "FROM rollups WHERE source = ? AND granularity = ?")
+        params = [source, granularity]
+        if since is not None:
+            sql += " AND bucket >= ?"
+            params.append(since[:BUCKET_LENGTHS[granularity]])
+        if until is not None:
+            sql += " AND bucket < ?"
+            params.append(until[:BUCKET_LENGTHS[granularity]])
+        sql += " GROUP BY command_key ORDER BY total DESC"
+        return {row["command_key"]: {"success": row["success"], "total": row["total"]}
+                for row in self._query(sql, params)}
+
+    def rollup_series(self, source, granularity="day", command=None):
+        """Totals per time bucket, oldest first"""
+        sql = ("SELECT bucket, SUM(total) AS total, SUM(success) AS success "
+               "FROM rollups WHERE source = ? AND granularity = ?")
+        params = [source, granularity]
+        if command is not None:
+            sql += " AND command_key = ?"
+            params.append(command.lower())
+        sql += " GROUP BY bucket ORDER BY bucket"
+        return [{"bucket": row["bucket"], "total": row["total"], "success": row["success"]}
+                for row in self._query(sql, params)]
+
+    def get_skills(self):
+        return {row["name"]: json.loads(row["data"])
+                for row in self._query("SELECT name, data FROM skills", ())}
+
+    def get_meta(self, key, default=None):
+        rows = self._query("SELECT value FROM meta WHERE key = ?", (key,))
+        return json.loads(rows[0]["value"]) if rows else default
+
+    # Legacy import
+
+    def import_legacy_json(self, data_dir="data"):
+        """One-time import of the JSON state files written by older versions.
+
+        Each file is parsed in full and written in one transaction together
+        with its imported marker, so a malformed file leaves nothing behind
+        and a good one is never imported twice.
+        """
+        imported = self.get_meta("legacy_import", {})
+        sources = {
+            "memory": os.path.join(data_dir, "memory", "memory_state.json"),
+            "learning": os.path.join(data_dir, "learning", "interaction_history.json"),
+            "skills": os.path.join(data_dir, "skills", "learned_skills.json"),
+            "history": os.path.join(data_dir, "history", "command_history.json")
+        }
+        for kind, path in sources.items():
+            if kind in imported or not os.path.exists(path):
+                continue
+            try:
+                with open(path, "r") as f:
+                    data = json.load(f)
+                if kind == "skills":
+                    statements = [(_SAVE_SKILL, (name, json.dumps(skill)))
+                                  for name, skill in data.items()]
+                else:
+                    records = data["interactions"] if kind == "memory" else data
+                    statements = [(_INSERT_INTERACTION, self._interaction_params(
+                        kind,
+                        record["command"],
+                        record.get("response"),
+                        record.get("success", False),
+                        record.get("timestamp"),
+                        record.get("context")
+                    )) for record in records]
+                marked = dict(imported, **{kind: datetime.now().isoformat()})
+                statements.append((_SET_META, ("legacy_import", json.dumps(marked))))
+                self.apply(statements)
+                imported = marked
+            except Exception as e:
+                print(f"Error importing {path}: {e}")
+        return imported
+
+    # Internals
+
+    @staticmethod
+    def _interaction_params(source, command, response, success, timestamp=None, context=None):
+        return (
+            source,
+            timestamp or datetime.now().isoformat(),
+            command,
+            command.lower(),
+            response,
+            1 if success else 0,
+            json.dumps(context) if context is not None else None
+        )
+
+    def _enqueue(self, sql, params):
+        with self._lock:
+            if self.closed:
+                raise RuntimeError("Storage is closed")
+            self._pending.append((sql, params))
+            if len(self._pending) >= self.batch_size:
+                self._wakeup.set()
+
+    def _query(self, sql, params):
+        with self._lock:
+            self.flush()
+            return self._conn.execute(sql, params).fetchall()
+
+    def _flush_loop(self):
+        while not self.closed:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            if not self.closed:
+                self.flush()
+
+    def _row_to_interaction(self, row):
+        interaction = {
+            "timestamp": row["timestamp"],
+            "command": row["command"],
+            "response": row["response"],
+            "success": bool(row["success"])
+        }
+        if row["context"] is not None:
+            interaction["context"] = json.loads(row["context"])
+        return interaction
@@ -0,0 +1,189 @@
+import hashlib
+import time
+from collections import OrderedDict
+import numpy as np
+
+_HASH_SEED = 0x5EED
+
+
+def _hash_weights(length, seed):
+    rng = np.random.default_rng(seed)
+    return rng.integers(1, 2 ** 63, size=(2, length), dtype=np.uint64) | np.uint64(1)
+
+
+def tile_hashes(image, tile_size):
+    """Hash every tile of a 2-D image at once.
+
+    Returns a (rows, cols, 2) uint64 array: two random linear hashes
+    (wrapping mod 2**64) of each tile's pixels. The image is zero-padded
+    to whole tiles.
+    """
+    height, width = image.shape[:2]
+    rows = -(-height // tile_size)
+    cols = -(-width // tile_size)
+    padded = np.zeros((rows * tile_size, cols * tile_size), dtype=np.uint64)
+    padded[:height, :width] = image
+    tiles = padded.reshape(rows, tile_size, cols, tile_size).swapaxes(1, 2)
+    tiles = tiles.reshape(rows, cols, tile_size * tile_size)
+    weights = _hash_weights(tile_size * tile_size, _HASH_SEED)
+    return np.stack([tiles @ weights[0], tiles @ weights[1]], axis=-1)
+
+
+def content_key(image):
+    """Digest of a crop's pixels and shape, for the OCR result cache"""
+    digest = hashlib.blake2b(np.ascontiguousarray(image).tobytes(), digest_size=16)
+    digest.update(str(image.shape).encode())
+    return digest.hexdigest()
+
+
+def parse_ocr_data(data, offset=(0, 0), min_confidence=-1):
+    """Words from pytesseract image_to_data output, shifted by offset"""
+    words = []
+    for i, text in enumerate(data['text']):
+        text = str(text).strip()
+        if not text or float(data['conf'][i]) < min_confidence:
+            continue
+        x, y = data['left'][i] + offset[0], data['top'][i] + offset[1]
+        w, h = data['width'][i], data['height'][i]
+        words.append({
+            'text': text,
+            'position': (x + w // 2, y + h // 2),
+            'bounds': (x, y, w, h),
+            'confidence': data['conf'][i]
+        })
+    return words
+
+
+class TileOCR:
+    """Incremental OCR that only re-reads the parts of the screen that changed.
+
+    The frame is cut into square tiles whose hashes are compared with the
+    previous frame. A changed tile invalidates itself and its neighbours,
+    because each tile is OCR'd with a `margin` of surrounding pixels so
+    words crossing a tile edge are read whole; a word belongs to the tile
+    containing its centre. OCR output is also cached by the content of the
+    padded crop, so screens that flip back (a blinking cursor, a toggled
+    panel) are answered without running OCR again. The crops still missing
+    are read in one batch, through `ocr_regions(image, boxes)` when given.
+    """
+
+    def __init__(self, ocr_fn, tile_size=256, margin=64, cache_size=512, min_confidence=-1,
+                 ocr_regions=None):
+        if margin >= tile_size:
+            raise ValueError("margin must be smaller than tile_size")
+        self.ocr_fn = ocr_fn
+        # Optional batch reader, e.g. OCRPool.ocr_regions, for the dirty tiles
+        self.ocr_regions = ocr_regions
+        self.tile_size = tile_size
+        self.margin = margin
+        self.cache_size = cache_size
+        self.min_confidence = min_confidence
+        self.tiles = {}             # (row, col) -> words whose centre is in the tile
+        self.cache = OrderedDict()  # crop content key -> words relative to the crop
+        self.hashes = None
+        self.shape = None
+        self.stats = {"frames": 0, "tiles_ocrd": 0, "cache_hits": 0, "last_ocr_time": 0.0}
+
+    def analyze(self, image):
+        """OCR the tiles of a grayscale frame that changed; returns the screen map"""
+        hashes = tile_hashes(image, self.tile_size)
+        if self.shape != image.shape:
+            self.tiles = {}
+            dirty = np.ones(hashes.shape[:2], dtype=bool)
+        else:
+            changed = np.any(hashes != self.hashes, axis=-1)
+            dirty = self._with_neighbours(changed)
+        self.hashes = hashes
+        self.shape = image.shape
+
+        started = time.perf_counter()
+        self._read_tiles(image, [(int(r), int(c)) for r, c in zip(*np.nonzero(dirty))])
+        self.stats["frames"] += 1
+        self.stats["last_ocr_time"] = time.perf_counter() - started
+        return self.screen_map()
+
+    def screen_map(self):
+        """Merged {text: element} map; the most confident reading wins"""
+        merged = {}
+        for key in sorted(self.tiles):
+            for word in self.tiles[key]:
+                text = word['text'].lower()
+                current = merged.get(text)
+                if current is None or float(word['confidence']) > float(current['confidence']):
+                    merged[text] = {k: word[k] for k in ('position', 'bounds', 'confidence')}
+        return merged
+
+    def words(self):
+        """Every word read, in tile order"""
+        return [word for key in sorted(self.tiles) for word in self.tiles[key]]
+
+    def reset(self):
+        self.tiles = {}
+        self.hashes = None
+        self.shape = None
+
+    def _with_neighbours(self, changed):
+        dirty = changed.copy()
+        dirty[1:, :] |= changed[:-1, :]
+        dirty[:-1, :] |= changed[1:, :]
+        grown = dirty.copy()
+        grown[:, 1:] |= dirty[:, :-1]
+        grown[:, :-1] |= dirty[:, 1:]
+        return grown
+
+    def _crop_box(self, image, row, col):
+        """(tile box, padded crop box) as (x, y, w, h)"""
+        height, width = image.shape[:2]
+        top, left = row * self.tile_size, col * self.tile_size
+        bottom, right = min(top + self.tile_size, height), min(left + self.tile_size, width)
+        crop_top, crop_left = max(0, top - self.margin), max(0, left - self.margin)
+        crop_bottom = min(height, bottom + self.margin)
+        crop_right = min(width, right + self.margin)
+        return ((left, top, right - left, bottom - top),
+                (crop_left, crop_top, crop_right - crop_left, crop_bottom - crop_top))
+
+    def _read_tiles(self, image, tiles):
+        boxes = {tile: self._crop_box(image, *tile) for tile in tiles}
+        keys = {}
+        found = {}    # content key -> words relative to the crop
+        missing = {}  # content key -> crop box, each distinct crop read once
+        for tile, (_, (x, y, w, h)) in boxes.items():
+            key = keys[tile] = content_key(image[y:y + h, x:x + w])
+            if key in self.cache:
+                self.cache.move_to_end(key)
+                found[key] = self.cache[key]
+                self.stats["cache_hits"] += 1
+            elif key not in missing:
+                missing[key] = (x, y, w, h)
+            else:
+                self.stats["cache_hits"] += 1
+
+        if missing:
+            if self.ocr_regions is not None:
+                results = self.ocr_regions(image, list(missing.values()))
+            else:
+                results = [self.ocr_fn(image[y:y + h, x:x + w])
+                           for x, y, w, h in missing.values()]
+            for key, data in zip(missing, results):
+                found[key] = self.cache[key] = parse_ocr_data(
+                    data, min_confidence=self.min_confidence)
+                self.stats["tiles_ocrd"] += 1
+            while len(self.cache) > self.cache_size:
+                self.cache.popitem(last=False)
+
+        for tile, (tile_box, crop_box) in boxes.items():
+            self.tiles[tile] = self._owned_words(found[keys[tile]], tile_box, crop_box)
+
+    def _owned_words(self, words, tile_box, crop_box):
+        """Words centred in the tile, moved to screen coordinates"""
+        left, top, width, height = tile_box
+        crop_left, crop_top = crop_box[:2]
+        kept = []
+        for word in words:
+            cx, cy = word['position']
+            cx, cy = cx + crop_left, cy + crop_top
+            if left <= cx < left + width and top <= cy < top + height:
+                x, y, w, h = word['bounds']
+                kept.append(dict(word, position=(cx, cy),
+                                 bounds=(x + crop_left, y + crop_top, w, h)))
+        return kept
@@ -1,41 +1,20 @@
 import pyautogui
 import pygetwindow as gw
-import cv2
-import numpy as np
-import pytesseract
-from PIL import Image
-import psutil
 import os
-import win32gui
-import win32con
-import win32api
 import time
+from .screen_analyzer import ScreenAnalyzer
+from .app_index import AppIndex
 
 class UIController:
-    def __init__(self):
+    def __init__(self, analyzer=None, app_index=None, app_index_path=None, app_index_workers=8):
         pyautogui.FAILSAFE = True
         self.active_window = None
         self.screen_elements = {}
-        self.app_paths = self._get_installed_apps()
-
-    def _get_installed_apps(self):
-        """Get list of installed applications"""
-        apps = {}
-        # Common installation directories
-        dirs = [
-            os.environ.get('PROGRAMFILES', ''),
-            os.environ.get('PROGRAMFILES(X86)', ''),
-            os.environ.get('LOCALAPPDATA', ''),
-            os.environ.get('APPDATA', '')
-        ]
-        
-        # Search for executable files
-        for directory in dirs:
-            for root, _, files in os.walk(directory):
-                for file in files:
-                    if file.endswith('.exe'):
-                        apps[file.lower().replace('.exe', '')] = os.path.join(root, file)
-        return apps
+        # Screen map shared with the command processor; cached for its TTL
+        self.analyzer = analyzer or ScreenAnalyzer()
+        # Loaded from disk right away and refreshed in the background
+        self.apps = app_index or AppIndex(index_path=app_index_path,
+                                          workers=app_index_workers).start()
 
     def analyze_window(self, window_title=None):
         """Analyze current active window"""
@@ -50,47 +29,24 @@ class UIController:
                     self.active_window.activate()
 
             if self.active_window:
-                # Take screenshot of window
-                screenshot = pyautogui.screenshot(region=(
-                    self.active_window.left,
-                    self.active_window.top,
-                    self.active_window.width,
-                    self.active_window.height
-                ))
-                
-                # Convert to CV2 format
-                img_cv = cv2.cvtColor(np.array(screenshot), cv2.COLOR_RGB2BGR)
+                # The window may have just changed; read the screen again
+                self.analyzer.invalidate()
+                screen_map = self.analyzer.get_map()
                 
-                # Extract text and UI elements
-                self.screen_elements = self._extract_elements(img_cv)
+                # Text and UI elements inside the window, in screen coordinates
+                self.screen_elements = screen_map.to_dict(region=self._window_region())
                 return True
         except Exception as e:
             print(f"Window analysis error: {e}")
             return False
 
-    def _extract_elements(self, img):
-        """Extract clickable elements and text from image"""
-        elements = {}
-        
-        # Extract text
-        text_data = pytesseract.image_to_data(img, output_type=pytesseract.Output.DICT)
-        
-        for i, text in enumerate(text_data['text']):
-            if text.strip():
-                x = text_data['left'][i]
-                y = text_data['top'][i]
-                w = text_data['width'][i]
-                h = text_data['height'][i]
-                conf = text_data['conf'][i]
-                
-                elements[text.lower()] = {
-                    'type': 'text',
-                    'position': (x + w//2, y + h//2),
-                    'bounds': (x, y, w, h),
-                    'confidence': conf
-                }
-        
-        return elements
+    def _window_region(self):
+        return (
+            self.active_window.left,
+            self.active_window.top,
+            self.active_window.width,
+            self.active_window.height
+        )
 
     def execute_command(self, command_type, params):
         """Execute UI command"""
@@ -113,13 +69,13 @@ class UIController:
     def _open_application(self, app_name):
         """Open any application"""
         try:
-            app_name = app_name.lower()
-            if app_name in self.app_paths:
-                os.startfile(self.app_paths[app_name])
+            path = self.apps.find(app_name)
+            if path:
+                os.startfile(path)
                 time.sleep(1)  # Wait for app to start
                 return self.analyze_window(app_name)
             else:
-                # Try system commands
+                # Not indexed (yet); try system commands
                 os.system(f"start {app_name}")
                 time.sleep(1)
                 return True
@@ -132,15 +88,13 @@ class UIController:
         if not self.active_window:
             return False
             
-        target = target.lower()
-        if target in self.screen_elements:
-            element = self.screen_elements[target]
-            pyautogui.click(
-                self.active_window.left + element['position'][0],
-                self.active_window.top + element['position'][1]
-            )
-            return True
-        return False
+        position = self.analyzer.find_element(target, region=self._window_region())
+        if position is None:
+            return False
+        pyautogui.click(*position)
+        # Clicking usually changes what is on screen
+        self.analyzer.invalidate()
+        return True
 
     def _type_text(self, text):
         """Type text in active window"""
@@ -0,0 +1,243 @@
+import glob
+import os
+import wave
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+def frame_signal(samples, frame_size, hop=None):
+    """View a 1-D signal as (n_frames, frame_size) without copying"""
+    hop = hop or frame_size
+    samples = np.asarray(samples)
+    if len(samples) < frame_size:
+        return np.zeros((0, frame_size), dtype=samples.dtype)
+    return sliding_window_view(samples, frame_size)[::hop]
+
+
+def frame_features(frames, sample_rate, band=(100, 4000)):
+    """Energy, zero-crossing rate, speech-band ratio and spectral flatness.
+
+    All features are computed for every frame at once; returns a dict of
+    1-D arrays with one value per frame.
+    """
+    frames = frames.astype(np.float32)
+    if len(frames) == 0:
+        empty = np.zeros(0, dtype=np.float32)
+        return {"energy": empty, "zcr": empty, "band_ratio": empty, "flatness": empty}
+
+    energy = np.sqrt(np.mean(frames * frames, axis=1))
+    signs = np.signbit(frames)
+    zcr = np.mean(signs[:, 1:] != signs[:, :-1], axis=1)
+
+    power = np.abs(np.fft.rfft(frames * np.hanning(frames.shape[1]), axis=1)) ** 2 + 1e-10
+    freqs = np.fft.rfftfreq(frames.shape[1], 1.0 / sample_rate)
+    in_band = (freqs >= band[0]) & (freqs <= band[1])
+    band_ratio = power[:, in_band].sum(axis=1) / power.sum(axis=1)
+    flatness = np.exp(np.mean(np.log(power), axis=1)) / np.mean(power, axis=1)
+
+    return {"energy": energy, "zcr": zcr, "band_ratio": band_ratio, "flatness": flatness}
+
+
+class VoiceActivityDetector:
+    """Cheap per-frame speech/non-speech decision over raw int16 audio.
+
+    A frame counts as speech when it is loud enough, most of its energy is
+    in the speech band, its spectrum is peaky rather than noise-flat and
+    its zero-crossing rate is below that of hiss. A segment is speech when
+    enough of its frames are.
+    """
+
+    def __init__(self, sample_rate=16000, frame_ms=20, min_energy=300.0, min_band_ratio=0.6,
+                 max_flatness=0.45, max_zcr=0.4, min_speech_seconds=0.15):
+        self.sample_rate = sample_rate
+        self.frame_size = int(sample_rate * frame_ms / 1000)
+        self.min_energy = min_energy
+        self.min_band_ratio = min_band_ratio
+        self.max_flatness = max_flatness
+        self.max_zcr = max_zcr
+        self.min_speech_frames = max(1, int(min_speech_seconds * 1000 / frame_ms))
+
+    def speech_frames(self, samples):
+        """Boolean mask with one entry per frame"""
+        features = frame_features(frame_signal(samples, self.frame_size), self.sample_rate)
+        return ((features["energy"] >= self.min_energy)
+                & (features["band_ratio"] >= self.min_band_ratio)
+                & (features["flatness"] <= self.max_flatness)
+                & (features["zcr"] <= self.max_zcr))
+
+    def is_speech(self, samples):
+        return int(self.speech_frames(samples).sum()) >= self.min_speech_frames
+
+
+def band_edges(sample_rate, window, bands=24, low=100, high=4000):
+    """FFT bin edges of log-spaced bands between low and high Hz.
+
+    Edges are rounded to bins first, so bands narrower than one bin would
+    come out empty; those are merged into their neighbour and fewer than
+    `bands` bands may be returned (len(edges) - 1 of them).
+    """
+    hz_edges = np.geomspace(low, min(high, sample_rate / 2), bands + 1)
+    bins = np.round(hz_edges * window / sample_rate).astype(int)
+    return np.unique(np.clip(bins, 0, window // 2 + 1))
+
+
+def spectral_profile(samples, sample_rate, bands=24, window_ms=25, hop_ms=10):
+    """Level-normalised log band energies, one row per 10 ms hop"""
+    window = int(sample_rate * window_ms / 1000)
+    hop = int(sample_rate * hop_ms / 1000)
+    # Log-spaced bands between 100 Hz and 4 kHz, roughly like a mel scale
+    edges = band_edges(sample_rate, window, bands)
+    frames = frame_signal(samples, window, hop).astype(np.float32)
+    if len(frames) == 0:
+        return np.zeros((0, len(edges) - 1), dtype=np.float32)
+    power = np.abs(np.fft.rfft(frames * np.hanning(window), axis=1)) ** 2
+    energies = np.add.reduceat(power[:, edges[0]:edges[-1]], edges[:-1] - edges[0], axis=1)
+    # Limit the dynamic range to ~40 dB so silent bands do not dominate
+    profile = np.log(energies + energies.max() * 1e-4 + 1e-6)
+    return profile - profile.mean(axis=1, keepdims=True)
+
+
+def subsequence_dtw(template, sequence):
+    """Best length-normalised alignment cost of template anywhere in sequence.
+
+    Uses steps (1,1), (1,0) and (1,2) so each template row only depends on
+    the previous one and the recurrence is vectorized across the sequence.
+    """
+    if len(template) == 0 or len(sequence) == 0:
+        return np.inf
+    cost = np.sqrt(((template[:, None, :] - sequence[None, :, :]) ** 2).mean(axis=2))
+    previous = cost[0].copy()
+    for row in cost[1:]:
+        diagonal = np.concatenate(([np.inf], previous[:-1]))
+        skip = np.concatenate(([np.inf, np.inf], previous[:-2]))
+        previous = row + np.minimum(np.minimum(diagonal, previous), skip)
+    return float(previous.min() / len(template))
+
+
+class WakeWordSpotter:
+    """Template-matching wake-word detector on raw audio.
+
+    Enrolled recordings of the wake word are reduced to spectral profiles
+    and aligned against incoming phrases with subsequence DTW; no speech
+    recognizer is involved. With no templates enrolled the spotter is not
+    `ready` and callers should fall back to checking the transcript.
+    """
+
+    def __init__(self, sample_rate=16000, threshold=1.5):
+        self.sample_rate = sample_rate
+        self.threshold = threshold
+        self.templates = []
+
+    @classmethod
+    def from_directory(cls, path, sample_rate=16000, threshold=1.5):
+        spotter = cls(sample_rate, threshold)
+        for wav_path in sorted(glob.glob(os.path.join(path, "*.wav"))):
+            with wave.open(wav_path, "rb") as wav:
+                if (wav.getframerate() != sample_rate or wav.getsampwidth() != 2
+                        or wav.getnchannels() != 1):
+                    print(f"Skipping wake-word template {wav_path}: "
+                          f"needs 16-bit {sample_rate} Hz mono")
+                    continue
+                spotter.enroll(np.frombuffer(wav.readframes(wav.getnframes()), dtype=np.int16))
+        if not spotter.ready:
+            print(f"No wake-word templates in {path}; checking transcripts instead. "
+                  f"Record some with: python -m src.core.voice_gate")
+        return spotter
+
+    @property
+    def ready(self):
+        return bool(self.templates)
+
+    def enroll(self, samples):
+        """Add one recording of the wake word"""
+        profile = spectral_profile(samples, self.sample_rate)
+        if len(profile):
+            self.templates.append(profile)
+
+    def score(self, samples):
+        """Lowest alignment cost against any template (lower is closer)"""
+        profile = spectral_profile(samples, self.sample_rate)
+        return min((subsequence_dtw(t, profile) for t in self.templates), default=np.inf)
+
+    def detect(self, samples):
+        return self.score(samples) <= self.threshold
+
+
+def save_template(samples, directory, sample_rate=16000):
+    """Write one wake-word recording as the next numbered 16-bit mono WAV"""
+    os.makedirs(directory, exist_ok=True)
+    index = len(glob.glob(os.path.join(directory, "*.wav"))) + 1
+    path = os.path.join(directory, f"wake_word_{index:02d}.wav")
+    while os.path.exists(path):
+        index += 1
+        path = os.path.join(directory, f"wake_word_{index:02d}.wav")
+    with wave.open(path, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        wav.writeframes(np.asarray(samples, dtype=np.int16).tobytes())
+    return path
+
+
+class VoiceGate:
+    """Decides which captured phrases are worth sending to the recognizer"""
+
+    def __init__(self, vad=None, spotter=None):
+        self.vad = vad or VoiceActivityDetector()
+        self.spotter = spotter
+        self.phrases = 0
+        self.forwarded = 0
+        self.no_speech = 0
+        self.no_wake_word = 0
+
+    @property
+    def spots_wake_word(self):
+        return self.spotter is not None and self.spotter.ready
+
+    def admit(self, samples, passive=False):
+        """True when samples contain speech (and the wake word, if passive)"""
+        self.phrases += 1
+        if not self.vad.is_speech(samples):
+            self.no_speech += 1
+            return False
+        if passive and self.spots_wake_word and not self.spotter.detect(samples):
+            self.no_wake_word += 1
+            return False
+        self.forwarded += 1
+        return True
+
+    def stats(self):
+        return {
+            "phrases": self.phrases,
+            "forwarded": self.forwarded,
+            "no_speech": self.no_speech,
+            "no_wake_word": self.no_wake_word,
+            "recognizer_calls_avoided": self.no_speech + self.no_wake_word
+        }
+
+
+if __name__ == "__main__":
+    import argparse
+    from .audio_stream import AudioCapture, MicrophoneSource
+
+    parser = argparse.ArgumentParser(description="Record wake-word templates")
+    parser.add_argument("--dir", default="data/wake_word")
+    parser.add_argument("--count", type=int, default=5)
+    parser.add_argument("--sample-rate", type=int, default=16000)
+    args = parser.parse_args()
+
+    vad = VoiceActivityDetector(args.sample_rate)
+    capture = AudioCapture(MicrophoneSource(args.sample_rate), phrase_time_limit=3.0)
+    capture.start()
+    recorded = 0
+    try:
+        while recorded < args.count:
+            print(f"Say the wake word ({recorded + 1}/{args.count})...")
+            phrase = capture.get_phrase(timeout=10.0)
+            if phrase is None or not vad.is_speech(phrase.samples):
+                print("Didn't catch that, try again.")
+                continue
+            print(f"Saved {save_template(phrase.samples, args.dir, args.sample_rate)}")
+            recorded += 1
+    finally:
+        capture.stop()
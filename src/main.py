@@ -3,38 +3,115 @@
 import signal
 import sys
 import os
-import time
-import json
 from datetime import datetime
-from core.speech_recognition import VoiceRecognizer
-from core.speech_synthesis import VoiceSynthesizer
 from core.llm_processor import LLMProcessor
 from core.command_processor import EnhancedCommandProcessor
 from core.memory_manager import MemoryManager
 from core.skill_manager import SkillManager
 from core.context_manager import ContextManager
+from core.response_cache import ResponseCache
+from core.storage import get_store
+from core.keyword_matcher import KeywordMatcher
+from core.pipeline import AssistantPipeline
+from core.sentence_stream import prefetch
+from core.speech_worker import NORMAL, URGENT
+from config.settings import Config
 
 class EnhancedVoiceAssistant:
-    def __init__(self, llm_model_path):
-        # Initialize core components
-        self.recognizer = VoiceRecognizer()
-        self.synthesizer = VoiceSynthesizer()
-        self.llm = LLMProcessor(llm_model_path)
-        self.processor = EnhancedCommandProcessor(self.llm)
+    GREETING = "AI Assistant initialized and ready!"
+    ERROR_MESSAGE = "I encountered an error. Please try again."
+    GOODBYE = "Saving state and shutting down. Goodbye!"
+
+    def __init__(self, llm_model_path, text_only=False, recognizer=None, synthesizer=None,
+                 llm=None, processor=None):
+        # Initialize core components; any of them can be passed in instead,
+        # e.g. stand-ins for benchmarks
+        if recognizer is None:
+            from core.speech_recognition import VoiceRecognizer
+            recognizer = VoiceRecognizer()
+        if synthesizer is None:
+            from core.speech_synthesis import VoiceSynthesizer
+            synthesizer = VoiceSynthesizer(cache_dir=Config.TTS_CACHE_DIR,
+                                           cache_max_bytes=Config.TTS_CACHE_MAX_BYTES)
+        self.recognizer = recognizer
+        self.synthesizer = synthesizer
+        self.llm = llm or LLMProcessor(
+            llm_model_path,
+            system_prompt=Config.LLM_SYSTEM_PROMPT,
+            state_dir=Config.LLM_STATE_DIR,
+            include_conversation=Config.LLM_INCLUDE_CONVERSATION,
+            backend=Config.LLM_BACKEND,
+            backend_options=Config.LLM_BACKEND_OPTIONS,
+            background=Config.LLM_BACKGROUND_LOAD,
+            warmup=Config.LLM_WARMUP,
+            ready_timeout=Config.LLM_READY_TIMEOUT
+        )
+        if processor is None:
+            processor = EnhancedCommandProcessor(
+                self.llm,
+                screen_options={
+                    "ocr_options": {
+                        "target_height": Config.OCR_TEXT_HEIGHT,
+                        "binarize": Config.OCR_BINARIZE,
+                        "regions": Config.OCR_TEXT_REGIONS
+                    },
+                    "capture_options": {
+                        "backend": Config.SCREEN_CAPTURE_BACKEND,
+                        "max_age": Config.SCREEN_CAPTURE_MAX_AGE
+                    }
+                },
+                ui_options={
+                    "app_index_path": Config.APP_INDEX_PATH,
+                    "app_index_workers": Config.APP_INDEX_WORKERS
+                }
+            )
+            processor.preload(Config.PRELOAD_SUBSYSTEMS)
+        self.processor = processor
         
         # Initialize enhanced components
-        self.memory = MemoryManager("data/memory")
-        self.skills = SkillManager()
-        self.context = ContextManager()
+        self.store = get_store(Config.STORAGE_DB)
+        self.store.import_legacy_json("data")
+        self.memory = MemoryManager(
+            "data/memory",
+            store=self.store,
+            recent_limit=Config.MEMORY_HOT_WINDOW,
+            retention={
+                "codec": Config.MEMORY_ARCHIVE_CODEC,
+                "raw_retention_days": Config.MEMORY_RAW_RETENTION_DAYS,
+                "cold_retention_days": Config.MEMORY_COLD_RETENTION_DAYS,
+                "segment_max_bytes": Config.MEMORY_SEGMENT_MAX_BYTES,
+                "segment_max_age_days": Config.MEMORY_SEGMENT_MAX_AGE_DAYS
+            },
+            compact_interval=Config.MEMORY_COMPACT_INTERVAL
+        )
+        # One keyword automaton serves skill routing, topic and intent
+        self.matcher = KeywordMatcher()
+        self.skills = SkillManager(store=self.store, matcher=self.matcher)
+        self.context = ContextManager(snapshot_interval=Config.CONTEXT_SNAPSHOT_INTERVAL,
+                                      matcher=self.matcher)
         
         # Setup basic configurations
         self.setup_signal_handlers()
-        self.response_cache = {}
-        self.command_history = []
+        self.response_cache = ResponseCache(
+            max_entries=Config.RESPONSE_CACHE_SIZE,
+            ttl=Config.RESPONSE_CACHE_TTL,
+            threshold=Config.RESPONSE_CACHE_THRESHOLD,
+            uncacheable=Config.UNCACHEABLE_KEYWORDS
+        )
         self.last_command_time = 0
-        self.wake_word = "jarvis"
+        self.wake_word = Config.WAKE_WORD
         self.is_active = True
         self.conversation_context = []
+        self.text_only = text_only
+        self.pipeline = self.build_pipeline()
+
+        # Render phrases we know we will say while the model warms up
+        self.synthesizer.prerender(self.fixed_phrases())
+        if Config.BARGE_IN and not self.text_only:
+            self.recognizer.on_speech_start = self.barge_in
+        elif not self.text_only:
+            # Capture never pauses, so on speakers it hears the replies too
+            self.recognizer.ignore_phrase = self.is_echo
         
     def setup_signal_handlers(self):
         signal.signal(signal.SIGINT, self.graceful_exit)
@@ -66,84 +143,154 @@ class EnhancedVoiceAssistant:
 
     def smart_cache_lookup(self, command):
         """Intelligent cache lookup with context awareness"""
-        for cached_cmd, cached_response in self.response_cache.items():
-            if self.context.is_similar_context(cached_cmd, command):
-                return cached_response
+        return self.response_cache.get(command)
+
+    def fixed_phrases(self):
+        """Utterances worth keeping pre-rendered in the audio cache"""
+        phrases = [self.GREETING, self.ERROR_MESSAGE, self.GOODBYE,
+                   self.llm.WARMING_UP, self.llm.LOAD_FAILED]
+        phrases.extend(reply["response"] for reply in self.llm.quick_responses.values())
+        return phrases
+
+    def barge_in(self):
+        """The user started talking: stop speaking and listen"""
+        if self.synthesizer.speaking:
+            self.synthesizer.interrupt()
+
+    def is_echo(self, started, ended):
+        """The phrase overlaps our own speech or its tail, so it may be our voice"""
+        return self.synthesizer.spoke_during(started - Config.ECHO_TAIL, ended)
+
+    def build_pipeline(self):
+        """Wire the assistant into concurrent stages joined by bounded queues"""
+        stages = [
+            ("routing", self.route_command),
+            ("synthesis", self.speak_result),
+            ("persistence", self.persist_result)
+        ]
+        source = None
+        if not self.text_only:
+            # Capture keeps listening while later stages think and speak
+            stages.insert(0, ("recognition", self.recognizer.recognize))
+            source = lambda: self.recognizer.capture(passive=not self.is_active)
+        pipeline = AssistantPipeline(stages, source=source, queue_size=Config.PIPELINE_QUEUE_SIZE)
+        pipeline.set_error_handler(self.handle_stage_error)
+        return pipeline
+
+    def route_command(self, audio_input):
+        """Routing stage: context, cache, skills or LLM"""
+        if not audio_input:
+            return None
+
+        # Wake word detection (already done on raw audio when templates exist)
+        if not self.is_active and not self.wake_word_detected(audio_input):
+            return None
+        
+        # Process command
+        print(f"Processing: {audio_input}")
+        
+        # Update context
+        self.context.update_context(audio_input)
+        
+        # Check cache with context awareness
+        cached_response = self.smart_cache_lookup(audio_input)
+        if cached_response:
+            return {"command": audio_input, "response": cached_response, "cached": True}
+        
+        # Process command with skills; their results report an action that
+        # must run again on a repeat, so they are never cached
+        if self.skills.has_skill_for(audio_input):
+            return {"command": audio_input, "response": self.skills.execute_skill(audio_input),
+                    "cacheable": False}
+
+        # The command runs (a UI action, or the model starts generating) here
+        # in the routing stage, while the synthesis stage may still be busy
+        # with the previous answer; synthesis speaks the segments as they come
+        cacheable = self.processor.answers_from_model(audio_input)
+        segments = self.processor.process_command_stream(audio_input, self.conversation_context)
+        return {"command": audio_input, "segments": prefetch(segments), "cacheable": cacheable}
+
+    def speak_result(self, result):
+        """Synthesis stage"""
+        if "segments" in result:
+            result["response"] = self.synthesizer.speak_stream(
+                result.pop("segments"),
+                on_first_audio=lambda latency: print(f"Time to first audio: {latency:.2f}s"))
+        else:
+            # Queued on the speech worker; the pipeline does not wait for it
+            self.synthesizer.say(result["response"], result.get("priority", NORMAL))
+        return None if result.get("cached") else result
+
+    def persist_result(self, result):
+        """Persistence stage: learning, conversation context, cache and history"""
+        audio_input, response = result["command"], result["response"]
+        # The model was not available: nothing was answered, so there is
+        # nothing to learn from, cache or record as a failure of the command
+        if any(reply in response for reply in (self.llm.WARMING_UP, self.llm.LOAD_FAILED)):
+            return None
+
+        # Learn from interaction
+        success = "error" not in response.lower()
+        self.learn_from_interaction(audio_input, response, success)
+        
+        # Update conversation context
+        self.process_conversation_context(audio_input)
+        
+        # Cache successful conversational answers
+        if success and result.get("cacheable"):
+            self.response_cache.put(audio_input, response)
+        
+        # Update command history
+        self.store.add_interaction("history", audio_input, response, success)
         return None
 
+    def handle_stage_error(self, stage, item, error):
+        if stage != "synthesis":
+            self.pipeline.submit({"response": self.ERROR_MESSAGE, "cached": True,
+                                  "priority": URGENT}, stage="synthesis")
+
     def run(self):
-        self.synthesizer.speak("AI Assistant initialized and ready!")
-        
-        while True:
-            try:
-                # Listen for command
-                audio_input = self.recognizer.listen()
-                if not audio_input:
-                    continue
-
-                # Wake word detection
-                if not self.is_active and not self.wake_word_detected(audio_input):
-                    continue
-                
-                # Process command
-                print(f"Processing: {audio_input}")
-                
-                # Update context
-                self.context.update_context(audio_input)
-                
-                # Check cache with context awareness
-                cached_response = self.smart_cache_lookup(audio_input)
-                if cached_response:
-                    self.synthesizer.speak(cached_response)
-                    continue
-                
-                # Process command with skills
-                if self.skills.has_skill_for(audio_input):
-                    response = self.skills.execute_skill(audio_input)
-                else:
-                    response = self.processor.process_command(audio_input)
-                
-                # Learn from interaction
-                success = "error" not in response.lower()
-                self.learn_from_interaction(audio_input, response, success)
-                
-                # Update conversation context
-                self.process_conversation_context(audio_input)
-                
-                # Cache successful responses
-                if success:
-                    self.response_cache[audio_input] = response
-                
-                # Speak response
-                self.synthesizer.speak(response)
-                
-                # Update command history
-                self.command_history.append({
-                    "timestamp": datetime.now().isoformat(),
-                    "command": audio_input,
-                    "response": response,
-                    "success": success
-                })
-                
-            except KeyboardInterrupt:
-                self.graceful_exit(None, None)
-            except Exception as e:
-                print(f"Error in main loop: {str(e)}")
-                self.synthesizer.speak("I encountered an error. Please try again.")
+        self.synthesizer.say(self.GREETING)
+        self.pipeline.start()
+
+        if self.text_only:
+            # Read typed commands instead of listening
+            for line in sys.stdin:
+                if line.strip():
+                    self.pipeline.submit(line.strip())
+            self.graceful_exit(None, None)
+
+        try:
+            while not self.pipeline.wait(timeout=1.0):
+                pass
+        except KeyboardInterrupt:
+            self.graceful_exit(None, None)
+
+    def pipeline_metrics(self):
+        """Per-stage queue depths and timings"""
+        metrics = self.pipeline.metrics()
+        metrics["speech"] = self.synthesizer.worker.metrics()
+        metrics["llm"] = self.llm.load_stats()
+        if not self.text_only:
+            metrics["gate"] = self.recognizer.gate.stats()
+        return metrics
 
     def graceful_exit(self, signum, frame):
         """Enhanced graceful exit with state saving"""
         try:
+            # Let queued commands finish, then stop every stage
+            self.pipeline.stop(drain=True, timeout=Config.PIPELINE_SHUTDOWN_TIMEOUT)
+            self.recognizer.stop_capture()
+
             # Save current state
+            self.memory.stop_compaction()
             self.memory.save_state()
             self.context.save_context()
             self.skills.save_learned_skills()
-            
-            # Save command history
-            with open("data/history/command_history.json", "w") as f:
-                json.dump(self.command_history, f, indent=2)
+            self.store.close()
                 
-            self.synthesizer.speak("Saving state and shutting down. Goodbye!")
+            # Let queued speech finish, then say goodbye before exiting
+            self.synthesizer.say(self.GOODBYE).result(timeout=Config.PIPELINE_SHUTDOWN_TIMEOUT)
         except Exception as e:
             print(f"Error during shutdown: {e}")
         finally:
@@ -162,5 +309,5 @@ if __name__ == "__main__":
     os.makedirs("data/context", exist_ok=True)
 
     MODEL_PATH = "models/mistral/Mistral-Nemo-Instruct-2407-Q4_K_M.gguf"
-    assistant = EnhancedVoiceAssistant(MODEL_PATH)
+    assistant = EnhancedVoiceAssistant(MODEL_PATH, text_only="--text" in sys.argv)
     assistant.run()
\ No newline at end of file
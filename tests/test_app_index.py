@@ -0,0 +1,92 @@
+import unittest
+import sys
+import os
+import shutil
+import tempfile
+
+# Add the project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core.app_index import AppIndex
+
+FILES = [
+    "Program Files/Google/Chrome/Application/chrome.exe",
+    "Program Files/Google/Chrome/Application/chrome_proxy.exe",
+    "Program Files/Microsoft Office/root/Office16/WINWORD.EXE",
+    "Program Files/Microsoft Office/root/Office16/EXCEL.EXE",
+    "Program Files/Notepad++/notepad++.exe",
+    "Program Files/Notepad++/uninstall.exe",
+    "Program Files/Notepad++/readme.txt",
+    "Program Files/Tool/node_modules/bin/tool.exe",
+    "Program Files/Vendor A/app.exe",
+    "AppData/Local/Programs/Microsoft VS Code/Code.exe",
+    "AppData/Local/Programs/Microsoft VS Code/Update.exe",
+    "AppData/Local/Programs/Vendor B/app.exe",
+]
+
+class TestAppIndex(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        for path in FILES:
+            path = os.path.join(self.tmp, path)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            open(path, "w").close()
+        self.roots = [os.path.join(self.tmp, "Program Files"), os.path.join(self.tmp, "AppData")]
+        self.index_path = os.path.join(self.tmp, "index", "apps.json")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def make_index(self):
+        return AppIndex(self.roots, self.index_path, workers=4)
+
+    def test_aliases_and_exact_names(self):
+        index = self.make_index()
+        index.refresh()
+        self.assertTrue(index.find("word").endswith("WINWORD.EXE"))
+        self.assertTrue(index.find("Microsoft Word").endswith("WINWORD.EXE"))
+        self.assertTrue(index.find("vs code").endswith("Code.exe"))
+        self.assertTrue(index.find("notepad++.exe").endswith("notepad++.exe"))
+        self.assertIsNone(index.find("photoshop"))
+        self.assertEqual(len(index), 10)  # .txt skipped, node_modules not walked
+
+    def test_ranked_candidates(self):
+        index = self.make_index()
+        index.refresh()
+        ranked = [os.path.basename(path) for path, _ in index.candidates("chrome")]
+        self.assertEqual(ranked, ["chrome.exe", "chrome_proxy.exe"])
+        self.assertTrue(index.find("code").endswith("Code.exe"))
+        self.assertTrue(index.find("excell").endswith("EXCEL.EXE"))
+        # Both executables with the same name are kept
+        self.assertEqual(len(index.candidates("app")), 2)
+
+    def test_saved_index_loads_without_scanning(self):
+        self.make_index().refresh()
+        index = self.make_index()
+        self.assertTrue(index.load())
+        self.assertTrue(index.find("excel").endswith("EXCEL.EXE"))
+        other = AppIndex(self.roots[:1], self.index_path)
+        self.assertFalse(other.load())
+
+    def test_incremental_refresh(self):
+        index = self.make_index()
+        self.assertTrue(index.refresh())
+        self.assertFalse(index.refresh())
+        self.assertEqual(index.stats["dirs_scanned"], 0)
+
+        folder = os.path.join(self.roots[0], "Notepad++")
+        open(os.path.join(folder, "plugins.exe"), "w").close()
+        shutil.rmtree(os.path.join(self.roots[1], "Local", "Programs", "Vendor B"))
+        self.assertTrue(index.refresh())
+        self.assertEqual(index.stats["dirs_scanned"], 2)  # Notepad++ and Programs
+        self.assertEqual(len(index.lookup("plugins")), 1)
+        self.assertEqual(len(index.lookup("app")), 1)
+
+    def test_background_start(self):
+        index = self.make_index().start()
+        self.assertTrue(index.wait(5))
+        self.assertTrue(os.path.exists(self.index_path))
+        self.assertTrue(index.find("chrome").endswith("chrome.exe"))
+
+if __name__ == '__main__':
+    unittest.main()
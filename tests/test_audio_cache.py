@@ -0,0 +1,77 @@
+import unittest
+import sys
+import os
+import shutil
+import tempfile
+import time
+import wave
+
+# Add the project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core.audio_cache import AudioCache
+
+def fake_tts(frames):
+    """Renderer writing a silent 16-bit WAV of the given length"""
+    def render(path):
+        with wave.open(path, "wb") as wav:
+            wav.setnchannels(1)
+            wav.setsampwidth(2)
+            wav.setframerate(16000)
+            wav.writeframes(b"\x00\x00" * frames)
+    return render
+
+class TestAudioCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_key_covers_voice_settings(self):
+        """Test the same text in another voice or rate is a different entry"""
+        key = AudioCache.make_key("Hello!", "voice1", 175, 0.9)
+        self.assertEqual(key, AudioCache.make_key("Hello!", "voice1", 175, 0.9))
+        self.assertNotEqual(key, AudioCache.make_key("Hello!", "voice2", 175, 0.9))
+        self.assertNotEqual(key, AudioCache.make_key("Hello!", "voice1", 200, 0.9))
+
+    def test_render_then_hit(self):
+        cache = AudioCache(self.tmp_dir)
+        key = AudioCache.make_key("Goodbye!", "v", 175, 0.9)
+        self.assertIsNone(cache.get(key))
+        path = cache.render(key, fake_tts(1600))
+        self.assertEqual(cache.get(key), path)
+        self.assertEqual(cache.stats()["hits"], 1)
+        self.assertEqual(cache.stats()["misses"], 1)
+
+    def test_lru_size_bound(self):
+        """Test least recently played audio is evicted first"""
+        cache = AudioCache(self.tmp_dir, max_bytes=3 * 3300)
+        for key in ("a", "b", "c"):
+            cache.render(key, fake_tts(1600))  # ~3244 bytes each
+        cache.get("a")
+        cache.render("d", fake_tts(1600))
+        self.assertIn("a", cache)
+        self.assertNotIn("b", cache)
+        self.assertFalse(os.path.exists(cache.path_for("b")))
+        self.assertLessEqual(cache.total_bytes, cache.max_bytes)
+        self.assertEqual(cache.stats()["evictions"], 1)
+
+    def test_survives_restart(self):
+        """Test rendered audio and its recency are reloaded from disk"""
+        cache = AudioCache(self.tmp_dir)
+        cache.render("old", fake_tts(1600))
+        cache.render("new", fake_tts(1600))
+        past = time.time() - 60
+        os.utime(cache.path_for("old"), (past, past))
+        reloaded = AudioCache(self.tmp_dir, max_bytes=4000)
+        self.assertEqual(list(reloaded.entries), ["new"])
+
+    def test_failed_render_not_cached(self):
+        cache = AudioCache(self.tmp_dir)
+        self.assertIsNone(cache.render("bad", lambda path: None))
+        self.assertNotIn("bad", cache)
+        self.assertEqual(os.listdir(self.tmp_dir), [])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,101 @@
+import unittest
+import sys
+import os
+import shutil
+import tempfile
+import wave
+import numpy as np
+
+# Add the project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core.audio_stream import (
+    ArraySource, AudioCapture, RingBuffer, WavFileSource
+)
+
+RATE = 16000
+
+def noise(seconds, level=50, seed=0):
+    rng = np.random.default_rng(seed)
+    return rng.normal(0, level, int(seconds * RATE)).astype(np.int16)
+
+def tone(seconds, amplitude=8000, freq=440):
+    t = np.arange(int(seconds * RATE)) / RATE
+    return (amplitude * np.sin(2 * np.pi * freq * t)).astype(np.int16)
+
+def utterance():
+    """1s background, 0.6s speech, 1s background, 0.6s speech, 1s background"""
+    return np.concatenate([noise(1.0), tone(0.6), noise(1.0, seed=1),
+                           tone(0.6, freq=660), noise(1.0, seed=2)])
+
+class TestRingBuffer(unittest.TestCase):
+    def test_wraparound(self):
+        """Test reads by absolute index across the wrap point"""
+        buffer = RingBuffer(10)
+        buffer.write(np.arange(7, dtype=np.int16))
+        buffer.write(np.arange(7, 14, dtype=np.int16))
+        self.assertEqual(buffer.read(5, 14).tolist(), list(range(5, 14)))
+        # Samples 0-3 were overwritten and are clamped away
+        self.assertEqual(buffer.read(0, 6).tolist(), [4, 5])
+
+    def test_oversized_write_keeps_tail(self):
+        buffer = RingBuffer(4)
+        buffer.write(np.arange(10, dtype=np.int16))
+        self.assertEqual(buffer.total_written, 10)
+        self.assertEqual(buffer.read(0, 10).tolist(), [6, 7, 8, 9])
+
+class TestAudioCapture(unittest.TestCase):
+    def capture(self, source, **kwargs):
+        capture = AudioCapture(source, pre_roll=0.3, pause_threshold=0.5, **kwargs)
+        capture.start()
+        phrases = []
+        while True:
+            phrase = capture.get_phrase(timeout=2.0)
+            if phrase is None:
+                break
+            phrases.append(phrase)
+        capture.stop()
+        return capture, phrases
+
+    def test_phrases_cut_with_pre_roll(self):
+        """Test each burst becomes one phrase starting before speech onset"""
+        capture, phrases = self.capture(ArraySource(utterance(), RATE))
+        self.assertEqual(len(phrases), 2)
+        onset = int(1.0 * RATE)
+        self.assertLessEqual(phrases[0].start, onset - int(0.3 * RATE) + 480)
+        self.assertGreater(phrases[0].duration, 0.6)
+        # The very first speech samples are inside the phrase
+        offset = onset - phrases[0].start
+        np.testing.assert_array_equal(phrases[0].samples[offset:offset + 100], tone(0.6)[:100])
+
+    def test_noise_floor_tracks_background(self):
+        """Test background frames calibrate the floor without blocking capture"""
+        loud = noise(2.0, level=400)
+        samples = np.concatenate([loud, tone(0.6, amplitude=12000), loud])
+        capture, phrases = self.capture(ArraySource(samples, RATE))
+        self.assertGreater(capture.noise.floor, 200)
+        self.assertEqual(len(phrases), 1)
+
+    def test_short_clicks_ignored(self):
+        samples = np.concatenate([noise(1.0), tone(0.05), noise(1.0)])
+        _, phrases = self.capture(ArraySource(samples, RATE))
+        self.assertEqual(phrases, [])
+
+    def test_wav_file_source(self):
+        """Test a WAV file stands in for the microphone"""
+        tmp_dir = tempfile.mkdtemp()
+        try:
+            path = os.path.join(tmp_dir, "speech.wav")
+            with wave.open(path, "wb") as wav:
+                wav.setnchannels(1)
+                wav.setsampwidth(2)
+                wav.setframerate(RATE)
+                wav.writeframes(utterance().tobytes())
+            _, phrases = self.capture(WavFileSource(path))
+            self.assertEqual(len(phrases), 2)
+            self.assertEqual(phrases[1].sample_rate, RATE)
+        finally:
+            shutil.rmtree(tmp_dir)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+import unittest
+import sys
+import os
+import json
+import shutil
+import tempfile
+
+# Add the project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core.context_manager import ContextManager
+
+class TestContextManager(unittest.TestCase):
+    def setUp(self):
+        """Create a context manager writing into a temporary directory"""
+        self.tmp_dir = tempfile.mkdtemp()
+        self.context_file = os.path.join(self.tmp_dir, "context_state.json")
+        self.context = ContextManager(self.context_file, snapshot_interval=60)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_update_does_not_write_synchronously(self):
+        """Test updates are debounced instead of written on every call"""
+        self.context.update_context("open chrome")
+        self.context.update_context("search python")
+        self.assertFalse(os.path.exists(self.context_file))
+        self.context.save_context()
+        self.assertTrue(os.path.exists(self.context_file))
+        self.assertEqual(self.context._writer.writes, 1)
+
+    def test_history_stores_deltas(self):
+        """Test history entries after the first only hold changed fields"""
+        self.context.update_context("open chrome")
+        self.context.update_context("open notepad")
+        second = self.context.context_history[1]
+        self.assertNotIn("conversation_topic", second)
+        self.assertIn("previous_commands", second)
+
+    def test_history_entries_not_aliased(self):
+        """Test reconstructed history keeps each entry's own command list"""
+        self.context.update_context("open chrome")
+        self.context.update_context("play music")
+        history = self.context.get_history()
+        self.assertEqual(history[0]["previous_commands"], ["open chrome"])
+        self.assertEqual(history[1]["previous_commands"], ["open chrome", "play music"])
+        self.assertEqual(history[1]["conversation_topic"], "media")
+
+    def test_history_is_bounded(self):
+        """Test folding the oldest delta keeps history reconstructable"""
+        for i in range(15):
+            self.context.update_context(f"open app {i}")
+        history = self.context.get_history()
+        self.assertEqual(len(history), self.context.max_history)
+        self.assertEqual(history[0]["conversation_topic"], "system")
+        self.assertEqual(history[-1]["previous_commands"][-1], "open app 14")
+
+    def test_snapshot_round_trip(self):
+        """Test saved snapshots load back into the same state"""
+        self.context.update_context("open chrome")
+        self.context.update_context("what is the weather")
+        self.context.save_context()
+        with open(self.context_file) as f:
+            self.assertEqual(json.load(f)["history_format"], "delta")
+
+        reloaded = ContextManager(self.context_file, snapshot_interval=60)
+        self.assertEqual(reloaded.get_history(), self.context.get_history())
+        self.assertEqual(reloaded.get_current_context()["user_intent"], "query")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,138 @@
+import unittest
+import sys
+import os
+import gzip
+import shutil
+import tempfile
+import threading
+import time
+
+# Add the project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core.file_search import FileSearchIndex, tokens
+
+FILES = {
+    "docs/Q3 Report-final.pdf": 300,
+    "docs/report.pdf": 200,
+    "docs/budget.xlsx": 100,
+    "notes/old/notes.txt": 500,
+    "notes/notes.txt": 50,
+    "archive/photo_2019.jpg": 10,
+    "Windows/system.dll": 10,
+    "node_modules/pkg/index.js": 10,
+}
+
+class TestFileSearch(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.root = os.path.join(self.tmp, "root")
+        now = time.time()
+        for path, age in FILES.items():
+            path = os.path.join(self.root, path)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            open(path, "w").close()
+            os.utime(path, (now - age, now - age))
+        self.index_path = os.path.join(self.tmp, "files.json.gz")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def make_index(self):
+        return FileSearchIndex([self.root], self.index_path, workers=4,
+                               exclude=[os.path.join(self.root, "Windows")])
+
+    def names(self, results):
+        return [os.path.basename(path) for path, _ in results]
+
+    def test_tokens(self):
+        self.assertEqual(tokens("Q3 Report-final.pdf"), ["q3", "report", "final", "pdf"])
+
+    def test_query_kinds(self):
+        index = self.make_index()
+        index.refresh()
+        self.assertEqual(self.names(index.search("report.pdf"))[0], "report.pdf")
+        self.assertEqual(self.names(index.search("budget"))[0], "budget.xlsx")
+        self.assertEqual(self.names(index.search("final report"))[0], "Q3 Report-final.pdf")
+        self.assertEqual(self.names(index.search("bud")), ["budget.xlsx"])
+        self.assertEqual(self.names(index.search("port")),
+                         ["report.pdf", "Q3 Report-final.pdf"])
+        self.assertEqual(self.names(index.search("budgte")), ["budget.xlsx"])
+        self.assertEqual(index.search("zzz"), [])
+
+    def test_recency_breaks_ties(self):
+        index = self.make_index()
+        index.refresh()
+        paths = [path for path, _ in index.search("notes.txt")]
+        self.assertEqual(paths[0], os.path.join(self.root, "notes", "notes.txt"))
+        self.assertEqual(len(paths), 2)
+
+    def test_exclusions(self):
+        index = self.make_index()
+        index.refresh()
+        self.assertIsNone(index.find("system.dll"))
+        self.assertIsNone(index.find("index.js"))
+        self.assertEqual(len(index), 6)
+
+    def test_find_needs_exact_or_stem_match(self):
+        """Test find() does not pass off a similar name as the requested file"""
+        index = self.make_index()
+        index.refresh()
+        self.assertEqual(index.find("notes.txt"), os.path.join(self.root, "notes", "notes.txt"))
+        self.assertTrue(index.find("budget").endswith("budget.xlsx"))
+        self.assertIsNone(index.find("note.txt"))
+        self.assertIsNone(index.find("budgte"))
+        self.assertTrue(index.find("note.txt", min_score=0.5).endswith("notes.txt"))
+
+    def test_compact_saved_index(self):
+        self.make_index().refresh()
+        with open(self.index_path, "rb") as f:
+            self.assertEqual(f.read(2), b"\x1f\x8b")
+        with gzip.open(self.index_path, "rt") as f:
+            self.assertIn("budget.xlsx", f.read())
+        index = self.make_index()
+        self.assertTrue(index.load())
+        self.assertTrue(index.find("budget").endswith("budget.xlsx"))
+
+    def test_incremental_update(self):
+        index = self.make_index()
+        index.refresh()
+        open(os.path.join(self.root, "docs", "minutes.docx"), "w").close()
+        self.assertTrue(index.refresh())
+        self.assertEqual(index.stats["dirs_scanned"], 1)
+        self.assertTrue(index.find("minutes").endswith("minutes.docx"))
+
+    def test_search_during_swap(self):
+        """Test searches never see names and token indexes from different swaps"""
+        index = self.make_index()
+        index.refresh()
+        full = dict(index.dirs)
+        docs = os.path.join(self.root, "docs")
+        removed = dict(full)
+        removed[docs] = [full[docs][0], [], full[docs][2], []]
+        errors = []
+        done = threading.Event()
+
+        def search():
+            while not done.is_set():
+                try:
+                    index.search("report")
+                except Exception as e:
+                    errors.append(e)
+                    return
+
+        interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)  # switch threads often to hit the window
+        thread = threading.Thread(target=search)
+        thread.start()
+        try:
+            for i in range(3000):
+                index._swap(removed if i % 2 == 0 else full)
+        finally:
+            done.set()
+            thread.join()
+            sys.setswitchinterval(interval)
+        self.assertEqual(errors, [])
+
+if __name__ == '__main__':
+    unittest.main()
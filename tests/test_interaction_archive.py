@@ -0,0 +1,137 @@
+import unittest
+import sys
+import os
+import shutil
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+# Add the project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core.storage import Storage
+from src.core.memory_manager import MemoryManager
+
+class TestInteractionArchive(unittest.TestCase):
+    def setUp(self):
+        """Create a memory manager with old and recent interactions"""
+        self.tmp_dir = tempfile.mkdtemp()
+        self.store = Storage(os.path.join(self.tmp_dir, "test.db"), flush_interval=60)
+        self.memory = MemoryManager(self.tmp_dir, store=self.store,
+                                    retention={"raw_retention_days": 30})
+        self.now = datetime.now()
+        old = (self.now - timedelta(days=60)).replace(hour=10)
+        for i in range(5):
+            self._store("open chrome", i != 0, old + timedelta(minutes=i))
+        self._store("play music", True, old + timedelta(days=1))
+        self._store("open chrome", True, self.now - timedelta(days=1))
+
+    def tearDown(self):
+        self.store.close()
+        shutil.rmtree(self.tmp_dir)
+
+    def _store(self, command, success, timestamp):
+        self.memory.store_interaction({
+            "command": command,
+            "response": "ok",
+            "success": success,
+            "timestamp": timestamp.isoformat()
+        })
+
+    def test_compact_moves_old_rows_to_segments(self):
+        """Test rows past retention leave the store for a compressed segment"""
+        result = self.memory.compact()
+        self.assertEqual(result["archived"], 6)
+        self.assertEqual(self.store.count_interactions("memory"), 1)
+        segments = self.memory.archive.segments()
+        self.assertEqual(len(segments), 1)
+        self.assertTrue(segments[0].endswith(".jsonl.gz"))
+        self.assertEqual(len(list(self.memory.archive.iter_archived())), 6)
+
+    def test_analytics_survive_compaction(self):
+        """Test totals combine rollups with the remaining raw rows"""
+        before = self.memory.analyze_patterns()
+        self.memory.compact()
+        after = self.memory.analyze_patterns()
+        self.assertEqual(before["total_interactions"], 7)
+        self.assertEqual(after["total_interactions"], 7)
+        self.assertAlmostEqual(after["success_rate"], 6 / 7)
+
+        reloaded = MemoryManager(self.tmp_dir, store=self.store)
+        self.assertEqual(reloaded.stats.count("open chrome"), 6)
+
+    def test_rollup_series(self):
+        """Test daily and hourly rollups of archived rows"""
+        self.memory.compact()
+        daily = self.memory.get_usage_series("day", "open chrome")
+        self.assertEqual(len(daily), 1)
+        self.assertEqual(daily[0]["total"], 5)
+        self.assertAlmostEqual(daily[0]["success_rate"], 0.8)
+        hourly = self.memory.get_usage_series("hour")
+        self.assertEqual(sum(point["total"] for point in hourly), 6)
+
+    def test_similar_interactions_from_archive(self):
+        """Test cold records are only scanned when asked for"""
+        self.memory.compact()
+        self.assertEqual(len(self.memory.get_similar_interactions("open chrome")), 1)
+        found = self.memory.get_similar_interactions("open chrome", include_archived=True)
+        self.assertEqual(len(found), 5)
+
+    def test_lzma_segments_roll_over_by_size(self):
+        """Test segments roll over once they exceed the size limit"""
+        memory = MemoryManager(self.tmp_dir, store=self.store, retention={
+            "codec": "lzma", "segment_max_bytes": 1, "batch_size": 2
+        })
+        memory.compact()
+        segments = memory.archive.segments()
+        self.assertEqual(len(segments), 3)
+        self.assertTrue(all(path.endswith(".jsonl.xz") for path in segments))
+        self.assertEqual(len(list(memory.archive.iter_archived())), 6)
+
+    def test_restart_after_crash_does_not_duplicate(self):
+        """Test rows appended before a failed delete are not archived twice"""
+        archive = self.memory.archive
+        archive_interactions = self.store.archive_interactions
+
+        def crash(ids, rollups, meta=None):
+            raise RuntimeError("crashed before delete")
+
+        self.store.archive_interactions = crash
+        with self.assertRaises(RuntimeError):
+            self.memory.compact()
+        self.assertEqual(self.store.count_interactions("memory"), 7)
+        self.store.archive_interactions = archive_interactions
+
+        self.assertEqual(self.memory.compact()["archived"], 6)
+        self.assertEqual(len(list(archive.iter_archived())), 6)
+        self.assertEqual(self.store.count_interactions("memory"), 1)
+        self.assertEqual(self.memory.get_usage_series("day", "open chrome")[0]["total"], 5)
+
+    def test_compacts_in_background(self):
+        """Test retention is applied at startup without calling compact()"""
+        self.store.flush()
+        memory = MemoryManager(self.tmp_dir, store=self.store, compact_interval=60,
+                               retention={"raw_retention_days": 30})
+        deadline = time.time() + 5.0
+        while self.store.count_interactions("memory") > 1 and time.time() < deadline:
+            time.sleep(0.01)
+        memory.stop_compaction()
+        self.assertEqual(self.store.count_interactions("memory"), 1)
+        self.assertEqual(len(list(memory.archive.iter_archived())), 6)
+
+    def test_recreated_store_keeps_new_rows(self):
+        """Test a manifest left from an old database does not skip new rows"""
+        self.memory.compact()
+        self.store.close()
+        os.remove(os.path.join(self.tmp_dir, "test.db"))
+        self.store = Storage(os.path.join(self.tmp_dir, "test.db"), flush_interval=60)
+        self.memory = MemoryManager(self.tmp_dir, store=self.store,
+                                    retention={"raw_retention_days": 30})
+        for i in range(3):
+            self._store("play music", True, self.now - timedelta(days=40, minutes=i))
+        self.assertEqual(self.memory.compact()["archived"], 3)
+        self.assertEqual(len(list(self.memory.archive.iter_archived())), 9)
+        self.assertEqual(self.memory.archive.last_archived_id(), 3)
+
+if __name__ == '__main__':
+    unittest.main()
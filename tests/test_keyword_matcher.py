@@ -0,0 +1,92 @@
+import unittest
+import sys
+import os
+import shutil
+import tempfile
+
+# Add the project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core.keyword_matcher import KeywordMatcher
+from src.core.storage import Storage
+from src.core.skill_manager import SkillManager
+from src.core.context_manager import ContextManager
+
+class TestKeywordMatcher(unittest.TestCase):
+    def test_overlapping_patterns_in_one_pass(self):
+        """Test all tagged keywords are found, including multi-word ones"""
+        matcher = KeywordMatcher()
+        matcher.add("go to", "intent", "navigation")
+        matcher.add("go", "intent", "action")
+        matcher.add("settings", "topic", "system")
+        result = matcher.match("Go to settings")
+        self.assertEqual(result.values("intent"), {"navigation", "action"})
+        self.assertEqual(result.first("topic"), "system")
+
+    def test_word_boundaries(self):
+        """Test keywords inside longer words do not match"""
+        matcher = KeywordMatcher()
+        matcher.add("play", "skill", "media")
+        self.assertIsNone(matcher.match("display the playback").first("skill"))
+        self.assertEqual(matcher.match("play, then stop").first("skill"), "media")
+
+    def test_priority_follows_registration_order(self):
+        """Test the earliest registered tag wins like the old dict scan"""
+        matcher = KeywordMatcher()
+        matcher.add("open", "topic", "system")
+        matcher.add("notepad", "topic", "utility")
+        self.assertEqual(matcher.match("notepad open").first("topic"), "system")
+
+    def test_incremental_add_and_discard(self):
+        """Test patterns can be added and removed after searching"""
+        matcher = KeywordMatcher()
+        matcher.add("hello", "skill", "greet")
+        self.assertEqual(matcher.match("say hello").first("skill"), "greet")
+        matcher.add("say", "skill", "speak")
+        self.assertEqual(matcher.match("say hello").values("skill"), {"greet", "speak"})
+        matcher.discard("skill", "greet")
+        self.assertEqual(matcher.match("say hello").values("skill"), {"speak"})
+
+    def test_readded_tag_ranks_last(self):
+        """Test a tag re-added after discard never ties with an existing one"""
+        matcher = KeywordMatcher()
+        matcher.add("open", "topic", "system")
+        matcher.add("play", "topic", "media")
+        matcher.discard("topic", "system")
+        matcher.add("open", "topic", "system")
+        matcher.add("file", "topic", "files")
+        result = matcher.match("open file play")
+        self.assertEqual(result.first("topic"), "media")
+        priorities = {m.value: m.priority for m in result.matches}
+        self.assertEqual(len(set(priorities.values())), 3)
+
+class TestSharedRouting(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.store = Storage(":memory:")
+        self.matcher = KeywordMatcher()
+        self.skills = SkillManager(store=self.store, matcher=self.matcher)
+        self.context = ContextManager(os.path.join(self.tmp_dir, "context.json"),
+                                      matcher=self.matcher)
+
+    def tearDown(self):
+        self.store.close()
+        shutil.rmtree(self.tmp_dir)
+
+    def test_routing_topic_and_intent_from_one_match(self):
+        """Test skills and context share one match result per utterance"""
+        self.context.update_context("what volume is the music")
+        self.assertEqual(self.skills.route("what volume is the music"), ("skill", "media_control"))
+        context = self.context.get_current_context()
+        self.assertEqual(context["conversation_topic"], "media")
+        self.assertEqual(context["user_intent"], "query")
+
+    def test_learned_skill_routes_immediately(self):
+        """Test learning a skill updates the automaton"""
+        self.assertFalse(self.skills.has_skill_for("good night jarvis"))
+        self.skills.learn_new_skill("bedtime", ["good night"], {"response": "Sleep well"})
+        self.assertTrue(self.skills.has_skill_for("good night jarvis"))
+        self.assertEqual(self.skills.execute_skill("good night jarvis"), "Sleep well")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,103 @@
+import unittest
+import sys
+import os
+import json
+
+# Add the project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core.llm_backends import LlamaCppBackend, StubBackend, create_backend
+from src.core.llm_processor import LLMProcessor
+
+class RecordingModel:
+    """llama.cpp-like callable that records the prompts it evaluates"""
+    def __init__(self):
+        self.prompts = []
+
+    def __call__(self, prompt, **kwargs):
+        self.prompts.append(prompt)
+        return {"choices": [{"text": f"answer to {prompt}"}]}
+
+class TestLLMBackends(unittest.TestCase):
+    def test_stub_backend_is_deterministic(self):
+        """Test the stub answers the same prompt identically"""
+        first = StubBackend().generate("tell me a joke")
+        second = StubBackend().generate("tell me a joke")
+        self.assertEqual(first, second)
+        self.assertNotEqual(first, StubBackend().generate("tell me a story"))
+
+    def test_stub_stream_matches_generate(self):
+        """Test streamed tokens join to the full completion"""
+        backend = StubBackend()
+        streamed = "".join(backend.generate_stream("what is python"))
+        self.assertEqual(streamed, backend.generate("what is python"))
+
+    def test_backend_selected_by_name(self):
+        """Test configuration-driven backend selection"""
+        llm = LLMProcessor("missing.gguf", backend="stub",
+                           backend_options={"responses": {"tell me a joke": "No."}})
+        response = json.loads(llm.process_query("tell me a joke"))
+        self.assertEqual(response, {"type": "conversation", "response": "No."})
+        with self.assertRaises(ValueError):
+            create_backend("unknown")
+
+    def test_llama_batch_dedupes_and_keeps_order(self):
+        """Test batch generation runs each distinct prompt once, in input order"""
+        model = RecordingModel()
+        backend = LlamaCppBackend(model=model)
+        results = backend.generate_batch(["b", "a", "b"])
+        self.assertEqual(results, ["answer to b", "answer to a", "answer to b"])
+        self.assertEqual(model.prompts, ["a", "b"])
+
+    def test_process_batch_mixes_fast_path_and_model(self):
+        """Test batch queries skip the model for quick responses"""
+        backend = StubBackend()
+        llm = LLMProcessor(None, backend=backend)
+        responses = [json.loads(r) for r in llm.process_batch(["hello", "why", "open chrome"])]
+        self.assertEqual(responses[0]["response"], "Hello! How can I help?")
+        self.assertEqual(responses[1]["type"], "conversation")
+        self.assertEqual(responses[2]["action"], "open")
+        self.assertEqual(backend.calls, 1)
+
+class TestBackgroundLoading(unittest.TestCase):
+    def test_fast_path_served_while_loading(self):
+        """Test quick responses answer at once and model queries warm up"""
+        llm = LLMProcessor(None, backend="stub", backend_options={"load_latency": 0.5},
+                           background=True, ready_timeout=0)
+        self.assertEqual(json.loads(llm.process_query("hello"))["response"],
+                         "Hello! How can I help?")
+        self.assertEqual(json.loads(llm.process_query("why"))["response"], llm.WARMING_UP)
+        self.assertEqual(list(llm.stream_query("why")), [llm.WARMING_UP])
+        self.assertFalse(llm.load_stats()["ready"])
+
+        self.assertTrue(llm.wait_ready(5))
+        self.assertNotEqual(json.loads(llm.process_query("why"))["response"], llm.WARMING_UP)
+        self.assertGreaterEqual(llm.load_stats()["load_time"], 0.5)
+
+    def test_queries_queue_until_ready(self):
+        """Test model queries wait for the load without a ready timeout"""
+        llm = LLMProcessor(None, backend="stub", backend_options={"load_latency": 0.2},
+                           background=True)
+        self.assertTrue(json.loads(llm.process_query("why"))["response"].startswith("Stub answer"))
+        self.assertTrue(llm.ready.is_set())
+
+    def test_warm_up_and_first_token(self):
+        """Test warm-up generates once and first-token latency counts queries only"""
+        backend = StubBackend()
+        llm = LLMProcessor(None, backend=backend, warmup=True)
+        self.assertEqual(backend.calls, 1)
+        self.assertIsNotNone(llm.timings["warmup_time"])
+        self.assertIsNone(llm.timings["first_token_latency"])
+        "".join(llm.stream_query("what is python"))
+        self.assertIsNotNone(llm.timings["first_token_latency"])
+
+    def test_failed_background_load(self):
+        """Test a failed load leaves the fast paths working"""
+        llm = LLMProcessor(None, backend="unknown", background=True)
+        self.assertFalse(llm.wait_ready(5))
+        self.assertIsInstance(llm.load_error, ValueError)
+        self.assertEqual(json.loads(llm.process_query("why"))["response"], llm.LOAD_FAILED)
+        self.assertEqual(json.loads(llm.process_query("open chrome"))["action"], "open")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+import unittest
+import sys
+import os
+import numpy as np
+
+# Add the project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core.ocr_pool import OCRPool, SharedFrame, split_bands
+from src.core.tile_ocr import TileOCR
+
+def blob_ocr(image):
+    """Reads each distinct non-zero gray level as one word (module level so workers can use it)"""
+    data = {'text': [], 'left': [], 'top': [], 'width': [], 'height': [], 'conf': []}
+    for value in np.unique(image):
+        if value == 0:
+            continue
+        ys, xs = np.nonzero(image == value)
+        data['text'].append(f"Word{value}")
+        data['left'].append(int(xs.min()))
+        data['top'].append(int(ys.min()))
+        data['width'].append(int(xs.max() - xs.min() + 1))
+        data['height'].append(int(ys.max() - ys.min() + 1))
+        data['conf'].append(90)
+    return data
+
+def page():
+    """Text lines every 50px, so several fall on band seams"""
+    image = np.zeros((600, 400), dtype=np.uint8)
+    for i, top in enumerate(range(10, 590, 50)):
+        image[top:top + 20, 20 + i * 10:120 + i * 10] = i + 1
+    return image
+
+class TestOCRPool(unittest.TestCase):
+    def test_split_bands_cover_frame(self):
+        bands = split_bands(600, 4, overlap=30)
+        self.assertEqual([b[:2] for b in bands], [(0, 150), (150, 300), (300, 450), (450, 600)])
+        self.assertEqual(bands[1][2:], (120, 330))
+
+    def test_shared_frame_round_trip(self):
+        image = page()
+        with SharedFrame(image) as frame:
+            name, shape, dtype = frame.info
+            self.assertEqual(shape, image.shape)
+            np.testing.assert_array_equal(frame.array, image)
+
+    def test_parallel_matches_single_call(self):
+        """Test banded parallel OCR finds each word once, with the same boxes"""
+        image = page()
+        expected = OCRPool(blob_ocr, workers=1).recognize(image)
+        with OCRPool(blob_ocr, workers=2, overlap=30, min_parallel_pixels=0) as pool:
+            words = pool.recognize(image, bands=5)
+        self.assertEqual(len(words), 12)
+        self.assertEqual([(w['text'], w['bounds']) for w in words],
+                         [(w['text'], w['bounds']) for w in expected])
+
+    def test_seam_duplicates_removed(self):
+        """Test a word inside two overlapping bands is kept by one of them"""
+        image = np.zeros((200, 100), dtype=np.uint8)
+        image[95:110, 10:60] = 7  # straddles the seam at y=100
+        pool = OCRPool(blob_ocr, workers=1, overlap=40)
+        words = pool.recognize(image, bands=2)
+        self.assertEqual([w['bounds'] for w in words], [(10, 95, 50, 15)])
+
+    def test_tile_ocr_batches_through_pool(self):
+        with OCRPool(blob_ocr, workers=2, min_parallel_pixels=0) as pool:
+            tiles = TileOCR(blob_ocr, tile_size=200, margin=40, ocr_regions=pool.ocr_regions)
+            screen_map = tiles.analyze(page())
+        self.assertEqual(len(screen_map), 12)
+        self.assertEqual(screen_map["word1"]["bounds"], (20, 10, 100, 20))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,131 @@
+import unittest
+import pickle
+import sys
+import os
+import numpy as np
+
+# Add the project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core.ocr_preprocess import (PreprocessedOCR, TextPreprocessor, merge_boxes,
+                                     otsu_threshold, resize, text_boxes, to_gray)
+from src.core.tile_ocr import TileOCR
+
+def draw_word(image, x, y, w, h, value):
+    """Sparse vertical strokes, so a "word" has text-like ink coverage"""
+    for left in range(x, x + w, 4):
+        image[y:y + h, left:min(left + 2, x + w)] = value
+
+def band_ocr(image):
+    """Reads each dark horizontal band of a (mosaic) image as one word"""
+    data = {'text': [], 'left': [], 'top': [], 'width': [], 'height': [], 'conf': []}
+    dark = image < 128
+    rows = np.flatnonzero(dark.any(axis=1))
+    if not len(rows):
+        return data
+    splits = np.flatnonzero(np.diff(rows) > 1) + 1
+    for band in np.split(rows, splits):
+        cols = np.flatnonzero(dark[band[0]:band[-1] + 1].any(axis=0))
+        data['text'].append(f"word{len(data['text'])}")
+        data['left'].append(int(cols[0]))
+        data['top'].append(int(band[0]))
+        data['width'].append(int(cols[-1] - cols[0] + 1))
+        data['height'].append(int(band[-1] - band[0] + 1))
+        data['conf'].append(90)
+    return data
+
+def screen():
+    """Small and large dark text on light, and light text on a dark panel"""
+    image = np.full((240, 320), 235, dtype=np.uint8)
+    draw_word(image, 20, 20, 80, 10, 30)
+    draw_word(image, 150, 60, 120, 40, 20)
+    image[150:220, :] = 40
+    draw_word(image, 40, 170, 100, 16, 250)
+    return image
+
+class TestPreprocessing(unittest.TestCase):
+    def test_to_gray_channel_order(self):
+        """Test screenshots are treated as RGB and OpenCV images as BGR"""
+        red = np.zeros((1, 1, 3), dtype=np.uint8)
+        red[..., 0] = 255
+        self.assertEqual(to_gray(red, "RGB")[0, 0], 76)
+        self.assertEqual(to_gray(red, "BGR")[0, 0], 29)
+        rgba = np.dstack([red, np.zeros((1, 1, 1), dtype=np.uint8)])
+        self.assertEqual(to_gray(rgba)[0, 0], 76)
+        with self.assertRaises(ValueError):
+            to_gray(red, "HSV")
+
+    def test_otsu_and_resize(self):
+        image = np.array([[10, 10, 200, 200]], dtype=np.uint8)
+        self.assertTrue(10 <= otsu_threshold(image) < 200)
+        self.assertEqual(resize(np.zeros((10, 20), dtype=np.uint8), 2.5).shape, (25, 50))
+
+    def test_text_boxes_close_glyph_gaps(self):
+        mask = np.zeros((60, 400), dtype=bool)
+        mask[10:20, 10:30] = mask[10:20, 34:60] = True
+        mask[30:40, 100:120] = True
+        self.assertEqual(text_boxes(mask, join=8), [(10, 10, 50, 10), (100, 30, 20, 10)])
+        self.assertEqual(merge_boxes([(0, 0, 10, 10), (12, 0, 10, 10)], padding=2,
+                                     bounds=(100, 100)), [(0, 0, 24, 12)])
+
+    def test_panel_edges_not_proposed(self):
+        image = np.full((100, 300), 235, dtype=np.uint8)
+        image[50:, :] = 40
+        image[:, 200:] = 120
+        self.assertEqual(TextPreprocessor().propose(image), [])
+
+    def test_panel_border_does_not_join_lines(self):
+        """Test text lines inside a bordered panel are proposed one by one"""
+        image = np.full((300, 400), 235, dtype=np.uint8)
+        image[40:260, 40:360] = 160
+        for top in (46, 90, 134, 178):
+            draw_word(image, 44, top, 200, 12, 30)
+        boxes = TextPreprocessor().propose(image)
+        self.assertEqual(len(boxes), 4)
+        self.assertTrue(all(h < 24 for _, _, _, h in boxes))
+
+    def test_dense_small_text_reads_whole_image(self):
+        """Test OCR gets the image itself when rescaled regions would be larger"""
+        image = np.full((120, 400), 235, dtype=np.uint8)
+        for top in range(4, 110, 14):
+            draw_word(image, 4, top, 390, 8, 30)
+        mosaic, slots = TextPreprocessor(target_height=32).prepare(image)
+        self.assertEqual(mosaic.shape, image.shape)
+        self.assertEqual(slots, [(0, 0, 400, 120, 0, 0, 1.0)])
+
+    def test_regions_rescaled_and_polarity_fixed(self):
+        mosaic, slots = TextPreprocessor(target_height=32).prepare(screen())
+        self.assertEqual(len(slots), 3)
+        scales = sorted(slot[6] for slot in slots)
+        self.assertAlmostEqual(scales[0], 32 / 40)
+        self.assertAlmostEqual(scales[-1], 32 / 10)
+        self.assertEqual(set(np.unique(mosaic)), {0, 255})
+        # Every slot is mostly white background, including the dark panel
+        for left, top, width, height, *_ in slots:
+            self.assertGreater(mosaic[top:top + height, left:left + width].mean(), 127)
+
+    def test_words_mapped_to_image_coordinates(self):
+        data = PreprocessedOCR(band_ocr)(screen())
+        boxes = sorted(zip(data['top'], data['left'], data['height'], data['width']))
+        expected = [(20, 20, 10, 78), (60, 150, 40, 118), (170, 40, 16, 98)]
+        self.assertEqual(len(boxes), 3)
+        for box, want in zip(boxes, expected):
+            for got, value in zip(box, want):
+                self.assertLessEqual(abs(got - value), 2)
+
+    def test_blank_image_skips_ocr(self):
+        def fail(image):
+            raise AssertionError("OCR called on a blank image")
+        data = PreprocessedOCR(fail)(np.full((100, 100), 200, dtype=np.uint8))
+        self.assertEqual(data['text'], [])
+
+    def test_tile_ocr_through_preprocessing(self):
+        ocr_fn = pickle.loads(pickle.dumps(PreprocessedOCR(band_ocr)))
+        tiles = TileOCR(ocr_fn, tile_size=160, margin=40)
+        tiles.analyze(screen())
+        centres = sorted(w['position'] for w in tiles.words())
+        self.assertEqual(len(centres), 3)
+        self.assertLessEqual(abs(centres[0][0] - 59) + abs(centres[0][1] - 25), 3)
+
+if __name__ == '__main__':
+    unittest.main()
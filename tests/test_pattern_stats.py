@@ -0,0 +1,48 @@
+import unittest
+import sys
+import os
+
+# Add the project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core.pattern_stats import PatternStats, SpaceSaving, SlidingWindowRate
+
+class TestPatternStats(unittest.TestCase):
+    def test_space_saving_is_bounded(self):
+        """Test heavy hitters survive a long tail of distinct items"""
+        top = SpaceSaving(k=5)
+        for i in range(1000):
+            top.add("open chrome")
+            top.add(f"rare command {i}")
+        self.assertEqual(len(top), 5)
+        self.assertEqual(top.top(1)[0][0], "open chrome")
+        self.assertGreaterEqual(top.top(1)[0][1], 1000)
+
+    def test_sliding_window_rate(self):
+        """Test the window forgets outcomes older than its size"""
+        window = SlidingWindowRate(size=4)
+        for success in (False, False, True, True, True, True):
+            window.add(success)
+        self.assertEqual(window.rate, 1.0)
+
+    def test_running_totals_and_rates(self):
+        """Test totals and per-command rates are kept incrementally"""
+        stats = PatternStats(top_k=10)
+        stats.record("Open Chrome", True)
+        stats.record("open chrome", False)
+        stats.record("play music", True)
+        self.assertEqual(stats.total, 3)
+        self.assertAlmostEqual(stats.success_rate(), 2 / 3)
+        self.assertAlmostEqual(stats.success_rate("open chrome"), 0.5)
+        self.assertEqual(stats.top(1), {"open chrome": 2})
+        self.assertEqual(stats.success_rate("never seen"), 0)
+
+    def test_empty_stats(self):
+        """Test analytics on an empty store do not divide by zero"""
+        stats = PatternStats()
+        self.assertEqual(stats.success_rate(), 0)
+        self.assertEqual(stats.recent_success_rate, 0)
+        self.assertEqual(stats.top(), {})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+import unittest
+import sys
+import os
+import threading
+import time
+
+# Add the project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core.pipeline import AssistantPipeline
+
+class TestAssistantPipeline(unittest.TestCase):
+    def test_text_only_pipeline(self):
+        """Test commands flow through every stage without audio hardware"""
+        persisted = []
+        pipeline = AssistantPipeline([
+            ("routing", lambda text: {"command": text, "response": text.upper()}),
+            ("synthesis", lambda result: result),
+            ("persistence", lambda result: persisted.append(result["response"]))
+        ])
+        self.assertTrue(pipeline.text_only)
+        pipeline.start()
+        for command in ("hello", "open chrome", "bye"):
+            pipeline.submit(command)
+        pipeline.stop(drain=True)
+        self.assertEqual(persisted, ["HELLO", "OPEN CHROME", "BYE"])
+        self.assertEqual(pipeline.metrics()["routing"]["processed"], 3)
+
+    def test_stages_overlap(self):
+        """Test routing keeps working while synthesis is busy"""
+        speaking = threading.Event()
+        routed_while_speaking = []
+
+        def route(text):
+            routed_while_speaking.append(speaking.is_set())
+            return text
+
+        def speak(text):
+            speaking.set()
+            time.sleep(0.2)
+            return None
+
+        pipeline = AssistantPipeline([("routing", route), ("synthesis", speak)])
+        pipeline.start()
+        pipeline.submit("first")
+        self.assertTrue(speaking.wait(1.0))
+        pipeline.submit("second")
+        pipeline.stop(drain=True)
+        self.assertEqual(routed_while_speaking, [False, True])
+        self.assertGreaterEqual(pipeline.metrics()["synthesis"]["max_queue_depth"], 1)
+
+    def test_source_feeds_first_stage(self):
+        """Test the capture source is polled until the pipeline stops"""
+        frames = iter(["a", None, "b"])
+        seen = []
+        pipeline = AssistantPipeline([("recognition", seen.append)],
+                                     source=lambda: next(frames, None))
+        pipeline.start()
+        deadline = time.time() + 1.0
+        while len(seen) < 2 and time.time() < deadline:
+            time.sleep(0.01)
+        pipeline.stop()
+        self.assertEqual(seen, ["a", "b"])
+
+    def test_stage_errors_reported(self):
+        """Test a failing handler is counted and reported, not fatal"""
+        errors = []
+
+        def route(text):
+            if text == "bad":
+                raise ValueError("boom")
+            return None
+
+        pipeline = AssistantPipeline([("routing", route)])
+        pipeline.set_error_handler(lambda stage, item, error: errors.append((stage, item)))
+        pipeline.start()
+        pipeline.submit("bad")
+        pipeline.submit("good")
+        pipeline.stop(drain=True)
+        self.assertEqual(errors, [("routing", "bad")])
+        self.assertEqual(pipeline.metrics()["routing"]["errors"], 1)
+        self.assertEqual(pipeline.metrics()["routing"]["processed"], 1)
+
+if __name__ == '__main__':
+    unittest.main()
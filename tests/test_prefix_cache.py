@@ -0,0 +1,90 @@
+import unittest
+import sys
+import os
+import shutil
+import tempfile
+
+# Add the project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core.prefix_cache import PrefixStateCache
+from src.core.llm_processor import LLMProcessor
+
+class StubStatefulModel:
+    """Mimics llama.cpp token evaluation, prefix matching and state saving"""
+    def __init__(self):
+        self.input_ids = []
+        self.n_tokens = 0
+        self.evaluated = 0
+
+    def tokenize(self, text):
+        return [ord(c) for c in text.decode("utf-8")]
+
+    def reset(self):
+        self.n_tokens = 0
+
+    def eval(self, tokens):
+        self.input_ids = self.input_ids[:self.n_tokens] + list(tokens)
+        self.n_tokens = len(self.input_ids)
+        self.evaluated += len(tokens)
+
+    def save_state(self):
+        return list(self.input_ids[:self.n_tokens])
+
+    def load_state(self, state):
+        self.input_ids = list(state)
+        self.n_tokens = len(state)
+
+    def __call__(self, prompt, **kwargs):
+        tokens = self.tokenize(prompt.encode("utf-8"))
+        shared = 0
+        for a, b in zip(self.input_ids[:self.n_tokens], tokens):
+            if a != b:
+                break
+            shared += 1
+        self.n_tokens = shared
+        self.eval(tokens[shared:])
+        return {"choices": [{"text": "ok"}]}
+
+class TestPrefixCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.prompt = "You are a test assistant.\n"
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_prefix_evaluated_once(self):
+        """Test later queries only evaluate their suffix"""
+        model = StubStatefulModel()
+        llm = LLMProcessor("stub.gguf", model=model, system_prompt=self.prompt)
+        self.assertEqual(model.evaluated, len(self.prompt))
+        llm.process_query("tell me a joke")
+        before = model.evaluated
+        llm.process_query("what is python")
+        suffix = len("User: what is python\nAssistant:")
+        self.assertLessEqual(model.evaluated - before, suffix)
+        self.assertEqual(llm.prefix_stats()["misses"], 1)
+        self.assertEqual(llm.prefix_stats()["resident_hits"], 2)
+
+    def test_state_restored_from_memory(self):
+        """Test a saved state is restored after the KV cache was replaced"""
+        model = StubStatefulModel()
+        cache = PrefixStateCache(model)
+        cache.prepare(self.prompt)
+        model.reset()
+        model.eval(model.tokenize(b"something else"))
+        self.assertEqual(cache.prepare(self.prompt), "memory")
+        self.assertEqual(model.save_state(), model.tokenize(self.prompt.encode()))
+
+    def test_state_persisted_across_restarts(self):
+        """Test a new process loads the prefix state from disk"""
+        PrefixStateCache(StubStatefulModel(), "stub", self.tmp_dir).prepare(self.prompt)
+        model = StubStatefulModel()
+        cache = PrefixStateCache(model, "stub", self.tmp_dir)
+        self.assertEqual(cache.prepare(self.prompt), "disk")
+        self.assertEqual(model.evaluated, 0)
+        self.assertEqual(cache.get_stats()["hit_rate"], 1.0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+import unittest
+import sys
+import os
+import time
+
+# Add the project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core.recognizer_engines import EnginePool, StubEngine
+
+class TestEnginePool(unittest.TestCase):
+    def setUp(self):
+        self.pools = []
+
+    def tearDown(self):
+        for pool in self.pools:
+            pool.close()
+
+    def pool(self, engines, **kwargs):
+        pool = EnginePool(engines, **kwargs)
+        self.pools.append(pool)
+        return pool
+
+    def test_fastest_engine_wins(self):
+        """Test a slow primary no longer delays a fast fallback"""
+        slow = StubEngine("google", "open chrome", delay=1.0)
+        fast = StubEngine("sphinx", "open chrome", confidence=0.6, delay=0.02)
+        pool = self.pool([slow, fast], adaptive=False)
+        started = time.perf_counter()
+        result = pool.recognize(b"audio")
+        self.assertLess(time.perf_counter() - started, 0.5)
+        self.assertEqual(result.engine, "sphinx")
+        self.assertEqual(result.text, "open chrome")
+
+    def test_losers_are_cancelled(self):
+        slow = StubEngine("slow", "text", delay=1.0)
+        pool = self.pool([StubEngine("fast", "text", delay=0.05), slow], adaptive=False)
+        pool.recognize(b"audio")
+        deadline = time.time() + 1.0
+        while not slow.cancelled and time.time() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(slow.cancelled, 1)
+        self.assertEqual(pool.stats()["slow"]["cancelled"], 1)
+
+    def test_best_mode_picks_highest_confidence(self):
+        """Test best mode waits for every engine within the deadline"""
+        pool = self.pool([
+            StubEngine("quick", "open crome", confidence=0.4, delay=0.01),
+            StubEngine("careful", "open chrome", confidence=0.9, delay=0.1)
+        ], mode="best", deadline=1.0)
+        self.assertEqual(pool.recognize(b"audio").text, "open chrome")
+
+    def test_deadline_and_confidence_floor(self):
+        """Test low-confidence and late answers are rejected"""
+        pool = self.pool([
+            StubEngine("unsure", "maybe", confidence=0.1),
+            StubEngine("late", "too late", delay=1.0)
+        ], deadline=0.1, min_confidence=0.3)
+        self.assertIsNone(pool.recognize(b"audio"))
+
+    def test_errors_fall_through(self):
+        """Test a failing engine does not hide a working one"""
+        pool = self.pool([
+            StubEngine("offline", error=ConnectionError("no network")),
+            StubEngine("local", "hello", delay=0.05)
+        ])
+        self.assertEqual(pool.recognize(b"audio").engine, "local")
+        self.assertEqual(pool.stats()["offline"]["errors"], 1)
+
+    def test_hedge_delay_spares_backups(self):
+        """Test backups only start when the primary misses its head start"""
+        primary = StubEngine("primary", "hi", delay=0.01)
+        backup = StubEngine("backup", "hi")
+        pool = self.pool([primary, backup], hedge_delay=0.5, adaptive=False)
+        self.assertEqual(pool.recognize(b"audio").engine, "primary")
+        self.assertEqual(backup.calls, 0)
+
+        primary.delay = 1.0
+        started = time.perf_counter()
+        self.assertEqual(pool.recognize(b"audio").engine, "backup")
+        self.assertLess(time.perf_counter() - started, 0.9)
+
+    def test_adaptive_ordering(self):
+        """Test engines are re-ranked by observed latency and errors"""
+        flaky = StubEngine("flaky", error=RuntimeError("timeout"), delay=0.05)
+        steady = StubEngine("steady", "ok", delay=0.01)
+        pool = self.pool([flaky, steady], hedge_delay=0.2)
+        self.assertEqual([e.name for e in pool.ranked()], ["flaky", "steady"])
+        pool.recognize(b"audio")
+        self.assertEqual([e.name for e in pool.ranked()], ["steady", "flaky"])
+        self.assertEqual(pool.recognize(b"audio").engine, "steady")
+        self.assertEqual(flaky.calls, 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+import unittest
+import sys
+import os
+from unittest.mock import patch
+
+# Add the project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core.response_cache import ResponseCache
+
+class TestResponseCache(unittest.TestCase):
+    def setUp(self):
+        """Create a small cache before each test"""
+        self.cache = ResponseCache(max_entries=3, ttl=60)
+
+    def test_exact_hit(self):
+        """Test exact lookup returns the cached response"""
+        self.cache.put("Open Chrome", "Opening chrome")
+        self.assertEqual(self.cache.get("open chrome"), "Opening chrome")
+        self.assertEqual(self.cache.stats()["hits"], 1)
+
+    def test_similar_hit(self):
+        """Test fuzzy lookup through the n-gram index"""
+        self.cache.put("open the chrome browser", "Opening chrome")
+        self.assertEqual(self.cache.get("open the chrome browsers"), "Opening chrome")
+
+    def test_miss(self):
+        """Test unrelated commands miss"""
+        self.cache.put("open chrome", "Opening chrome")
+        self.assertIsNone(self.cache.get("play some music"))
+        self.assertEqual(self.cache.stats()["misses"], 1)
+
+    def test_time_sensitive_not_cached(self):
+        """Test time-sensitive commands are never cached"""
+        self.assertFalse(self.cache.put("what time is it", "It is noon"))
+        self.assertIsNone(self.cache.get("what time is it"))
+
+    def test_lru_eviction(self):
+        """Test least recently used entry is evicted at capacity"""
+        self.cache.put("open chrome", "a")
+        self.cache.put("open notepad", "b")
+        self.cache.put("open calculator", "c")
+        self.cache.get("open chrome")
+        self.cache.put("open paint", "d")
+        self.assertIn("open chrome", self.cache)
+        self.assertNotIn("open notepad", self.cache)
+        self.assertEqual(len(self.cache), 3)
+        self.assertEqual(self.cache.stats()["evictions"], 1)
+
+    def test_ttl_expiry(self):
+        """Test entries expire after the TTL"""
+        with patch("src.core.response_cache.time.time", return_value=1000.0):
+            self.cache.put("open chrome", "Opening chrome")
+        with patch("src.core.response_cache.time.time", return_value=1100.0):
+            self.assertIsNone(self.cache.get("open chrome"))
+        self.assertEqual(len(self.cache), 0)
+        self.assertEqual(self.cache.index, {})
+
+if __name__ == '__main__':
+    unittest.main()
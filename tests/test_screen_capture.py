@@ -0,0 +1,97 @@
+import unittest
+import sys
+import os
+import tempfile
+import threading
+import time
+from unittest import mock
+import numpy as np
+
+# Add the project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core import screen_capture
+from src.core.screen_capture import ArraySource, Frame, ImageFileSource, ScreenCapture, make_source
+
+def screen(value=200):
+    image = np.full((100, 200, 3), value, dtype=np.uint8)
+    image[10:20, 30:60] = (255, 0, 0)
+    return image
+
+class TestScreenCapture(unittest.TestCase):
+    def test_fresh_frame_shared(self):
+        """Test readers within max_age share one capture"""
+        capture = ScreenCapture(ArraySource([screen(), screen(50)]), max_age=10)
+        first = capture.grab()
+        window = capture.grab((20, 5, 50, 30))
+        self.assertEqual(capture.stats()["captures"], 1)
+        self.assertEqual(capture.stats()["reused"], 1)
+        self.assertTrue(np.shares_memory(first.image, window.image))
+        self.assertEqual(window.origin, (20, 5))
+        self.assertEqual(window.shape, (30, 50, 3))
+
+    def test_stale_frame_recaptured(self):
+        capture = ScreenCapture(ArraySource([screen(), screen(50)]), max_age=0)
+        capture.grab()
+        self.assertEqual(capture.grab().image[0, 0, 0], 50)
+        self.assertEqual(capture.stats()["captures"], 2)
+
+    def test_invalidate(self):
+        source = ArraySource(screen())
+        capture = ScreenCapture(source, max_age=10)
+        capture.grab()
+        source.set_frame(screen(50))
+        capture.invalidate()
+        self.assertEqual(capture.grab().image[0, 0, 0], 50)
+
+    def test_frames_read_only(self):
+        frame = ScreenCapture(ArraySource(screen()), max_age=10).grab()
+        with self.assertRaises(ValueError):
+            frame.image[0, 0] = 0
+
+    def test_crop_clipped_and_gray_shared(self):
+        frame = Frame(screen(), "RGB", origin=(100, 50))
+        crop = frame.crop((90, 40, 100, 30))
+        self.assertEqual(crop.region, (100, 50, 90, 20))
+        inner = crop.crop((130, 60, 30, 10))
+        self.assertEqual(inner.gray()[0, 0], 76)  # red is converted as RGB
+        self.assertTrue(np.shares_memory(inner.gray(), frame.gray()))
+        self.assertEqual(frame.crop((500, 500, 10, 10)).shape[:2], (0, 0))
+
+    def test_channel_order_from_source(self):
+        bgr = ScreenCapture(ArraySource(screen(), order="BGR"), max_age=10).grab()
+        self.assertEqual(bgr.crop((30, 10, 1, 1)).gray()[0, 0], 29)
+
+    def test_image_file_source(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "screen.npy")
+            np.save(path, screen())
+            source = ImageFileSource(path)
+            self.assertEqual(source.grab()[0].shape, (100, 200, 3))
+            np.save(path, screen(50)[:50])
+            os.utime(path, (time.time() + 5, time.time() + 5))
+            self.assertEqual(source.grab()[0].shape, (50, 200, 3))
+
+    def test_unknown_backend(self):
+        with self.assertRaises(ValueError):
+            make_source("vnc")
+
+    def test_shared_capture_created_once(self):
+        def slow_source(backend):
+            time.sleep(0.05)
+            return ArraySource(np.zeros((4, 4, 3), dtype=np.uint8))
+
+        services = []
+        with mock.patch.object(screen_capture, "_capture", None), \
+                mock.patch.object(screen_capture, "make_source", slow_source):
+            threads = [threading.Thread(target=lambda: services.append(screen_capture.get_capture()))
+                       for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        self.assertEqual(len(services), 4)
+        self.assertTrue(all(service is services[0] for service in services))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+import unittest
+import sys
+import os
+import time
+
+# Add the project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core.screen_map import ScreenElement, ScreenMap
+
+def word(text, x, y, w=None, h=20, conf=90):
+    return ScreenElement(text, (x, y, w or 10 * len(text), h), conf)
+
+def dialog():
+    """A save dialog: menu bar, two labelled fields and buttons"""
+    return [
+        word("File", 10, 5), word("Edit", 60, 5), word("Save", 110, 5), word("As", 155, 5),
+        word("Name", 20, 100), word("OK", 300, 100),
+        word("Folder", 20, 200), word("OK", 300, 200),
+        word("Save", 400, 400), word("Cancel", 500, 400)
+    ]
+
+class TestScreenMap(unittest.TestCase):
+    def setUp(self):
+        self.map = ScreenMap(dialog(), cell_size=64)
+
+    def test_duplicates_are_kept(self):
+        """Test repeated words no longer overwrite each other"""
+        self.assertEqual(len(self.map.find_all("ok")), 2)
+        self.assertEqual(len(self.map.find_all("save")), 2)
+
+    def test_multi_word_phrase(self):
+        """Test phrases spanning several OCR words are found"""
+        element = self.map.find("save as")
+        self.assertEqual(element.kind, "phrase")
+        self.assertEqual(element.bounds, (110, 5, 65, 20))
+        self.assertIsNone(self.map.find("as save"))
+        self.assertIn("file edit save as", self.map.to_dict())
+
+    def test_prefix_and_fuzzy(self):
+        self.assertEqual(self.map.find("canc").text, "Cancel")
+        self.assertEqual(self.map.find("fodler").text, "Folder")
+        self.assertEqual(self.map.find("save a").text, "Save As")
+        self.assertIsNone(self.map.find("print"))
+
+    def test_region_queries(self):
+        """Test region filtering, e.g. restricting lookups to a window"""
+        bottom = (380, 380, 300, 60)
+        self.assertEqual(self.map.find("save", region=bottom).bounds[:2], (400, 400))
+        self.assertEqual([w.text for w in self.map.in_region(bottom)], ["Save", "Cancel"])
+        self.assertEqual(self.map.in_region((0, 300, 50, 50)), [])
+
+    def test_near(self):
+        """Test "the OK near Folder" picks the right duplicate"""
+        self.assertEqual(self.map.near("folder", "ok").bounds[:2], (300, 200))
+        self.assertEqual(self.map.near("name", "ok").bounds[:2], (300, 100))
+        self.assertEqual(self.map.near("cancel").text, "Save")
+        self.assertIsNone(self.map.near("name", "ok", max_distance=100))
+
+    def test_nearest_point(self):
+        self.assertEqual(self.map.nearest((5, 5)).text, "File")
+        self.assertEqual(self.map.nearest((900, 900)).text, "Cancel")
+        self.assertIsNone(ScreenMap([]).nearest((0, 0)))
+
+    def test_freshness(self):
+        stale = ScreenMap(dialog(), ttl=1.0, captured_at=time.time() - 5)
+        self.assertFalse(stale.fresh)
+        self.assertTrue(self.map.fresh)
+
+    def test_from_ocr_words(self):
+        words = [{'text': 'Open', 'bounds': (0, 0, 40, 20), 'confidence': 80,
+                  'position': (20, 10)}]
+        screen_map = ScreenMap.from_ocr_words(words)
+        self.assertEqual(screen_map.to_dict()["open"]["position"], (20, 10))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+import unittest
+import sys
+import os
+import time
+
+# Add the project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core.sentence_stream import SentenceSegmenter, segment_stream, stream_to_speech
+from src.core.llm_processor import LLMProcessor
+
+class StubStreamingModel:
+    """Emits a fixed completion token by token with a delay per token"""
+    def __init__(self, text, delay=0.0):
+        self.tokens = [token + " " for token in text.split(" ")]
+        self.delay = delay
+
+    def __call__(self, prompt, stream=False, **kwargs):
+        if not stream:
+            return {"choices": [{"text": "".join(self.tokens)}]}
+        return self._stream()
+
+    def _stream(self):
+        for token in self.tokens:
+            time.sleep(self.delay)
+            yield {"choices": [{"text": token}]}
+
+class TestSentenceStream(unittest.TestCase):
+    def test_segmenter_splits_sentences(self):
+        """Test sentences are emitted as soon as they are complete"""
+        segmenter = SentenceSegmenter()
+        self.assertEqual(segmenter.feed("Hello there. How"), ["Hello there."])
+        self.assertEqual(segmenter.feed(" are you? Fine"), ["How are you?"])
+        self.assertEqual(segmenter.flush(), ["Fine"])
+
+    def test_segmenter_keeps_decimals(self):
+        """Test numbers with a decimal point are not split"""
+        segments = list(segment_stream(["It costs 3", ".5 dollars", ". Thanks"]))
+        self.assertEqual(segments, ["It costs 3.5 dollars.", "Thanks"])
+
+    def test_segmenter_splits_long_clauses(self):
+        """Test long clauses are spoken before the sentence ends"""
+        segmenter = SentenceSegmenter(min_clause_chars=20)
+        segments = segmenter.feed("First of all this is a long clause, and then")
+        self.assertEqual(segments, ["First of all this is a long clause,"])
+
+    def test_llm_stream_query(self):
+        """Test the processor streams stub model output by sentence"""
+        llm = LLMProcessor(None, model=StubStreamingModel("One two. Three four!"))
+        self.assertEqual(list(llm.stream_query("tell me")), ["One two.", "Three four!"])
+
+    def test_time_to_first_audio(self):
+        """Test speech starts before generation finishes"""
+        text = "First sentence here. " + " ".join(["word"] * 20) + "."
+        llm = LLMProcessor(None, model=StubStreamingModel(text, delay=0.01))
+        spoken_at = []
+        full_text, metrics = stream_to_speech(
+            llm.stream_query("tell me"), lambda segment: spoken_at.append(time.perf_counter())
+        )
+        self.assertEqual(metrics["segments"], 2)
+        self.assertTrue(full_text.startswith("First sentence here."))
+        self.assertLess(metrics["time_to_first_audio"], metrics["total_time"] / 2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,145 @@
+import unittest
+import sys
+import os
+import json
+import tempfile
+import time
+
+# Add the project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.session_replay import (STAGES, StageTimer, build_assistant, close_assistant,
+                                       load_utterances, percentile, run)
+
+LATENCIES = {"recognition": 0.0, "llm": 0.0, "token": 0.0, "synthesis": 0.0, "ui": 0.0,
+             "skill": 0.0}
+
+class TestSessionReplay(unittest.TestCase):
+    def test_load_corpus_formats(self):
+        """Test histories, memory states and JSONL corpora give the commands"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            history = os.path.join(temp_dir, "history.json")
+            with open(history, "w") as f:
+                json.dump([{"command": "open chrome"}, {"command": ""}], f)
+            memory = os.path.join(temp_dir, "memory.json")
+            with open(memory, "w") as f:
+                json.dump({"interactions": [{"command": "hello"}]}, f)
+            corpus = os.path.join(temp_dir, "corpus.jsonl")
+            with open(corpus, "w") as f:
+                f.write('{"text": "what time is it"}\n"mute"\n\n')
+
+            self.assertEqual(load_utterances(history), ["open chrome"])
+            self.assertEqual(load_utterances(memory), ["hello"])
+            self.assertEqual(load_utterances(corpus), ["what time is it", "mute"])
+
+    def test_percentile(self):
+        """Test percentiles interpolate between ranks"""
+        values = [4, 1, 3, 2]
+        self.assertEqual(percentile(values, 0), 1)
+        self.assertEqual(percentile(values, 50), 2.5)
+        self.assertEqual(percentile(values, 100), 4)
+        self.assertIsNone(percentile([], 50))
+
+    def test_replay_reports_every_stage(self):
+        """Test a replay covers the routing paths and leaves the cwd alone"""
+        cwd = os.getcwd()
+        utterances = ["open chrome", "mute", "why is the sky blue", "hello"]
+        report = run(utterances, LATENCIES, passes=2)
+        self.assertEqual(os.getcwd(), cwd)
+        self.assertEqual(report["counters"]["utterances"], 8)
+        self.assertEqual(report["counters"]["errors"], 0)
+        self.assertGreater(report["counters"]["cached"], 0)
+        for stage in ("context", "cache", "skill_routing", "skill", "ui", "llm",
+                      "persistence", "total"):
+            self.assertIn(stage, report["stages"])
+        self.assertTrue(set(report["stages"]) <= set(STAGES))
+        stats = report["stages"]["total"]
+        self.assertLessEqual(stats["p50_ms"], stats["p95_ms"])
+        self.assertLessEqual(stats["p95_ms"], stats["p99_ms"])
+        json.dumps(report)
+
+    def test_actions_are_not_cached(self):
+        """Test repeated skills and UI commands run again; model answers are cached"""
+        report = run(["open chrome", "mute", "why is the sky blue"], LATENCIES, passes=2)
+        self.assertEqual(report["counters"]["cached"], 1)
+        self.assertEqual(report["counters"]["skills"], 2)
+        self.assertEqual(report["counters"]["processor"], 3)
+
+    def test_routing_overlaps_synthesis(self):
+        """Test the next command runs while the previous answer is still generating"""
+        cwd = os.getcwd()
+        with tempfile.TemporaryDirectory() as temp_dir:
+            os.chdir(temp_dir)
+            try:
+                assistant = build_assistant(dict(LATENCIES, llm=0.5), StageTimer())
+                events = []
+                execute = assistant.processor.ui_controller.execute_command
+                speak_result = assistant.speak_result
+
+                def execute_command(action, parameters):
+                    events.append(("ui", time.perf_counter()))
+                    return execute(action, parameters)
+
+                def timed_speak_result(result):
+                    result = speak_result(result)
+                    events.append(("spoken", time.perf_counter()))
+                    return result
+
+                assistant.processor.ui_controller.execute_command = execute_command
+                assistant.speak_result = timed_speak_result
+                assistant.pipeline = assistant.build_pipeline()
+                assistant.pipeline.start()
+                assistant.pipeline.submit("why is the sky blue")
+                assistant.pipeline.submit("open chrome")
+                self.assertTrue(assistant.pipeline.drain(5.0))
+                close_assistant(assistant)
+            finally:
+                os.chdir(cwd)
+        # The UI command ran in the routing stage before the synthesis stage
+        # had finished the model's answer to the first utterance
+        self.assertEqual([name for name, _ in events], ["ui", "spoken", "spoken"])
+
+    def test_warming_up_replies_not_persisted(self):
+        """Test a reply from a model still loading is not recorded as a failure"""
+        cwd = os.getcwd()
+        with tempfile.TemporaryDirectory() as temp_dir:
+            os.chdir(temp_dir)
+            try:
+                assistant = build_assistant(LATENCIES, StageTimer())
+                assistant.persist_result({"command": "why is the sky blue",
+                                          "response": assistant.llm.WARMING_UP})
+                assistant.persist_result({"command": "what time is it", "response": "Noon."})
+                history = assistant.store.count_interactions("history")
+                cached = assistant.response_cache.get("why is the sky blue")
+                close_assistant(assistant)
+            finally:
+                os.chdir(cwd)
+        self.assertEqual(history, 1)
+        self.assertIsNone(cached)
+
+    def test_own_speech_is_echo(self):
+        """Test phrases heard while or just after the assistant speaks are dropped"""
+        cwd = os.getcwd()
+        with tempfile.TemporaryDirectory() as temp_dir:
+            os.chdir(temp_dir)
+            try:
+                assistant = build_assistant(dict(LATENCIES, synthesis=0.2), StageTimer())
+                before = time.time()
+                assistant.synthesizer.say("Opening chrome.")
+                time.sleep(0.05)
+                during = assistant.is_echo(time.time() - 0.05, time.time())
+                assistant.synthesizer.worker.wait(timeout=2.0)
+                stopped = time.time()
+                tail = assistant.is_echo(stopped + 0.1, stopped + 1.0)
+                later = assistant.is_echo(stopped + 5.0, stopped + 6.0)
+                earlier = assistant.is_echo(before - 3.0, before - 2.0)
+                close_assistant(assistant)
+            finally:
+                os.chdir(cwd)
+        self.assertTrue(during)
+        self.assertTrue(tail)
+        self.assertFalse(later)
+        self.assertFalse(earlier)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,116 @@
+import unittest
+import sys
+import os
+import threading
+import time
+
+# Add the project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core.speech_worker import LOW, URGENT, SpeechWorker
+
+class FakeTTS:
+    """Records spoken chunks; each takes `seconds` unless stopped"""
+    def __init__(self, seconds=0.0):
+        self.seconds = seconds
+        self.spoken = []
+        self.stopped = threading.Event()
+
+    def speak(self, text):
+        self.stopped.clear()
+        self.stopped.wait(self.seconds)
+        self.spoken.append(text)
+
+    def stop(self):
+        self.stopped.set()
+
+class TestSpeechWorker(unittest.TestCase):
+    def setUp(self):
+        self.tts = FakeTTS()
+        self.worker = SpeechWorker(self.tts.speak, stop_fn=self.tts.stop)
+
+    def tearDown(self):
+        self.worker.stop()
+
+    def test_say_returns_immediately(self):
+        """Test callers get a future instead of waiting for playback"""
+        self.tts.seconds = 0.2
+        started = time.perf_counter()
+        future = self.worker.say("Hello there.")
+        self.assertLess(time.perf_counter() - started, 0.1)
+        self.assertFalse(future.done())
+        self.assertTrue(future.result(timeout=2.0))
+        self.assertEqual(self.tts.spoken, ["Hello there."])
+
+    def test_long_text_spoken_sentence_by_sentence(self):
+        self.worker.say("First sentence. Second sentence! Third?").result(timeout=2.0)
+        self.assertEqual(self.tts.spoken, ["First sentence.", "Second sentence!", "Third?"])
+        self.assertEqual(self.worker.metrics()["chunks"], 3)
+
+    def test_priority_order(self):
+        """Test urgent speech jumps the queue, equal priorities stay FIFO"""
+        self.tts.seconds = 0.1
+        first = self.worker.say("Busy.")
+        time.sleep(0.05)
+        self.worker.say("Later.", LOW)
+        self.worker.say("Next.")
+        self.worker.say("Error.", URGENT)
+        self.worker.say("After next.")
+        self.assertTrue(self.worker.wait(timeout=2.0))
+        self.assertTrue(first.result())
+        self.assertEqual(self.tts.spoken, ["Busy.", "Error.", "Next.", "After next.", "Later."])
+
+    def test_barge_in_interrupts(self):
+        """Test interrupt stops mid-response and drops queued speech"""
+        self.tts.seconds = 0.2
+        long_answer = self.worker.say("One. Two. Three. Four.")
+        queued = self.worker.say("Queued.")
+        time.sleep(0.05)
+        started = time.perf_counter()
+        self.worker.interrupt()
+        self.assertFalse(long_answer.result(timeout=2.0))
+        self.assertLess(time.perf_counter() - started, 0.15)
+        self.assertFalse(queued.result(timeout=1.0))
+        self.assertEqual(self.tts.spoken, ["One."])
+        self.assertEqual(self.worker.metrics()["interrupted"], 2)
+
+        # New speech after the interruption is spoken normally
+        self.tts.seconds = 0.0
+        self.assertTrue(self.worker.say("Yes?").result(timeout=2.0))
+
+    def test_on_start_when_audio_starts(self):
+        """Test on_start fires when playback begins, not when the text is queued"""
+        self.tts.seconds = 0.2
+        started = []
+        self.worker.say("Busy.")
+        queued_at = time.perf_counter()
+        self.worker.say("Next. And more.", on_start=lambda: started.append(time.perf_counter()))
+        self.assertEqual(started, [])
+        self.worker.wait(timeout=2.0)
+        self.assertEqual(len(started), 1)
+        self.assertGreaterEqual(started[0] - queued_at, 0.15)
+
+    def test_spoke_during(self):
+        """Test phrases are matched against the times audio was playing"""
+        self.tts.seconds = 0.1
+        before = time.time()
+        self.worker.say("One. Two.")
+        time.sleep(0.05)
+        self.assertTrue(self.worker.spoke_during(before, time.time()))
+        self.worker.wait(timeout=2.0)
+        after = time.time()
+        self.assertTrue(self.worker.spoke_during(before - 1.0, before + 0.15))
+        self.assertFalse(self.worker.spoke_during(before - 1.0, before - 0.5))
+        self.assertFalse(self.worker.spoke_during(after, after + 1.0))
+
+    def test_metrics(self):
+        self.tts.seconds = 0.05
+        self.worker.say("A.")
+        self.worker.say("B.").result(timeout=2.0)
+        metrics = self.worker.metrics()
+        self.assertEqual(metrics["completed"], 2)
+        self.assertGreaterEqual(metrics["speaking_time"], 0.1)
+        self.assertGreaterEqual(metrics["max_queue_latency"], 0.04)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,40 @@
+import unittest
+import sys
+import os
+import json
+import subprocess
+
+# Add the project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.startup import HEAVY, parse_importtime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+class TestStartup(unittest.TestCase):
+    def test_command_processor_defers_subsystems(self):
+        """Test the command processor imports no heavy dependency until used"""
+        script = ("import json, sys\n"
+                  "from src.core.command_processor import EnhancedCommandProcessor\n"
+                  "processor = EnhancedCommandProcessor(None)\n"
+                  "print(json.dumps([processor._screen_analyzer is None,\n"
+                  "                  processor._ui_controller is None, sorted(sys.modules)]))")
+        result = subprocess.run([sys.executable, "-c", script], capture_output=True,
+                                text=True, cwd=ROOT)
+        self.assertEqual(result.returncode, 0, result.stderr)
+        screen_deferred, ui_deferred, modules = json.loads(result.stdout)
+        self.assertTrue(screen_deferred)
+        self.assertTrue(ui_deferred)
+        self.assertEqual([name for name in modules if name in HEAVY], [])
+        self.assertNotIn("src.core.screen_analyzer", modules)
+        self.assertNotIn("src.core.ui_controller", modules)
+
+    def test_parse_importtime(self):
+        """Test -X importtime output is parsed into self and cumulative times"""
+        stderr = ("import time: self [us] | cumulative | imported package\n"
+                  "import time:       120 |        120 |   _json\n"
+                  "import time:      1500 |       1620 | json\n")
+        self.assertEqual(parse_importtime(stderr), {"_json": (120, 120), "json": (1500, 1620)})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,112 @@
+import unittest
+import sys
+import os
+import json
+import shutil
+import tempfile
+
+# Add the project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core.storage import Storage
+from src.core.memory_manager import MemoryManager
+from src.core.learning_manager import LearningManager
+
+class TestStorage(unittest.TestCase):
+    def setUp(self):
+        """Open a fresh database in a temporary directory"""
+        self.tmp_dir = tempfile.mkdtemp()
+        self.store = Storage(os.path.join(self.tmp_dir, "test.db"), flush_interval=60)
+
+    def tearDown(self):
+        self.store.close()
+        shutil.rmtree(self.tmp_dir)
+
+    def test_batched_writes_visible_to_reads(self):
+        """Test queued writes are flushed before queries"""
+        self.store.add_interaction("memory", "Open Chrome", "ok", True)
+        self.store.add_interaction("memory", "open chrome", "fail", False)
+        self.assertEqual(self.store.count_interactions("memory"), 2)
+        stats = self.store.command_stats("memory")
+        self.assertEqual(stats["open chrome"], {"success": 1, "total": 2})
+
+    def test_bad_write_does_not_block_later_writes(self):
+        """Test a write that can never commit is dropped, not retried forever"""
+        self.store.add_interaction("memory", "open chrome", "ok", True)
+        self.store._enqueue("INSERT INTO interactions (source) VALUES (?)", (None,))
+        self.store.add_interaction("memory", "open notepad", "ok", True)
+        self.assertEqual(self.store.flush(), 2)
+        self.assertEqual(self.store.dropped, 1)
+        self.store.add_interaction("memory", "close notepad", "ok", True)
+        self.assertEqual(self.store.count_interactions("memory"), 3)
+
+    def test_failing_write_retries_are_capped(self):
+        """Test operational failures are retried a bounded number of times"""
+        self.store._enqueue("INSERT INTO missing_table VALUES (?)", (1,))
+        self.store.add_interaction("memory", "open chrome", "ok", True)
+        self.assertEqual(self.store.flush(), 1)
+        for _ in range(10):
+            self.store.flush()
+        self.assertEqual(self.store.dropped, 1)
+        self.assertEqual(self.store._pending, [])
+
+    def test_query_by_command_and_timestamp(self):
+        """Test indexed lookups by command and time range"""
+        self.store.add_interaction("history", "hello", "hi", True, timestamp="2025-01-01T10:00:00")
+        self.store.add_interaction("history", "hello", "hi", True, timestamp="2025-01-02T10:00:00")
+        self.store.add_interaction("history", "bye", "bye", True, timestamp="2025-01-02T11:00:00")
+        found = self.store.find_interactions("history", command="HELLO", since="2025-01-02")
+        self.assertEqual(len(found), 1)
+        self.assertEqual(found[0]["timestamp"], "2025-01-02T10:00:00")
+
+    def test_persists_across_reopen(self):
+        """Test data survives closing and reopening the database"""
+        self.store.save_skill("greet", {"patterns": ["greet me"]})
+        self.store.add_interaction("learning", "hello", "hi", True)
+        self.store.close()
+        self.store = Storage(os.path.join(self.tmp_dir, "test.db"))
+        self.assertEqual(self.store.get_skills(), {"greet": {"patterns": ["greet me"]}})
+        self.assertEqual(self.store.count_interactions("learning"), 1)
+
+    def test_legacy_import_runs_once(self):
+        """Test JSON state files are imported exactly once"""
+        os.makedirs(os.path.join(self.tmp_dir, "learning"))
+        with open(os.path.join(self.tmp_dir, "learning", "interaction_history.json"), "w") as f:
+            json.dump([{"timestamp": "2025-01-01T00:00:00", "command": "open chrome",
+                        "response": "", "success": True}], f)
+        self.store.import_legacy_json(self.tmp_dir)
+        self.store.import_legacy_json(self.tmp_dir)
+        self.assertEqual(self.store.count_interactions("learning"), 1)
+
+    def test_malformed_legacy_file_imports_nothing(self):
+        """Test a bad record leaves no rows behind to be duplicated on the next run"""
+        os.makedirs(os.path.join(self.tmp_dir, "history"))
+        path = os.path.join(self.tmp_dir, "history", "command_history.json")
+        records = [{"command": "open chrome", "success": True}, {"response": "no command"},
+                   {"command": "mute", "success": True}]
+        with open(path, "w") as f:
+            json.dump(records, f)
+        self.assertEqual(self.store.import_legacy_json(self.tmp_dir), {})
+        self.store.flush()
+        self.assertEqual(self.store.count_interactions("history"), 0)
+
+        with open(path, "w") as f:
+            json.dump([records[0], records[2]], f)
+        self.assertIn("history", self.store.import_legacy_json(self.tmp_dir))
+        self.store.import_legacy_json(self.tmp_dir)
+        self.assertEqual(self.store.count_interactions("history"), 2)
+
+    def test_managers_share_store(self):
+        """Test memory and learning managers read back from the store"""
+        memory = MemoryManager(self.tmp_dir, store=self.store)
+        memory.store_interaction({"command": "Open Chrome", "response": "ok", "success": True})
+        learning = LearningManager(store=self.store)
+        learning.save_interaction("open chrome", "ok", False)
+
+        reloaded = MemoryManager(self.tmp_dir, store=self.store)
+        self.assertEqual(reloaded.get_success_rate("open chrome"), 1)
+        self.assertEqual(reloaded.analyze_patterns()["total_interactions"], 1)
+        self.assertEqual(learning.analyze_patterns()["open chrome"]["total"], 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,100 @@
+import unittest
+import sys
+import os
+import numpy as np
+
+# Add the project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core.tile_ocr import TileOCR, tile_hashes
+
+class FakeOCR:
+    """Reads each distinct non-zero gray level as one word, like a tiny tesseract"""
+    def __init__(self):
+        self.calls = 0
+        self.pixels = 0
+
+    def __call__(self, image):
+        self.calls += 1
+        self.pixels += image.size
+        data = {'text': [], 'left': [], 'top': [], 'width': [], 'height': [], 'conf': []}
+        for value in np.unique(image):
+            if value == 0:
+                continue
+            ys, xs = np.nonzero(image == value)
+            data['text'].append(f"Word{value}")
+            data['left'].append(int(xs.min()))
+            data['top'].append(int(ys.min()))
+            data['width'].append(int(xs.max() - xs.min() + 1))
+            data['height'].append(int(ys.max() - ys.min() + 1))
+            data['conf'].append(90)
+        return data
+
+def screen():
+    image = np.zeros((400, 600), dtype=np.uint8)
+    image[20:40, 20:80] = 10      # top-left word
+    image[300:320, 420:520] = 20  # bottom-right word
+    image[90:110, 80:130] = 30    # straddles the tile edge at x=100
+    return image
+
+class TestTileOCR(unittest.TestCase):
+    def setUp(self):
+        self.ocr = FakeOCR()
+        self.tiles = TileOCR(self.ocr, tile_size=100, margin=40)
+
+    def test_first_frame_reads_everything(self):
+        screen_map = self.tiles.analyze(screen())
+        self.assertEqual(len(self.tiles.tiles), 24)
+        # Identical blank crops are only read once
+        self.assertLess(self.ocr.calls, 24)
+        self.assertEqual(screen_map["word10"]["bounds"], (20, 20, 60, 20))
+        self.assertEqual(screen_map["word20"]["position"], (470, 310))
+
+    def test_word_across_tile_edge_read_once(self):
+        """Test margins keep a word crossing tiles whole and unduplicated"""
+        self.tiles.analyze(screen())
+        words = [w for w in self.tiles.words() if w["text"] == "Word30"]
+        self.assertEqual(len(words), 1)
+        self.assertEqual(words[0]["bounds"], (80, 90, 50, 20))
+
+    def test_static_screen_skips_ocr(self):
+        self.tiles.analyze(screen())
+        calls = self.ocr.calls
+        self.tiles.analyze(screen())
+        self.assertEqual(self.ocr.calls, calls)
+
+    def test_only_changed_tiles_reread(self):
+        """Test a small change (a clock) re-reads just its neighbourhood"""
+        self.tiles.analyze(screen())
+        self.ocr.calls = self.ocr.pixels = 0
+        changed = screen()
+        changed[350:370, 30:60] = 40
+        screen_map = self.tiles.analyze(changed)
+        self.assertLessEqual(self.ocr.calls, 4)
+        self.assertLess(self.ocr.pixels, changed.size / 2)
+        self.assertEqual(screen_map["word40"]["bounds"], (30, 350, 30, 20))
+        self.assertIn("word20", screen_map)
+
+        # Reverting the change is answered from the content cache
+        calls = self.ocr.calls
+        screen_map = self.tiles.analyze(screen())
+        self.assertEqual(self.ocr.calls, calls)
+        self.assertNotIn("word40", screen_map)
+        self.assertGreater(self.tiles.stats["cache_hits"], 0)
+
+    def test_resolution_change_resets(self):
+        self.tiles.analyze(screen())
+        smaller = screen()[:200, :300]
+        screen_map = self.tiles.analyze(smaller)
+        self.assertNotIn("word20", screen_map)
+        self.assertIn("word10", screen_map)
+
+    def test_tile_hashes_detect_single_pixel(self):
+        image = screen()
+        before = tile_hashes(image, 100)
+        image[250, 250] = 1
+        changed = np.any(tile_hashes(image, 100) != before, axis=-1)
+        self.assertEqual(list(zip(*np.nonzero(changed))), [(2, 2)])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,127 @@
+import unittest
+import sys
+import os
+import shutil
+import tempfile
+import wave
+import numpy as np
+
+# Add the project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core.voice_gate import (VoiceActivityDetector, VoiceGate, WakeWordSpotter, band_edges,
+                                 save_template, spectral_profile)
+
+RATE = 16000
+WAKE_WORD = [(180, 0.12), (300, 0.15), (220, 0.1), (600, 0.12)]
+OTHER_WORD = [(500, 0.12), (250, 0.2), (700, 0.1), (150, 0.12)]
+
+def noise(seconds, level, seed=0):
+    rng = np.random.default_rng(seed)
+    return rng.normal(0, level, int(seconds * RATE)).astype(np.int16)
+
+def word(pattern, stretch=1.0, amplitude=6000):
+    """Harmonic segments standing in for the syllables of a spoken word"""
+    parts = []
+    for f0, seconds in pattern:
+        t = np.arange(int(seconds * stretch * RATE)) / RATE
+        harmonics = sum(np.sin(2 * np.pi * f0 * k * t) / k for k in range(1, 6))
+        parts.append((amplitude * harmonics / 2).astype(np.int16))
+    return np.concatenate(parts)
+
+def phrase(pattern, stretch=1.0):
+    spoken = word(pattern, stretch)
+    spoken = spoken + noise(len(spoken) / RATE, 300, seed=2)[:len(spoken)]
+    return np.concatenate([noise(0.4, 80), spoken, noise(0.3, 80, seed=1)])
+
+class TestVoiceActivityDetector(unittest.TestCase):
+    def test_speech_and_noise(self):
+        """Test voiced audio passes while hiss and silence do not"""
+        vad = VoiceActivityDetector(RATE)
+        self.assertTrue(vad.is_speech(phrase(OTHER_WORD)))
+        self.assertFalse(vad.is_speech(noise(1.0, 2000)))  # loud fan
+        self.assertFalse(vad.is_speech(noise(1.0, 50)))     # quiet room
+        self.assertFalse(vad.is_speech(word([(200, 0.05)])))  # click
+
+class TestWakeWordSpotter(unittest.TestCase):
+    def test_spots_wake_word_on_raw_audio(self):
+        """Test enrolled wake word is found at other speaking rates"""
+        spotter = WakeWordSpotter(RATE)
+        self.assertFalse(spotter.ready)
+        spotter.enroll(word(WAKE_WORD))
+        for stretch in (0.85, 1.0, 1.25):
+            self.assertTrue(spotter.detect(phrase(WAKE_WORD, stretch)), stretch)
+        self.assertFalse(spotter.detect(phrase(OTHER_WORD)))
+
+    def test_templates_from_directory(self):
+        tmp_dir = tempfile.mkdtemp()
+        try:
+            with wave.open(os.path.join(tmp_dir, "jarvis1.wav"), "wb") as wav:
+                wav.setnchannels(1)
+                wav.setsampwidth(2)
+                wav.setframerate(RATE)
+                wav.writeframes(word(WAKE_WORD).tobytes())
+            spotter = WakeWordSpotter.from_directory(tmp_dir, RATE)
+            self.assertEqual(len(spotter.templates), 1)
+            self.assertTrue(spotter.detect(phrase(WAKE_WORD)))
+        finally:
+            shutil.rmtree(tmp_dir)
+
+    def test_band_edges_have_bins(self):
+        """Test every spectral band covers at least one FFT bin"""
+        edges = band_edges(RATE, 400)
+        self.assertTrue(np.all(np.diff(edges) >= 1))
+        self.assertLessEqual(len(edges) - 1, 24)
+        self.assertEqual(spectral_profile(word(WAKE_WORD), RATE).shape[1], len(edges) - 1)
+
+    def test_saved_templates_reload(self):
+        """Test enrolled recordings are written as WAVs the spotter loads"""
+        tmp_dir = tempfile.mkdtemp()
+        try:
+            first = save_template(word(WAKE_WORD), tmp_dir, RATE)
+            second = save_template(word(WAKE_WORD, 1.1), tmp_dir, RATE)
+            self.assertNotEqual(first, second)
+            with wave.open(first, "rb") as wav:
+                self.assertEqual((wav.getnchannels(), wav.getsampwidth(), wav.getframerate()),
+                                 (1, 2, RATE))
+            spotter = WakeWordSpotter.from_directory(tmp_dir, RATE)
+            self.assertEqual(len(spotter.templates), 2)
+            self.assertTrue(spotter.detect(phrase(WAKE_WORD)))
+        finally:
+            shutil.rmtree(tmp_dir)
+
+class TestVoiceGate(unittest.TestCase):
+    def test_avoided_recognizer_calls(self):
+        """Test noise and non-wake chatter never reach the recognizer"""
+        spotter = WakeWordSpotter(RATE)
+        spotter.enroll(word(WAKE_WORD))
+        gate = VoiceGate(VoiceActivityDetector(RATE), spotter)
+        captured = [noise(1.0, 2000), phrase(OTHER_WORD), phrase(WAKE_WORD), noise(1.0, 50)]
+        admitted = [gate.admit(samples, passive=True) for samples in captured]
+        self.assertEqual(admitted, [False, False, True, False])
+        # Once active, any speech goes through
+        self.assertTrue(gate.admit(phrase(OTHER_WORD), passive=False))
+        stats = gate.stats()
+        self.assertEqual(stats["recognizer_calls_avoided"], 3)
+        self.assertEqual(stats["no_wake_word"], 1)
+        self.assertEqual(stats["forwarded"], 2)
+
+    def test_without_templates_only_vad_applies(self):
+        gate = VoiceGate(VoiceActivityDetector(RATE), WakeWordSpotter(RATE))
+        self.assertTrue(gate.admit(phrase(OTHER_WORD), passive=True))
+
+    def test_empty_template_directory_falls_back(self):
+        """Test a missing template folder leaves only the VAD in front of the recognizer"""
+        tmp_dir = tempfile.mkdtemp()
+        try:
+            spotter = WakeWordSpotter.from_directory(os.path.join(tmp_dir, "wake_word"), RATE)
+            gate = VoiceGate(VoiceActivityDetector(RATE), spotter)
+            self.assertFalse(gate.spots_wake_word)
+            self.assertTrue(gate.admit(phrase(OTHER_WORD), passive=True))
+            self.assertFalse(gate.admit(noise(1.0, 2000), passive=True))
+            self.assertEqual(gate.stats()["no_wake_word"], 0)
+        finally:
+            shutil.rmtree(tmp_dir)
+
+if __name__ == '__main__':
+    unittest.main()